@@ -0,0 +1,8 @@
+"""
+Performance benchmarks for the `habit` package.
+
+The benchmarks are not part of the pytest suite. Run them from the project root:
+
+Usage:
+    python -m benchmarks.run_benchmarks --habits 500 --days 365 --output results.json
+"""
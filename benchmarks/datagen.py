@@ -0,0 +1,55 @@
+"""
+Synthetic habit data for benchmarks.
+
+Builds in-memory Habit objects whose size and shape are controlled by a
+handful of parameters, so the hot paths can be timed at any scale.
+"""
+import random
+from datetime import date, timedelta
+from dateutil.relativedelta import relativedelta
+from typing import Dict, List, Optional
+
+from habit.habit import Habit
+from initialize_db import DEFAULT_MIX
+
+PERIOD_STEPS = {
+    "daily": (timedelta(days=1), 1),
+    "weekly": (timedelta(weeks=1), 7),
+    "monthly": (relativedelta(months=1), 30),
+}
+
+
+def generate_habits(count: int,
+                    history_days: int,
+                    periodicity_mix: Optional[Dict[str, float]] = None,
+                    gap_density: float = 0.1,
+                    seed: int = 0,
+                    today: Optional[date] = None) -> List[Habit]:
+    """Generate synthetic habits with completion histories.
+
+    Args:
+        count: Number of habits to create.
+        history_days: How many days of history each habit covers.
+        periodicity_mix: Relative weights per periodicity (default: DEFAULT_MIX).
+        gap_density: Probability that any single period is missed (0.0 - 1.0).
+        seed: Seed for the random generator, so runs are reproducible.
+        today: Newest day of the history (default: date.today()).
+    Returns:
+        List of Habit objects.
+    """
+    rng = random.Random(seed)
+    mix = periodicity_mix or DEFAULT_MIX
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    today = today or date.today()
+
+    habits = []
+    for i in range(count):
+        periodicity = rng.choices(names, weights)[0]
+        habit = Habit(f"habit-{i:06d}", periodicity)
+        step, days_per_period = PERIOD_STEPS[periodicity]
+        habit.complete_range(today - step * k
+                             for k in range(history_days // days_per_period)
+                             if rng.random() >= gap_density)
+        habits.append(habit)
+    return habits
@@ -0,0 +1,288 @@
+"""
+Times the habit, database and analytics hot paths and writes JSON results.
+
+Each benchmark is repeated several times; the per-operation minimum, median
+and mean are reported. Passing --baseline compares the run against a previous
+results file and exits with status 1 when any median regressed by more than
+--threshold (a fraction, e.g. 0.2 for 20%).
+
+Usage:
+    python -m benchmarks.run_benchmarks --habits 1000 --days 730 --output results.json
+    python -m benchmarks.run_benchmarks --baseline results.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from habit import analytics, transfer
+from habit.database import DatabaseManager
+from habit.habit import Habit
+from benchmarks.datagen import generate_habits
+from initialize_db import DEFAULT_MIX, generate_dataset, parse_mix
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(func: Callable[[], None], ops: int, repeat: int,
+            setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """Run `func` `repeat` times and summarize the time per operation.
+
+    Args:
+        func: Callable performing `ops` operations per call.
+        ops: Number of operations performed by one call (used to normalize).
+        repeat: How many times to run `func`.
+        setup: Untimed callable run before every repetition, e.g. to drop caches.
+    Returns:
+        Dict with per-operation min, median and mean in seconds, plus counts.
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) / max(ops, 1))
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "ops": ops,
+        "repeat": repeat,
+    }
+
+
+def bench_habit(habits, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark the in-memory Habit and analytics hot paths.
+
+    Each habit's derived state (period counts, sorted periods, streak) is
+    dropped before every repetition, so the computation is timed rather
+    than a cache hit.
+    """
+    probe = date.today()
+
+    def cold():
+        for h in habits:
+            h._invalidate()
+
+    return {
+        "habit.get_streak": measure(
+            lambda: [h.get_streak() for h in habits], len(habits), repeat, cold),
+        "habit._is_duplicate": measure(
+            lambda: [h._is_duplicate(probe) for h in habits], len(habits), repeat, cold),
+        "analytics.longest_streak_for": measure(
+            lambda: [analytics.longest_streak_for(h) for h in habits], len(habits), repeat, cold),
+    }
+
+
+def bench_database(habits, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Benchmark persistence against a temporary SQLite file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        db.initialize_schema()
+        try:
+            def save_all():
+                for h in habits:
+                    db.save_habit(h)
+
+            results = {"database.save_habit": measure(save_all, len(habits), repeat)}
+            results["database.load_all_habits"] = measure(db.load_all_habits, 1, repeat)
+
+            names = [h.name for h in habits]
+            cached = DatabaseManager(db.db_name, cache_size=len(names))
+            try:
+                for label, manager in (("database.get_habit_by_name", db),
+                                       ("database.get_habit_by_name[cached]", cached)):
+                    results[label] = measure(
+                        lambda m=manager: [m.get_habit_by_name(n) for n in names], len(names), repeat)
+            finally:
+                cached.close()
+        finally:
+            db.close()
+    return results
+
+
+def bench_bulk_insert(count: int, days: int, seed: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Benchmark streaming a synthetic dataset through the bulk insert path."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bulk.db")
+        return {"database.bulk_insert": measure(
+            lambda: generate_dataset(path, count, days, seed, fresh=True), count, repeat)}
+
+
+def bench_csv_transfer(count: int, days: int, seed: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Benchmark the streaming CSV export and import pipelines, per completion row."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source_path = os.path.join(tmp, "source.db")
+        generate_dataset(source_path, count, days, seed, fresh=True)
+        source = DatabaseManager(source_path)
+        target = DatabaseManager(os.path.join(tmp, "target.db"))
+        target.initialize_schema()
+        csv_path = os.path.join(tmp, "completions.csv")
+        try:
+            rows = transfer.export_csv(source, csv_path)
+            return {
+                "transfer.export_csv": measure(lambda: transfer.export_csv(source, csv_path), rows, repeat),
+                "transfer.import_csv": measure(lambda: transfer.import_csv(target, csv_path), rows, repeat),
+            }
+        finally:
+            source.close()
+            target.close()
+
+
+class _UncachedManager(DatabaseManager):
+    """DatabaseManager as it behaved before cursor reuse: a new cursor per call."""
+
+    def _cursor(self):
+        return self._connect().cursor()
+
+
+def bench_statement_overhead(repeat: int, count: int = 200) -> Dict[str, Dict[str, float]]:
+    """
+    Micro-benchmark the fixed cost of one database call, with habits that have
+    no completions so statement preparation and cursor setup dominate.
+
+    "[uncached]" runs use a fresh cursor per call and no statement cache
+    (cached_statements=0); the others use the shared cursor and the default cache.
+    """
+    habits = [Habit(f"habit {i}", "daily") for i in range(count)]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "statements.db")
+        for suffix, manager in (("[uncached]", _UncachedManager(path, cached_statements=0)),
+                                ("", DatabaseManager(path))):
+            manager.initialize_schema()
+            try:
+                def save_all(db=manager):
+                    with db.transaction():
+                        for h in habits:
+                            db.save_habit(h)
+
+                save_all()
+                results[f"statement.save_habit{suffix}"] = measure(save_all, count, repeat)
+                results[f"statement.get_habit_by_name{suffix}"] = measure(
+                    lambda db=manager: [db.get_habit_by_name(h.name) for h in habits], count, repeat)
+            finally:
+                manager.close()
+    return results
+
+
+def bench_cli_cold_start(repeat: int) -> Dict[str, Dict[str, float]]:
+    """Benchmark starting a fresh interpreter that runs the CLI once."""
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    with tempfile.TemporaryDirectory() as tmp:
+        def run_cli():
+            subprocess.run([sys.executable, "-m", "habit.cli", "--command", "list"],
+                           cwd=tmp, env=env, stdout=subprocess.DEVNULL, check=True)
+
+        return {"cli.cold_start": measure(run_cli, 1, repeat)}
+
+
+def run(args) -> Dict:
+    """Run every benchmark and return the results document."""
+    mix = args.mix or DEFAULT_MIX
+    habits = generate_habits(args.habits, args.days, mix, args.gap_density, args.seed)
+
+    results = {}
+    results.update(bench_habit(habits, args.repeat))
+    results.update(bench_database(habits, args.repeat))
+    results.update(bench_statement_overhead(args.repeat))
+    results.update(bench_bulk_insert(args.habits, args.days, args.seed, args.repeat))
+    results.update(bench_csv_transfer(args.habits, args.days, args.seed, args.repeat))
+    if not args.skip_cli:
+        results.update(bench_cli_cold_start(args.repeat))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "habits": args.habits,
+            "days": args.days,
+            "mix": mix,
+            "gap_density": args.gap_density,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Compare two results documents and describe median regressions.
+
+    Args:
+        current: Results of this run.
+        baseline: Previously saved results.
+        threshold: Allowed relative slowdown (0.2 means 20%).
+    Returns:
+        One message per benchmark whose median regressed beyond the threshold.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old or not old["median"]:
+            continue
+        ratio = result["median"] / old["median"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {old['median']:.3e}s -> {result['median']:.3e}s ({ratio:.2f}x)")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse benchmark CLI arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark habit tracker hot paths.")
+    parser.add_argument("--habits", type=int, default=500, help="Number of synthetic habits")
+    parser.add_argument("--days", type=int, default=365, help="Days of history per habit")
+    parser.add_argument("--mix", help="Periodicity mix, e.g. daily=0.6,weekly=0.3,monthly=0.1")
+    parser.add_argument("--gap-density", type=float, default=0.1, help="Probability of a missed period")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per benchmark")
+    parser.add_argument("--skip-cli", action="store_true", help="Skip the CLI cold start benchmark")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="Compare against a saved results file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed median slowdown")
+    args = parser.parse_args(argv)
+    if args.mix:
+        try:
+            args.mix = parse_mix(args.mix)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point: run, print, save and optionally compare results."""
+    args = parse_args(argv)
+    document = run(args)
+
+    for name, result in document["results"].items():
+        rate = f"  ({60 / result['median']:,.0f} ops/min)" if name.startswith("transfer.") else ""
+        print(f"{name:38} median {result['median'] * 1e6:10.2f} µs/op{rate}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(document, fh, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        for key in ("habits", "days", "mix", "gap_density", "seed"):
+            if baseline.get("meta", {}).get(key) != document["meta"][key]:
+                print(f"warning: baseline was recorded with a different '{key}'")
+        regressions = compare(document, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,9 @@
 from typing import List, Optional, Tuple
-from datetime import timedelta
-from dateutil.relativedelta import relativedelta
+from datetime import date, timedelta
 
 from habit.habit import Habit
+from habit.periods import current_run, longest_run
+from habit.snapshot import MappedSnapshot
 
 def filter_habits_by_periodicity(habits: List[Habit], periodicity: str) -> List[Habit]:
     """Return habits matching the given periodicity (case-insensitive).
@@ -18,36 +19,15 @@ def filter_habits_by_periodicity(habits: List[Habit], periodicity: str) -> List[
 
 def longest_streak_for(habit: Habit) -> int:
     """Calculate the longest historical streak for a habit.
-    This ignores 0-streaks and considers only the longest sequence of consecutive completions.
+    This ignores 0-streaks and considers only the longest sequence of consecutive periods,
+    compared as period ordinals of the habit's period policy.
 
     Args:
         habit: The Habit object to evaluate.
     Returns:
         The length of the longest streak as an integer.
     """
-    if not habit.completions:
-        return 0
-
-    sorted_dates = sorted(habit.completions)
-    max_streak = streak = 1
-    previous = sorted_dates[0]
-
-    for current in sorted_dates[1:]:
-        if habit.periodicity == "daily":
-            expected = previous + timedelta(days=1)
-        elif habit.periodicity == "weekly":
-            expected = previous + timedelta(weeks=1)
-        else:  # monthly
-            expected = previous + relativedelta(months=1)
-
-        if current == expected:
-            streak += 1
-            max_streak = max(max_streak, streak)
-        else:
-            streak = 1
-        previous = current
-
-    return max_streak
+    return longest_run(habit._sorted_period_keys())
 
 def get_all_streaks(habits: List[Habit]) -> List[Tuple[str, int]]:
     """Return (habit_name, current_streak) pairs for all habits
@@ -71,4 +51,113 @@ def get_habit_with_longest_streak(habits: List[Habit]) -> Optional[Tuple[str, in
         return None
     streaks = [(h.name, longest_streak_for(h)) for h in habits]
     max_streak = max(streaks, key=lambda pair: pair[1])
-    return max_streak if max_streak[1] > 0 else None
\ No newline at end of file
+    return max_streak if max_streak[1] > 0 else None
+
+def periods_inactive(habit: Habit, today: date) -> int:
+    """Return how many periods have passed since the habit's last completion.
+
+    Habits never completed count from their creation date, so a new habit is
+    not inactive. 0 means the habit was completed in the current period.
+
+    Args:
+        habit: The Habit object to evaluate.
+        today: The date of the current period.
+    Returns:
+        The number of whole periods between the last activity and today.
+    """
+    dates = habit._sorted_dates()
+    last = dates[-1] if dates else habit.creation_date.date()
+    return habit._period_key(today) - habit._period_key(last)
+
+def streak_as_of(habit: Habit, day: date) -> int:
+    """Return the streak the habit had on a given day.
+
+    Only completions on or before `day` count, and the streak is the run of
+    consecutive periods ending at the newest of them (the same anchoring as
+    Habit.get_streak).
+
+    Args:
+        habit: The Habit object to evaluate.
+        day: The date to evaluate the streak at.
+    Returns:
+        The streak length on that day as an integer.
+    """
+    series = streak_series(habit, day, day)
+    return series[0][1] if series else 0
+
+def streak_series(habit: Habit, start: date, end: date) -> List[Tuple[date, int]]:
+    """Return the streak for every day from start to end (inclusive).
+
+    A period counts from the day it reaches the habit's target. Computed in
+    one linear sweep over the sorted completions and the days of the range,
+    i.e. O(H + D) for H completions and D days.
+
+    Args:
+        habit: The Habit object to evaluate.
+        start: First day of the series.
+        end: Last day of the series.
+    Returns:
+        List of (day, streak) tuples, one per day.
+    """
+    completions = habit.completions
+    key = habit._period_key
+    target = habit.target
+    i, n = 0, len(completions)
+    run, last_key = 0, None
+    period, count = None, 0
+
+    series = []
+    day = start
+    one_day = timedelta(days=1)
+    while day <= end:
+        while i < n and completions[i] <= day:
+            k = key(completions[i])
+            i += 1
+            count = count + 1 if k == period else 1
+            period = k
+            if count != target:
+                continue
+            # Period k met its target on this day.
+            if last_key is None or k > last_key + 1:
+                run = 1
+            else:
+                run += 1
+            last_key = k
+        series.append((day, run))
+        day += one_day
+    return series
+
+def open_snapshot(path: str) -> MappedSnapshot:
+    """Memory-map a snapshot written by habit.snapshot.export_snapshot.
+
+    Args:
+        path: Path to the snapshot file.
+    Returns:
+        A MappedSnapshot (usable as a context manager).
+    """
+    return MappedSnapshot(path)
+
+def snapshot_streaks(snapshot: MappedSnapshot) -> List[Tuple[str, int]]:
+    """Return (habit_name, current_streak) pairs computed on a mapped snapshot.
+
+    Args:
+        snapshot: An open MappedSnapshot.
+    Returns:
+        List of tuples with habit name and its current streak.
+    """
+    return [(snapshot.name(i), current_run(snapshot.ordinals_for(i))) for i in range(len(snapshot))]
+
+def snapshot_habit_with_longest_streak(snapshot: MappedSnapshot) -> Optional[Tuple[str, int]]:
+    """Return the habit with the longest historical streak in a mapped snapshot.
+
+    Args:
+        snapshot: An open MappedSnapshot.
+    Returns:
+        Tuple of (habit_name, longest_streak) or None if there is no streak at all.
+    """
+    best_index, best = None, 0
+    for i in range(len(snapshot)):
+        longest = longest_run(snapshot.ordinals_for(i))
+        if longest > best:
+            best_index, best = i, longest
+    return (snapshot.name(best_index), best) if best_index is not None else None
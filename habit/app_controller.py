@@ -1,6 +1,10 @@
+import sqlite3
+from datetime import datetime
 from typing import Optional
 from habit.habit_tracker import HabitTracker
 from habit.habit import Habit
+from habit.metrics import METRICS
+from habit import clock, periods
 
 class AppController:
     """
@@ -8,15 +12,34 @@ class AppController:
     Acts as the main interface between CLI input and backend logic.
     """
 
-    def __init__(self, db_path: str = "habits.db"):
+    def __init__(self, db_path: str = "habits.db", **tracker_options):
         """
         Initialize the controller with a HabitTracker instance.
 
         Parameters:
         db_path : str
             Path to the database file for storing habits.
+        **tracker_options
+            Storage options passed on to HabitTracker (e.g. shards=4).
         """
-        self.tracker = HabitTracker(db_path)
+        if METRICS.enabled:
+            with METRICS.time_command("startup"):
+                self.tracker = HabitTracker(db_path, **tracker_options)
+        else:
+            self.tracker = HabitTracker(db_path, **tracker_options)
+        self.interactive = True
+
+    def _prompt(self, text: str) -> str:
+        """
+        Ask the user for a missing value.
+
+        Raises:
+            ValueError: when not interactive (e.g. in batch mode), where there
+                        is nobody to answer.
+        """
+        if not self.interactive:
+            raise ValueError(f"Missing value for '{text.strip().rstrip(':?')}'")
+        return input(text)
 
     def start(self) -> None:
         """
@@ -26,25 +49,10 @@ class AppController:
         print("📊 Habit Tracker App (type 'help' for options)")
         while True:
             cmd = input(">> ").strip().lower()
-            if cmd == "help":
-                self._print_help()
-            elif cmd == "add":
-                self.handle_add()
-            elif cmd == "complete":
-                self.handle_complete()
-            elif cmd == "update":
-                self.handle_update()
-            elif cmd == "delete":
-                self.handle_delete()
-            elif cmd == "list":
-                self.handle_list()
-            elif cmd == "analytics":
-                self.handle_analytics()
-            elif cmd == "exit":
+            if cmd == "exit":
                 print("👋 Goodbye!")
                 break
-            else:
-                print("❓ Unknown command. Type 'help' for options.")
+            self.handle_command(cmd)
 
     def _print_help(self) -> None:
         """
@@ -58,11 +66,23 @@ Available commands:
 • analytics – Show habit analytics
 • delete    – Remove a habit
 • list      – View all tracked habits
+• compact   – Fold old events into a snapshot (event log storage only)
+• snapshot  – Write a read-only analytics snapshot (--file path)
+• export    – Stream completions to CSV (--file path, '-' for stdout)
+• import    – Load completions from CSV (--file path, '-' for stdin)
+• sync      – Exchange changes with another habits database (--file path)
+• archive   – Move a habit, or all habits inactive for N periods (--inactive N), to the archive
+• restore   – Bring an archived habit back
+• archived  – List archived habits
 • help      – Show this help menu
 • exit      – Quit the app
+
+Periodicities: daily, weekly (Monday to Sunday), monthly, weekdays, every N days, every N weeks.
+"Every N" periods are fixed calendar blocks shared by all habits, not counted from the day a habit was added.
 """)
 
-    def handle_add(self, name: Optional[str] = None, periodicity: Optional[str] = None) -> None:
+    def handle_add(self, name: Optional[str] = None, periodicity: Optional[str] = None,
+                   target: Optional[int] = None) -> None:
         """
         Add a new habit to the tracker.
 
@@ -71,53 +91,69 @@ Available commands:
         name : Optional[str]
             Name of the habit. If not provided, prompts the user.
         periodicity : Optional[str]
-            Frequency of the habit (daily/weekly/monthly). If not provided, prompts the user.
+            Frequency of the habit (see habit.periods). If not provided, prompts the user.
+        target : Optional[int]
+            Completions needed per period, e.g. 3 for "3x per week" (default 1).
         """
-        name = name or input("Habit name: ").strip()
-        periodicity = periodicity or input("Periodicity (daily/weekly/monthly): ").strip().lower()
+        name = name or self._prompt("Habit name: ").strip()
+        periodicity = periodicity or self._prompt(f"Periodicity ({periods.DESCRIPTION}): ").strip().lower()
 
         if not name or not periodicity:
             print("❗ Missing habit name or periodicity.")
             return
 
         try:
-            habit = Habit(name, periodicity)
+            habit = Habit(name, periodicity, int(target or 1))
             self.tracker.add_habit(habit)
             print(f"✅ Habit '{habit.name}' added.")
         except ValueError as e:
             print(f"⚠️ {e}")
 
-    def handle_complete(self, habit_name: Optional[str] = None) -> None:
+    def handle_complete(self, habit_name: Optional[str] = None, at: Optional[str] = None) -> None:
         """
-        Mark a habit as completed for today.
+        Mark a habit as completed for today (in the tracker's timezone), or at a given time.
 
         Parameters:
         -----------
         habit_name : Optional[str]
             Name of the habit to complete. If not provided, prompts the user.
+        at : Optional[str]
+            ISO 8601 timestamp of the completion (naive means UTC); defaults to now.
         """
-        habit_name = habit_name or input("Which habit did you complete? ").strip()
+        habit_name = habit_name or self._prompt("Which habit did you complete? ").strip()
         habit = self.tracker.find_habit_by_name(habit_name)
         if habit:
-            today = habit.complete_task()
-            self.tracker.db.save_habit(habit)
-            print(f"✔ '{habit.name}' completed for {today}. Streak: {habit.get_streak()}")
+            if at:
+                try:
+                    when = datetime.fromisoformat(at)
+                except ValueError:
+                    print(f"⚠️ Invalid timestamp: {at}")
+                    return
+                habit.complete_at(when, self.tracker.tz)
+                day = clock.local_date(when, self.tracker.tz)
+            else:
+                day = habit.complete_task(self.tracker.tz)
+            self.tracker.save_habit(habit)
+            print(f"✔ '{habit.name}' completed for {day}. Streak: {habit.get_streak()}")
         else:
             print("🚫 Habit not found.")
 
-    def handle_update(self, name: Optional[str] = None, new_periodicity: Optional[str] = None) -> None:
+    def handle_update(self, name: Optional[str] = None, new_periodicity: Optional[str] = None,
+                      target: Optional[int] = None) -> None:
         """
-        Update the periodicity of an existing habit.
+        Update the periodicity (and optionally the target) of an existing habit.
 
         Parameters:
         
         name : Optional[str]
             Name of the habit to update. If not provided, prompts the user.
         new_periodicity : Optional[str]
-            New frequency (daily/weekly/monthly). If not provided, prompts the user.
+            New frequency (see habit.periods). If not provided, prompts the user.
+        target : Optional[int]
+            New completions-per-period target; keeps the current one if not provided.
         """
-        name = name or input("Habit to update: ").strip()
-        new_periodicity = new_periodicity or input("New periodicity (daily/weekly/monthly): ").strip().lower()
+        name = name or self._prompt("Habit to update: ").strip()
+        new_periodicity = new_periodicity or self._prompt(f"New periodicity ({periods.DESCRIPTION}): ").strip().lower()
 
         if not name or not new_periodicity:
             print("❗ Missing required fields.")
@@ -129,7 +165,8 @@ Available commands:
             return
 
         try:
-            success = self.tracker.update_habit(name, name, new_periodicity)
+            new_target = int(target) if target else None
+            success = self.tracker.update_habit(name, name, new_periodicity, new_target=new_target)
             if success:
                 print(f"🔄 Habit '{name}' updated to periodicity: {new_periodicity}")
         except ValueError as e:
@@ -144,14 +181,84 @@ Available commands:
         name : Optional[str]
             Name of the habit to delete. If not provided, prompts the user.
         """
-        name = name or input("Habit to delete: ").strip()
+        name = name or self._prompt("Habit to delete: ").strip()
         success = self.tracker.delete_habit(name)
         if success:
             print(f"🗑️ Habit '{name}' deleted.")
         else:
             print("🚫 Habit not found.")
 
-    def handle_list(self, periodicity: Optional[str] = None) -> None:
+    def handle_archive(self, name: Optional[str] = None, inactive: Optional[int] = None) -> None:
+        """
+        Move a habit, or every habit inactive for a number of periods, to the archive.
+
+        Parameters:
+
+        name : Optional[str]
+            Name of the habit to archive.
+        inactive : Optional[int]
+            Archive all habits with no completion in this many periods instead.
+            If neither is provided, prompts for a habit name.
+        """
+        if getattr(self.tracker.db, "archive_habit", None) is None:
+            print("ℹ️ Archiving is only available with the default single-file storage.")
+            return
+        if inactive is not None and not name:
+            try:
+                archived = self.tracker.archive_inactive(int(inactive))
+            except ValueError as e:
+                print(f"⚠️ {e}")
+                return
+            if archived:
+                print(f"🗄️ Archived {len(archived)} inactive habits: {', '.join(archived)}")
+            else:
+                print(f"ℹ️ No habit has been inactive for {inactive} periods.")
+            return
+        name = name or self._prompt("Habit to archive: ").strip()
+        if self.tracker.archive_habit(name):
+            print(f"🗄️ Habit '{name}' archived.")
+        else:
+            print("🚫 Habit not found.")
+
+    def handle_restore(self, name: Optional[str] = None) -> None:
+        """
+        Bring an archived habit back into the tracked habits.
+
+        Parameters:
+
+        name : Optional[str]
+            Name of the archived habit. If not provided, prompts the user.
+        """
+        if getattr(self.tracker.db, "restore_habit", None) is None:
+            print("ℹ️ Archiving is only available with the default single-file storage.")
+            return
+        name = name or self._prompt("Habit to restore: ").strip()
+        try:
+            habit = self.tracker.restore_habit(name)
+        except ValueError as e:
+            print(f"⚠️ {e}")
+            return
+        if habit:
+            print(f"♻️ Habit '{habit.name}' restored with {len(habit.completions)} completions.")
+        else:
+            print("🚫 No archived habit with that name.")
+
+    def handle_archived(self) -> None:
+        """
+        List archived habits (their histories stay compressed).
+        """
+        if getattr(self.tracker.db, "list_archived", None) is None:
+            print("ℹ️ Archiving is only available with the default single-file storage.")
+            return
+        archived = self.tracker.db.list_archived()
+        if not archived:
+            print("📭 No archived habits.")
+            return
+        print("🗄️ Archived habits:")
+        for name, periodicity, archived_at in archived:
+            print(f"- {name} ({periodicity}), archived {archived_at[:10]}")
+
+    def handle_list(self, periodicity: Optional[str] = None, fmt: str = "text") -> None:
         """
         List all tracked habits, optionally filtered by periodicity.
 
@@ -159,25 +266,41 @@ Available commands:
    
         periodicity : Optional[str]
             Filter habits by frequency (daily/weekly/monthly).
+        fmt : str
+            "text", or "json"/"ndjson" to stream one record per habit.
         """
-        habits = self.tracker.habits
-        if periodicity:
-            habits = [h for h in habits if h.periodicity == periodicity]
+        # Summaries carry only what is printed; no completion history is decoded.
+        summaries = self.tracker.list_summaries(periodicity or None)
 
-        if not habits:
+        if fmt != "text":
+            from habit import output
+            output.write_records(output.summary_records(summaries), fmt)
+            return
+
+        if not summaries:
             print("📭 No habits found.")
             return
 
         print("📌 Current Habits:")
-        for h in habits:
-            print(f"– {h.name} ({h.periodicity}) ➝ Streak: {h.get_streak()}")
+        for s in summaries:
+            schedule = f"{s.periodicity}, {s.target}x" if s.target != 1 else s.periodicity
+            print(f"– {s.name} ({schedule}) ➝ Streak: {s.streak}")
 
-    def handle_analytics(self) -> None:
+    def handle_analytics(self, fmt: str = "text") -> None:
         """
         Display analytics such as current streaks and longest streaks for all habits.
+
+        Parameters:
+        fmt : str
+            "text", or "json"/"ndjson" to stream one record per habit plus a summary.
         """
         from habit import analytics
 
+        if fmt != "text":
+            from habit import output
+            output.write_records(output.analytics_records(self.tracker.habits), fmt)
+            return
+
         if not self.tracker.habits:
             print("📭 No habits to analyze.")
             return
@@ -197,12 +320,115 @@ Available commands:
 
         # Habits by periodicity
         print("\n📅 Habits by periodicity:")
-        for period in ["daily", "weekly", "monthly"]:
+        for period in periods.ordered(h.periodicity for h in self.tracker.habits):
             filtered = analytics.filter_habits_by_periodicity(self.tracker.habits, period)
             if filtered:
                 print(f" {period.capitalize()}: {[h.name for h in filtered]}")
 
-    def handle_command(self, cmd: str, habit_name: Optional[str] = None, periodicity: Optional[str] = None) -> None:
+    def handle_compact(self) -> None:
+        """
+        Fold old events into a snapshot when the tracker uses event log storage.
+        """
+        compact = getattr(self.tracker.db, "compact", None)
+        if compact is None:
+            print("ℹ️ Compaction is only available with event log storage (--event-log).")
+            return
+        self.tracker.flush()
+        removed = compact()
+        print(f"🧹 Compacted event log: {removed} events folded into a snapshot.")
+
+    def handle_snapshot(self, path: Optional[str] = None) -> None:
+        """
+        Export all habits to a memory-mappable snapshot file for read-only analytics.
+
+        Parameters:
+        path : Optional[str]
+            Snapshot file to write. If not provided, prompts the user.
+        """
+        from habit.snapshot import export_snapshot
+
+        path = path or self._prompt("Snapshot file: ").strip()
+        if not path:
+            print("❗ Missing snapshot file.")
+            return
+        count = export_snapshot(self.tracker.habits, path)
+        print(f"📸 Snapshot of {count} habits written to {path}")
+
+    def handle_export(self, path: Optional[str] = None) -> None:
+        """
+        Stream all completions to a CSV file (one row per completion).
+
+        Parameters:
+        path : Optional[str]
+            CSV file to write ("-" for stdout). If not provided, prompts the user.
+        """
+        from habit.transfer import export_csv
+
+        path = path or self._prompt("Export to file: ").strip()
+        if not path:
+            print("❗ Missing export file.")
+            return
+        self.tracker.flush()
+        count = export_csv(self.tracker.db, path)
+        if path != "-":
+            print(f"📤 Exported {count} completions to {path}")
+
+    def handle_import(self, path: Optional[str] = None) -> None:
+        """
+        Load habits from a CSV file of completions, replacing habits with the same name.
+
+        Parameters:
+        path : Optional[str]
+            CSV file to read ("-" for stdin). If not provided, prompts the user.
+        """
+        from habit.transfer import import_csv
+
+        path = path or self._prompt("Import from file: ").strip()
+        if not path:
+            print("❗ Missing import file.")
+            return
+        self.tracker.flush()
+        try:
+            count = import_csv(self.tracker.db, path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ {e}")
+            return
+        self.tracker.habits = self.tracker.db.load_all_habits()
+        print(f"📥 Imported {count} habits from {path}")
+
+    def handle_sync(self, path: Optional[str] = None) -> None:
+        """
+        Exchange the habits changed since the last sync with another database file.
+
+        Parameters:
+        path : Optional[str]
+            The other habits database. If not provided, prompts the user.
+        """
+        from habit.database import DatabaseManager
+        from habit.sync import sync_databases
+
+        if getattr(self.tracker.db, "iter_changes", None) is None:
+            print("ℹ️ Sync is only available with the default single-file storage.")
+            return
+        path = path or self._prompt("Sync with database: ").strip()
+        if not path:
+            print("❗ Missing database file.")
+            return
+        self.tracker.flush()
+        other = DatabaseManager(path)
+        try:
+            other.initialize_schema()
+            pulled, pushed = sync_databases(self.tracker.db, other)
+        except sqlite3.Error as e:
+            print(f"⚠️ Sync failed: {e}")
+            return
+        finally:
+            other.close()
+        self.tracker.habits = self.tracker.db.load_all_habits()
+        print(f"🔄 Synced with {path}: {pulled} habits updated here, {pushed} there.")
+
+    def handle_command(self, cmd: str, habit_name: Optional[str] = None, periodicity: Optional[str] = None,
+                       **options) -> None:
         """
         Dispatch a command to the appropriate handler.
 
@@ -214,19 +440,49 @@ Available commands:
             Name of the habit (used by some commands).
         periodicity : Optional[str]
             Frequency of the habit (used by some commands).
+        **options
+            Extra command options, e.g. path for 'snapshot', 'export', 'import' and 'sync',
+            format for 'list' and 'analytics', target for 'add' and 'update',
+            at for 'complete', or inactive for 'archive'.
+        """
+        if METRICS.enabled:
+            with METRICS.time_command(cmd):
+                self._dispatch(cmd, habit_name, periodicity, options)
+        else:
+            self._dispatch(cmd, habit_name, periodicity, options)
+
+    def _dispatch(self, cmd: str, habit_name: Optional[str], periodicity: Optional[str], options: dict) -> None:
+        """
+        Route a command to its handler (see handle_command).
         """
         if cmd == "add":
-            self.handle_add(habit_name, periodicity)
+            self.handle_add(habit_name, periodicity, options.get("target"))
         elif cmd == "complete":
-            self.handle_complete(habit_name)
+            self.handle_complete(habit_name, options.get("at"))
         elif cmd == "update":
-            self.handle_update(habit_name, periodicity)
+            self.handle_update(habit_name, periodicity, options.get("target"))
         elif cmd == "analytics":
-            self.handle_analytics()
+            self.handle_analytics(options.get("format", "text"))
         elif cmd == "delete":
             self.handle_delete(habit_name)
         elif cmd == "list":
-            self.handle_list(periodicity)
+            self.handle_list(periodicity, options.get("format", "text"))
+        elif cmd == "compact":
+            self.handle_compact()
+        elif cmd == "snapshot":
+            self.handle_snapshot(options.get("path"))
+        elif cmd == "export":
+            self.handle_export(options.get("path"))
+        elif cmd == "import":
+            self.handle_import(options.get("path"))
+        elif cmd == "sync":
+            self.handle_sync(options.get("path"))
+        elif cmd == "archive":
+            self.handle_archive(habit_name, options.get("inactive"))
+        elif cmd == "restore":
+            self.handle_restore(habit_name)
+        elif cmd == "archived":
+            self.handle_archived()
         elif cmd == "help":
             self._print_help()
         elif cmd == "exit":
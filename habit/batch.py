@@ -0,0 +1,202 @@
+"""
+Non-interactive batch mode: run many commands against one warm tracker.
+
+Commands are read one per line, either shell-style or as JSON objects:
+
+    add "Morning run" daily
+    complete "morning run"
+    list --periodicity daily
+    {"command": "update", "habit": "morning run", "periodicity": "weekly"}
+
+Shell-style lines are `command [habit] [periodicity]`, optionally followed by
+`--habit`, `--periodicity` or `--file` flags. Blank lines and lines starting
+with '#' are skipped. Consecutive write commands share one database
+transaction (except in write-behind mode, where the write-behind queue batches
+the writes instead), and every command produces one JSON result line:
+
+    {"line": 1, "command": "add", "ok": true, "output": ["✅ Habit 'morning run' added."]}
+
+followed by a final summary line.
+
+Usage:
+    python -m habit.cli --batch commands.txt
+    generate-commands | python -m habit.cli --batch -
+"""
+import io
+import json
+import shlex
+import time
+from contextlib import ExitStack, redirect_stdout
+from typing import Dict, IO, Iterable, Optional
+
+from habit.app_controller import AppController
+from habit.cli import COMMAND_ALIASES, SUPPORTED_COMMANDS
+
+WRITE_COMMANDS = {"add", "complete", "update", "delete", "import", "sync", "archive", "restore"}
+"""Commands that modify the database; consecutive ones share a transaction."""
+
+_FAILURE_MARKERS = ("🚫", "⚠️", "❗", "❓")
+"""Handlers report failures with these prefixes instead of raising."""
+
+
+def parse_line(line: str) -> Optional[Dict]:
+    """
+    Parse one batch line into handle_command arguments.
+
+    Returns:
+        A dict with "command", "habit_name", "periodicity" and "options",
+        or None for blank and comment lines.
+
+    Raises:
+        ValueError: if the line cannot be parsed or the command is unknown.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+
+    if line.startswith("{"):
+        fields = json.loads(line)
+        if not isinstance(fields, dict):
+            raise ValueError("A JSON command must be an object")
+        fields = dict(fields)
+        for key in ("command", "habit", "periodicity", "file"):
+            if fields.get(key) is not None and not isinstance(fields[key], str):
+                raise ValueError(f'"{key}" must be a string')
+        command = fields.pop("command", None) or ""
+        habit = fields.pop("habit", None)
+        periodicity = fields.pop("periodicity", None)
+        options = fields
+    else:
+        tokens = shlex.split(line)
+        command, positional, options = tokens[0], [], {}
+        rest = iter(tokens[1:])
+        for token in rest:
+            if token.startswith("--"):
+                value = next(rest, None)
+                if value is None:
+                    raise ValueError(f"Missing value for {token}")
+                options[token[2:].replace("-", "_")] = value
+            else:
+                positional.append(token)
+        if len(positional) > 2:
+            raise ValueError("Expected: command [habit] [periodicity]")
+        positional += [None] * (2 - len(positional))
+        habit = options.pop("habit", positional[0])
+        periodicity = options.pop("periodicity", positional[1])
+
+    if "file" in options:
+        options["path"] = options.pop("file")
+    command = command.strip().lower()
+    command = COMMAND_ALIASES.get(command, command)
+    if command not in SUPPORTED_COMMANDS or command == "exit":
+        raise ValueError(f"Unsupported command: {command or '(none)'}")
+    return {
+        "command": command,
+        # Same normalization as --command mode.
+        "habit_name": habit.strip().lower() if habit else None,
+        "periodicity": periodicity.strip().lower() if periodicity else None,
+        "options": options,
+    }
+
+
+def _run_one(controller: AppController, parsed: Dict) -> Dict:
+    """Execute one parsed command and capture its printed output."""
+    buffer = io.StringIO()
+    error = None
+    with redirect_stdout(buffer):
+        try:
+            controller.handle_command(parsed["command"], parsed["habit_name"], parsed["periodicity"],
+                                      **parsed["options"])
+        except Exception as e:
+            error = str(e)
+    output = [line for line in buffer.getvalue().splitlines() if line.strip()]
+    ok = error is None and not any(line.startswith(_FAILURE_MARKERS) for line in output)
+    result = {"command": parsed["command"], "ok": ok, "output": output}
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+class _CommandFailed(Exception):
+    """Raised inside a savepoint to undo the writes of a failed command."""
+
+    def __init__(self, result: Dict):
+        super().__init__(result.get("error"))
+        self.result = result
+
+
+def _run_grouped(controller: AppController, parsed: Dict) -> Dict:
+    """
+    Execute a write command inside the open transaction. If it fails, its
+    partial writes are undone and the tracker is reloaded from the database.
+    """
+    tracker = controller.tracker
+    try:
+        with tracker.savepoint():
+            result = _run_one(controller, parsed)
+            if not result["ok"]:
+                raise _CommandFailed(result)
+    except _CommandFailed as failed:
+        tracker.habits = tracker.db.load_all_habits()
+        return failed.result
+    return result
+
+
+def run_batch(controller: AppController, lines: Iterable[str], out: IO[str]) -> Dict:
+    """
+    Execute batch lines and write one JSON result per command to `out`.
+
+    A failing command does not stop the batch; it is reported with
+    "ok": false and any writes it made are undone. Writes made by consecutive
+    write commands are committed together when the next read command (or
+    the end of input) is reached.
+
+    Parameters:
+    controller : AppController
+        The controller to run commands on; prompting is disabled meanwhile.
+    lines : Iterable[str]
+        Batch lines (a file object works).
+    out : IO[str]
+        Where the JSON result lines are written.
+
+    Returns:
+        The summary written as the last line.
+    """
+    summary = {"summary": True, "commands": 0, "failed": 0, "transactions": 0}
+    start = time.perf_counter()
+    interactive, controller.interactive = controller.interactive, False
+    try:
+        with ExitStack() as stack:
+            in_transaction = False
+            grouped = controller.tracker.writer is None
+            for number, line in enumerate(lines, 1):
+                try:
+                    parsed = parse_line(line)
+                except ValueError as e:
+                    result = {"command": None, "ok": False, "output": [], "error": str(e)}
+                else:
+                    if parsed is None:
+                        continue
+                    is_write = parsed["command"] in WRITE_COMMANDS
+                    if is_write and grouped and not in_transaction:
+                        stack.enter_context(controller.tracker.transaction())
+                        in_transaction = True
+                        summary["transactions"] += 1
+                    elif not is_write and in_transaction:
+                        stack.close()
+                        in_transaction = False
+                    if in_transaction:
+                        result = _run_grouped(controller, parsed)
+                    else:
+                        result = _run_one(controller, parsed)
+
+                summary["commands"] += 1
+                summary["failed"] += not result["ok"]
+                out.write(json.dumps(dict(line=number, **result), ensure_ascii=False) + "\n")
+    finally:
+        controller.interactive = interactive
+
+    summary["seconds"] = round(time.perf_counter() - start, 6)
+    out.write(json.dumps(summary) + "\n")
+    out.flush()
+    return summary
@@ -1,5 +1,7 @@
 # cli.py
 import argparse
+import sys
+from habit import metrics, output, sql_trace
 from habit.app_controller import AppController
 
 try:
@@ -18,7 +20,8 @@ COMMAND_ALIASES = {
 Used to support user-friendly CLI input.
 """
 SUPPORTED_COMMANDS = {
-    "add", "list", "complete", "update", "help", "exit", "delete", "analytics"
+    "add", "list", "complete", "update", "help", "exit", "delete", "analytics", "compact",
+    "snapshot", "export", "import", "sync", "archive", "restore", "archived"
 } | set(COMMAND_ALIASES.keys())
 """
 Set of all valid commands, including both full names and aliases.
@@ -29,9 +32,27 @@ def parse_args():
     parser = argparse.ArgumentParser(description="Track habits via CLI.")
     parser.add_argument("--command", help="Quick command (e.g., 'add', 'list')")
     parser.add_argument("--habit", help="Habit name (for add/complete)")
-    parser.add_argument("--periodicity", help="Frequency (daily/weekly/monthly)")
+    parser.add_argument("--periodicity", help="Frequency (daily/weekly/monthly/weekdays/every N days/every N weeks); "
+                             "every-N periods are fixed calendar blocks, the same for all habits")
+    parser.add_argument("--target", type=int, help="Completions needed per period (for add/update, default 1)")
+    parser.add_argument("--inactive", type=int, metavar="N",
+                        help="Archive every habit with no completion in N periods (for archive)")
+    parser.add_argument("--at", help="ISO timestamp of the completion (for complete; naive means UTC)")
+    parser.add_argument("--tz", help="Your IANA timezone, e.g. Europe/Berlin (default: system local time)")
+    parser.add_argument("--file", help="File path (for snapshot/export/import/sync)")
+    parser.add_argument("--format", choices=output.FORMATS, default="text",
+                        help="Output format for list/analytics")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Run commands from FILE ('-' for stdin), one per line, with JSON results")
     parser.add_argument("--version", action="store_true", help="Show version")
     parser.add_argument("--dry-run", action="store_true", help="Validate without executing")
+    parser.add_argument("--profile", action="store_true", help="Print timing and database metrics on exit")
+    parser.add_argument("--shards", type=int, default=0, help="Spread habits over N shard files")
+    parser.add_argument("--event-log", action="store_true", help="Store changes in an append-only event log")
+    parser.add_argument("--write-behind", action="store_true",
+                        help="Write changes to the database in background batches")
+    parser.add_argument("--trace-sql", nargs="?", const="on", choices=["on", "explain"],
+                        help="Log SQL statements to stderr ('explain' adds query plans)")
     return parser.parse_args()
 
 def main():
@@ -40,7 +61,20 @@ def main():
     
     """
     args = parse_args()
-    controller = AppController()
+    if args.profile:
+        metrics.enable()
+    if args.trace_sql:
+        sql_trace.enable(explain=args.trace_sql == "explain")
+    tracker_options = {}
+    if args.shards:
+        tracker_options["shards"] = args.shards
+    if args.event_log:
+        tracker_options["event_log"] = True
+    if args.tz:
+        tracker_options["tz"] = args.tz
+    if args.write_behind:
+        tracker_options["write_behind"] = True
+    controller = AppController(**tracker_options)
 
     try:
         if args.version:
@@ -51,6 +85,16 @@ def main():
             print(f"Valid command: {args.command}")
             return
 
+        if args.batch:
+            from habit.batch import run_batch
+
+            if args.batch == "-":
+                run_batch(controller, sys.stdin, sys.stdout)
+            else:
+                with open(args.batch, encoding="utf-8") as fh:
+                    run_batch(controller, fh, sys.stdout)
+            return
+
         if args.command:
             cmd = COMMAND_ALIASES.get(args.command.strip().lower(), args.command.strip().lower())
 
@@ -62,10 +106,22 @@ def main():
                 print("Usage: --command add --habit <name> --periodicity <frequency>")
                 return
 
+            options = {}
+            if args.file:
+                options["path"] = args.file
+            if args.format != "text":
+                options["format"] = args.format
+            if args.target:
+                options["target"] = args.target
+            if args.inactive:
+                options["inactive"] = args.inactive
+            if args.at:
+                options["at"] = args.at
             controller.handle_command(
                 cmd,
                 habit_name=args.habit.strip().lower() if args.habit else None,
-                periodicity=args.periodicity.strip().lower() if args.periodicity else None
+                periodicity=args.periodicity.strip().lower() if args.periodicity else None,
+                **options
             )
         else:
             print("\n🌿 Welcome to Habit Tracker CLI")
@@ -76,7 +132,14 @@ def main():
         print(f"\nError: {e}\n")
 
     finally:
-        print("Goodbye! 👋")
+        # Writes any changes still queued in write-behind mode.
+        controller.tracker.close()
+        # Batch mode, JSON output and CSV on stdin/stdout keep stdout for data only.
+        machine = args.batch or args.format != "text" or args.file == "-"
+        status = sys.stderr if machine else sys.stdout
+        if args.profile:
+            print(metrics.report(), file=status)
+        print("Goodbye! 👋", file=status)
 
 if __name__ == "__main__":
     main()
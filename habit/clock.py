@@ -0,0 +1,105 @@
+"""
+Timezone-aware, cached resolution of calendar days.
+
+Completions are stored as calendar dates, so every timestamp has to be
+turned into a date in the user's timezone before its period is known.
+Doing that with `datetime.astimezone` on every completion is comparatively
+expensive, so both lookups here are cached:
+
+- local_date caches the local date per (timezone, 15-minute UTC slot). Every
+  UTC offset in use today is a multiple of 15 minutes and transitions happen
+  on such boundaries, so a local day always starts on a slot boundary and
+  every timestamp within a slot has the same local date. Historical offsets
+  such as Monrovia's -00:44:30 (until 1972) break that rule; a slot in which
+  the local date changes is not cached and its timestamps are converted
+  exactly.
+- today_in caches the current local date until the next local midnight.
+
+Timezones are IANA names such as "Europe/Berlin"; None means the system's
+local time, matching the naive `datetime.now()` used elsewhere.
+"""
+import time
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+TimezoneLike = Union[str, tzinfo, None]
+
+_SLOT_SECONDS = 15 * 60
+
+_today_cache: Dict[Optional[tzinfo], Tuple[date, float]] = {}
+"""tz -> (local date, POSIX time of the next local midnight)."""
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str) -> tzinfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {name!r}") from None
+
+
+def resolve_tz(tz: TimezoneLike) -> Optional[tzinfo]:
+    """
+    Return the tzinfo for an IANA name (cached), pass tzinfo objects through,
+    and keep None (system local time).
+
+    Raises:
+        ValueError: if the name is not a known timezone.
+    """
+    if tz is None or isinstance(tz, tzinfo):
+        return tz
+    if tz.upper() == "UTC":
+        return timezone.utc
+    return _zone(tz)
+
+
+@lru_cache(maxsize=65536)
+def _slot_date(zone: Optional[tzinfo], slot: int) -> Optional[date]:
+    """The local date of every timestamp in `slot`, or None if the date changes within it."""
+    start = datetime.fromtimestamp(slot * _SLOT_SECONDS, zone)
+    end = datetime.fromtimestamp((slot + 1) * _SLOT_SECONDS - 1, zone)
+    # With one offset throughout, local time is monotonic within the slot,
+    # so equal dates at both ends mean the date holds for the whole slot.
+    if start.utcoffset() != end.utcoffset() or start.date() != end.date():
+        return None
+    return start.date()
+
+
+def local_date(timestamp: Union[datetime, float], tz: TimezoneLike = None) -> date:
+    """
+    Return the calendar date of `timestamp` in timezone `tz`.
+
+    Parameters:
+    timestamp : datetime | float
+        An aware datetime, a naive datetime (taken as UTC) or a POSIX timestamp.
+    tz : str | tzinfo | None
+        The timezone whose calendar applies; None is the system's local time.
+    """
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        timestamp = timestamp.timestamp()
+    zone = resolve_tz(tz)
+    day = _slot_date(zone, int(timestamp // _SLOT_SECONDS))
+    return day if day is not None else datetime.fromtimestamp(timestamp, zone).date()
+
+
+def today_in(tz: TimezoneLike = None) -> date:
+    """
+    Return today's date in timezone `tz` (None: system local time).
+
+    The result is cached until the next local midnight, so repeated calls
+    cost a dictionary lookup and a clock read.
+    """
+    zone = resolve_tz(tz)
+    now = time.time()
+    cached = _today_cache.get(zone)
+    if cached is not None and now < cached[1]:
+        return cached[0]
+    today = datetime.fromtimestamp(now, zone).date()
+    midnight = datetime.combine(today + timedelta(days=1), datetime.min.time(), zone)
+    # A naive midnight is interpreted in system local time by timestamp().
+    _today_cache[zone] = (today, midnight.timestamp())
+    return today
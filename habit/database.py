@@ -1,8 +1,59 @@
 import sqlite3
-from typing import List, Optional
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 from habit.habit import Habit
+from habit.metrics import METRICS
+from habit import sql_trace
 import json
-from datetime import datetime
+import lzma
+import zlib
+from datetime import date, datetime
+
+HabitRow = Tuple[str, str, str, str, int]
+"""A raw `habits` row: (name, periodicity, creation_date ISO string, completions JSON, target)."""
+
+COMPRESSORS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+"""Compressed completion payload formats: name -> (compress, decompress) of the JSON bytes."""
+
+Payload = Union[str, bytes]
+"""A stored `completions` value: JSON text, or compressed JSON bytes (see COMPRESSORS)."""
+
+
+def decode_payload(payload: Payload, fmt: str = "json") -> str:
+    """Return the completions JSON of a stored payload in format `fmt`."""
+    if fmt == "json":
+        return payload
+    try:
+        decompress = COMPRESSORS[fmt][1]
+    except KeyError:
+        raise ValueError(f"Unknown completions format: {fmt!r}") from None
+    return decompress(payload).decode()
+
+
+def _parse_dates(completions_json: str) -> Iterator[date]:
+    return (datetime.fromisoformat(d).date() for d in json.loads(completions_json))
+
+
+class HabitSummary(NamedTuple):
+    """The columns needed to list a habit, without its completion history."""
+
+    name: str
+    periodicity: str
+    target: int
+    streak: int
+
+
+HabitChange = Tuple[int, str, Optional[Habit], str]
+"""
+One change feed entry: (sequence number, habit name, the habit or None if it
+is no longer active, kind). The kind is "saved", "deleted" or "archived".
+"""
 
 
 class DatabaseManager:
@@ -15,107 +66,672 @@ class DatabaseManager:
 
     """
 
-    def __init__(self, db_name: str = "habits.db"):
+    # ?6 is the row's target, or NULL for rows without one (see bulk_insert).
+    _UPSERT_SQL = """
+        INSERT INTO habits (name, periodicity, creation_date, completions, completions_format, target)
+        VALUES (?1, ?2, ?3, ?4, ?5, COALESCE(?6, 1))
+        ON CONFLICT(name) DO UPDATE SET
+            periodicity=excluded.periodicity,
+            creation_date=excluded.creation_date,
+            completions=excluded.completions,
+            completions_format=excluded.completions_format,
+            target=COALESCE(?6, habits.target),
+            streak=NULL
+    """
+
+    _SAVE_SQL = """
+        INSERT INTO habits (name, periodicity, creation_date, completions, target, completions_format, streak)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            periodicity=excluded.periodicity,
+            creation_date=excluded.creation_date,
+            completions=excluded.completions,
+            target=excluded.target,
+            completions_format=excluded.completions_format,
+            streak=excluded.streak
+    """
+
+    _CHANGE_FEED_SQL = (
+        # One row per habit name holding its latest change. Re-inserting gives
+        # the row a new, higher seq (AUTOINCREMENT never reuses sequence numbers).
+        # Triggers delete + insert rather than INSERT OR REPLACE: the conflict
+        # policy of the firing statement (e.g. an upsert) would override theirs.
+        """
+        CREATE TABLE IF NOT EXISTS habit_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            deleted INTEGER NOT NULL,
+            archived INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS habits_changed_on_insert AFTER INSERT ON habits BEGIN
+            DELETE FROM habit_changes WHERE name = NEW.name;
+            INSERT INTO habit_changes (name, deleted) VALUES (NEW.name, 0);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS habits_changed_on_update AFTER UPDATE ON habits BEGIN
+            DELETE FROM habit_changes WHERE name IN (OLD.name, NEW.name);
+            INSERT INTO habit_changes (name, deleted) SELECT OLD.name, 1 WHERE OLD.name != NEW.name;
+            INSERT INTO habit_changes (name, deleted) VALUES (NEW.name, 0);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS habits_changed_on_delete AFTER DELETE ON habits BEGIN
+            DELETE FROM habit_changes WHERE name = OLD.name;
+            INSERT INTO habit_changes (name, deleted) VALUES (OLD.name, 1);
+        END
+        """,
+    )
+
+    _ARCHIVE_SQL = """
+        CREATE TABLE IF NOT EXISTS habit_archive (
+            name TEXT PRIMARY KEY,
+            periodicity TEXT NOT NULL,
+            creation_date TEXT NOT NULL,
+            target INTEGER NOT NULL,
+            archived_at TEXT NOT NULL,
+            history BLOB NOT NULL
+        )
+    """
+    """Cold storage for archived habits; `history` is the zlib-compressed completions JSON."""
+
+    def __init__(self, db_name: str = "habits.db", tracer: Optional[sql_trace.SQLTracer] = None,
+                 read_only: bool = False, journal_mode: Optional[str] = None,
+                 check_same_thread: bool = True, cache_size: int = 0,
+                 cached_statements: int = 128, compress_threshold: int = 2048,
+                 compression: str = "zlib"):
         """
         Initialize the DatabaseManager with a database name.
-        
+
         Args:
             db_name: Name of the SQLite database file (default: habits.db)
+            tracer: Optional SQLTracer; defaults to the process-wide tracer
+                    when tracing is enabled (see habit.sql_trace)
+            read_only: Open the file in SQLite's read-only mode; writes raise
+                       sqlite3.OperationalError and a missing file is not created
+            journal_mode: Optional SQLite journal mode to set on connect (e.g. "wal")
+            check_same_thread: Passed to sqlite3.connect; set False when the
+                               caller serializes access from several threads
+            cache_size: Keep up to this many deserialized habits for
+                        get_habit_by_name, least recently used first out
+                        (0 disables the cache)
+            cached_statements: Size of sqlite3's per-connection cache of
+                               prepared statements (passed to sqlite3.connect)
+            compress_threshold: Completions JSON of at least this many bytes is
+                                stored compressed (0 stores everything as JSON)
+            compression: Format used for compressed payloads, a key of COMPRESSORS
         """
+        if compression not in COMPRESSORS:
+            raise ValueError(f"compression must be one of {sorted(COMPRESSORS)}, not {compression!r}")
         self.db_name = db_name
+        self.read_only = read_only
+        self.journal_mode = journal_mode
+        self.check_same_thread = check_same_thread
+        self.cached_statements = cached_statements
+        self.compress_threshold = compress_threshold
+        self.compression = compression
         self._conn = None  # Track the connection
+        self._shared_cursor = None
+        self._transaction_depth = 0
+        self._habit_columns: Optional[str] = None
+        self.cache_size = cache_size
+        self._habit_cache: "OrderedDict[str, Habit]" = OrderedDict()
+        self._data_version: Optional[int] = None
+        self.tracer = tracer or sql_trace.active_tracer()
 
     def _connect(self):
         """Get a connection, reusing if possible"""
         if self._conn is None:
-            self._conn = sqlite3.connect(self.db_name)
+            if self.read_only:
+                uri = Path(self.db_name).resolve().as_uri() + "?mode=ro"
+                self._conn = sqlite3.connect(uri, uri=True, check_same_thread=self.check_same_thread,
+                                             cached_statements=self.cached_statements)
+            else:
+                self._conn = sqlite3.connect(self.db_name, check_same_thread=self.check_same_thread,
+                                             cached_statements=self.cached_statements)
+            if self.journal_mode:
+                self._conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            if self.tracer is not None:
+                self.tracer.attach(self._conn)
         return self._conn
 
+    def _cursor(self):
+        """
+        Return the connection's shared cursor, created once and reused by
+        every method that runs a statement and reads its result right away.
+
+        Together with the connection's statement cache (the SQL text of each
+        method is constant), repeated calls neither allocate a cursor nor
+        re-prepare their statement. Streaming readers such as iter_rows use
+        a cursor of their own so other calls cannot reset them.
+        """
+        if self._shared_cursor is None:
+            self._shared_cursor = self._connect().cursor()
+        return self._shared_cursor
+
+    def enable_trace(self, tracer: sql_trace.SQLTracer) -> None:
+        """
+        Trace every statement on this manager's connection with `tracer`.
+        """
+        self.tracer = tracer
+        if self._conn is not None:
+            tracer.attach(self._conn)
+
+    def _execute(self, cursor, sql: str, params=(), many: bool = False):
+        """
+        Run one statement on `cursor`, recording it as a round trip when
+        metrics are enabled and timing it when tracing is on.
+        """
+        run = cursor.executemany if many else cursor.execute
+        if not METRICS.enabled and self.tracer is None:
+            return run(sql, params)
+        start = time.perf_counter()
+        try:
+            return run(sql, params)
+        finally:
+            elapsed = time.perf_counter() - start
+            if METRICS.enabled:
+                METRICS.record_db(sql.split(None, 1)[0].upper(), elapsed)
+            if self.tracer is not None:
+                self.tracer.record(sql, elapsed, cursor.connection, None if many else params,
+                                   max(cursor.rowcount, 1) if many else 1)
+
+    @contextmanager
+    def _connection(self):
+        """
+        Yield the shared connection and roll back if the block fails.
+
+        Unlike `with conn:`, leaving the block does not commit; write methods
+        call _commit, which is deferred while a transaction() is open.
+        """
+        conn = self._connect()
+        try:
+            yield conn
+        except Exception:
+            if not self._transaction_depth:
+                conn.rollback()
+                self._habit_cache.clear()
+            raise
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group every write made inside the block into a single commit.
+
+        Nested blocks join the outermost transaction. If the block raises,
+        all of its writes are rolled back.
+        """
+        conn = self._connect()
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if not self._transaction_depth:
+                conn.rollback()
+                # Habits read inside the block may hold rolled-back writes.
+                self._habit_cache.clear()
+            raise
+        self._transaction_depth -= 1
+        if not self._transaction_depth:
+            self._commit(conn)
+
+    @contextmanager
+    def savepoint(self):
+        """
+        Undo the writes made inside the block if it raises, while keeping the
+        surrounding transaction() and the writes made before the block.
+
+        Raises:
+            ValueError: if no transaction() is open.
+        """
+        if not self._transaction_depth:
+            raise ValueError("savepoint() must be used inside transaction()")
+        conn = self._connect()
+        cursor = self._cursor()
+        if not conn.in_transaction:
+            # Otherwise the savepoint itself would begin the transaction, and
+            # releasing it would commit.
+            self._execute(cursor, "BEGIN")
+        self._execute(cursor, "SAVEPOINT habit_savepoint")
+        try:
+            yield self
+        except BaseException:
+            self._execute(cursor, "ROLLBACK TO habit_savepoint")
+            self._execute(cursor, "RELEASE habit_savepoint")
+            self._habit_cache.clear()
+            raise
+        self._execute(cursor, "RELEASE habit_savepoint")
+
+    def _commit(self, conn) -> None:
+        """
+        Commit the current transaction (timed when metrics or tracing are on).
+        Inside transaction() the commit is deferred to the end of the block.
+        """
+        if self._transaction_depth:
+            return
+        if not METRICS.enabled and self.tracer is None:
+            conn.commit()
+            return
+        start = time.perf_counter()
+        conn.commit()
+        elapsed = time.perf_counter() - start
+        if METRICS.enabled:
+            METRICS.record_db("COMMIT", elapsed)
+        if self.tracer is not None:
+            self.tracer.record("COMMIT", elapsed)
+
+    @staticmethod
+    def _row_to_habit(name: str, periodicity: str, creation_date: str, payload: Payload,
+                      target: int = 1, fmt: str = "json", streak: Optional[int] = None) -> Habit:
+        """
+        Build a Habit from the columns of one `habits` row.
+
+        The completions payload is kept as is and only decompressed and
+        parsed when the habit's completions are first used; the stored
+        streak (if any) answers get_streak until then. Loading and listing
+        habits therefore costs O(habits), not O(total history).
+        """
+        habit = Habit(name, periodicity, target)
+        habit.creation_date = datetime.fromisoformat(creation_date)
+        habit._defer_dates(lambda: _parse_dates(decode_payload(payload, fmt)), streak)
+        return habit
+
     def initialize_schema(self) -> None:
         """
         Creates the habits table if it doesn't exist.
-        
+
         Creates a 'habits' table with columns for name, periodicity,
-        creation date, and completions (stored as JSON).
+        creation date, completions (stored as JSON) and the per-period target.
+        Long completion histories are stored compressed; `completions_format`
+        tags each row's payload ("json" or a key of COMPRESSORS). `streak`
+        holds the current streak as of the last save (NULL if unknown), so
+        habits can be listed without decoding their history. Tables created
+        before these columns existed get them added.
+
+        Also installs the change feed (see iter_changes): a `habit_changes`
+        table kept up to date by triggers, so every write path, including
+        bulk_insert and other processes, is captured. Habits that existed
+        before the feed are recorded as changed once.
+
+        The `habit_archive` table holds archived habits (see archive_habit).
         """
-        with self._connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        with self._connection() as conn:
+            cursor = self._cursor()
+            self._execute(cursor, "PRAGMA table_info(habits)")
+            existing = {row[1] for row in cursor.fetchall()}
+            self._execute(cursor, """
                 CREATE TABLE IF NOT EXISTS habits (
                     name TEXT PRIMARY KEY,
                     periodicity TEXT NOT NULL,
                     creation_date TEXT NOT NULL,
-                    completions TEXT NOT NULL
+                    completions TEXT NOT NULL,
+                    target INTEGER NOT NULL DEFAULT 1,
+                    completions_format TEXT NOT NULL DEFAULT 'json',
+                    streak INTEGER
                 )
             """)
-            conn.commit()
+            if existing and "target" not in existing:
+                self._execute(cursor, "ALTER TABLE habits ADD COLUMN target INTEGER NOT NULL DEFAULT 1")
+            if existing and "completions_format" not in existing:
+                self._execute(cursor,
+                              "ALTER TABLE habits ADD COLUMN completions_format TEXT NOT NULL DEFAULT 'json'")
+            if existing and "streak" not in existing:
+                self._execute(cursor, "ALTER TABLE habits ADD COLUMN streak INTEGER")
+            self._execute(cursor, "PRAGMA table_info(habit_changes)")
+            feed_columns = {row[1] for row in cursor.fetchall()}
+            new_feed = not feed_columns
+            for sql in self._CHANGE_FEED_SQL:
+                self._execute(cursor, sql)
+            if feed_columns and "archived" not in feed_columns:
+                self._execute(cursor, "ALTER TABLE habit_changes ADD COLUMN archived INTEGER NOT NULL DEFAULT 0")
+            self._execute(cursor, self._ARCHIVE_SQL)
+            if existing and new_feed:
+                self._execute(cursor, "INSERT INTO habit_changes (name, deleted) SELECT name, 0 FROM habits")
+            self._commit(conn)
+        self._habit_columns = None
+        self._habit_cache.clear()
+
+    def _select_columns(self) -> str:
+        """
+        The column list for loading Habit rows (in _row_to_habit order).
+        Databases that were never migrated (e.g. opened read-only) lack the
+        target, format and streak columns; 1, 'json' and NULL stand in.
+        """
+        if self._habit_columns is None:
+            cursor = self._cursor()
+            self._execute(cursor, "PRAGMA table_info(habits)")
+            names = {row[1] for row in cursor.fetchall()}
+            target = "target" if "target" in names else "1"
+            fmt = "completions_format" if "completions_format" in names else "'json'"
+            streak = "streak" if "streak" in names else "NULL"
+            self._habit_columns = f"name, periodicity, creation_date, completions, {target}, {fmt}, {streak}"
+        return self._habit_columns
+
+    @staticmethod
+    def encode_completions(dates: Iterable[date]) -> str:
+        """
+        Serialize completion dates into the JSON stored in the `completions` column.
+        """
+        return json.dumps([d.isoformat() for d in dates])
+
+    def encode_payload(self, completions_json: str) -> Tuple[Payload, str]:
+        """
+        Return the stored form of a completions JSON string and its format
+        tag: compressed once it reaches compress_threshold bytes, else as is.
+        """
+        if self.compress_threshold and len(completions_json) >= self.compress_threshold:
+            return COMPRESSORS[self.compression][0](completions_json.encode()), self.compression
+        return completions_json, "json"
 
     def save_habit(self, habit: Habit) -> None:
         """
         Insert or update a habit in the database.
         """
-        with self._connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO habits (name, periodicity, creation_date, completions)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(name) DO UPDATE SET
-                    periodicity=excluded.periodicity,
-                    creation_date=excluded.creation_date,
-                    completions=excluded.completions
-            """, (
+        self._habit_cache.pop(habit.name, None)
+        with self._connection() as conn:
+            cursor = self._cursor()
+            payload, fmt = self.encode_payload(self.encode_completions(habit._sorted_dates()))
+            self._execute(cursor, self._SAVE_SQL, (
                 habit.name,
                 habit.periodicity,
                 habit.creation_date.isoformat(),
-                json.dumps([d.isoformat() for d in habit._dates])
+                payload,
+                habit.target,
+                fmt,
+                habit.get_streak()
             ))
-            conn.commit()
+            self._commit(conn)
+
+    def bulk_insert(self, rows: Iterable[HabitRow]) -> int:
+        """
+        Insert or update many raw habit rows in a single transaction.
+
+        `rows` may be a generator; it is consumed lazily, so callers can stream
+        rows without holding every habit in memory.
+
+        The target may be left out (four-element rows): new habits then get a
+        target of 1, and existing habits keep theirs. Long completion lists are
+        compressed as in save_habit.
+
+        Args:
+            rows: Iterable of (name, periodicity, creation_date, completions_json[, target]) tuples.
+        Returns:
+            The number of rows written.
+        """
+        count = 0
+
+        def counted():
+            nonlocal count
+            for name, periodicity, creation_date, completions_json, *target in rows:
+                count += 1
+                yield (name, periodicity, creation_date, *self.encode_payload(completions_json),
+                       target[0] if target else None)
+
+        self._habit_cache.clear()
+        with self._connection() as conn:
+            cursor = self._cursor()
+            self._execute(cursor, self._UPSERT_SQL, counted(), many=True)
+            self._commit(conn)
+        return count
 
     def load_all_habits(self) -> List[Habit]:
         """
         Load all habits from the database.
         """
-        with self._connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name, periodicity, creation_date, completions FROM habits")
+        with self._connection():
+            cursor = self._cursor()
+            self._execute(cursor, f"SELECT {self._select_columns()} FROM habits")
             rows = cursor.fetchall()
 
-        habits = []
-        for name, periodicity, creation_date, completions_json in rows:
-            habit = Habit(name, periodicity)
-            habit.creation_date = datetime.fromisoformat(creation_date)
-            habit._dates = set(datetime.fromisoformat(d).date() for d in json.loads(completions_json))
-            habits.append(habit)
+        habits = [self._row_to_habit(*row) for row in rows]
+        if METRICS.enabled:
+            METRICS.record_rows(len(habits))
         return habits
 
+    def list_summaries(self, periodicity: Optional[str] = None) -> List[HabitSummary]:
+        """
+        Return the name, periodicity, target and current streak of every
+        habit (optionally only those with `periodicity`), in load order.
+
+        Only these columns are read; the completions payload is fetched and
+        decoded just for rows without a stored streak (e.g. written by
+        bulk_insert), so listing costs O(habits) rather than O(history).
+        """
+        _, _, _, _, target, fmt, streak = self._select_columns().split(", ")
+        sql = f"""
+            SELECT name, periodicity, {target}, {streak},
+                   CASE WHEN {streak} IS NULL THEN creation_date END,
+                   CASE WHEN {streak} IS NULL THEN completions END, {fmt}
+            FROM habits
+        """
+        params: tuple = ()
+        if periodicity is not None:
+            sql += " WHERE periodicity = ?"
+            params = (periodicity,)
+        with self._connection():
+            cursor = self._cursor()
+            self._execute(cursor, sql, params)
+            rows = cursor.fetchall()
+
+        summaries = []
+        for name, period, row_target, row_streak, creation_date, payload, row_fmt in rows:
+            if row_streak is None:
+                row_streak = self._row_to_habit(name, period, creation_date, payload, row_target,
+                                                row_fmt).get_streak()
+            summaries.append(HabitSummary(name, period, row_target, row_streak))
+        return summaries
+
+    def iter_rows(self, batch_size: int = 1000) -> Iterator[HabitRow]:
+        """
+        Stream the raw rows of the `habits` table without building Habit objects.
+
+        Rows are fetched `batch_size` at a time, so memory stays bounded
+        regardless of the table size. Compressed payloads are decompressed,
+        so every row carries its completions as JSON text.
+        """
+        cursor = self._connect().cursor()
+        self._execute(cursor, f"SELECT {self._select_columns()} FROM habits")
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return
+            if METRICS.enabled:
+                METRICS.record_rows(len(batch))
+            for name, periodicity, creation_date, payload, target, fmt, _ in batch:
+                yield name, periodicity, creation_date, decode_payload(payload, fmt), target
+
+    def _check_data_version(self) -> None:
+        """
+        Drop the habit cache if another connection (e.g. another process)
+        committed since the last check. SQLite bumps `PRAGMA data_version`
+        only for commits made through other connections; this manager's own
+        writes invalidate their entries directly.
+        """
+        cursor = self._cursor()
+        self._execute(cursor, "PRAGMA data_version")
+        version = cursor.fetchone()[0]
+        if version != self._data_version:
+            self._habit_cache.clear()
+            self._data_version = version
+
+    def _cache_habit(self, habit: Habit) -> None:
+        """Remember a copy of `habit`, evicting the least recently used entry when full."""
+        self._habit_cache[habit.name] = habit.copy()
+        if len(self._habit_cache) > self.cache_size:
+            self._habit_cache.popitem(last=False)
+
     def get_habit_by_name(self, name: str) -> Optional[Habit]:
         """
         Retrieve a single habit by name from the database.
+
+        With a cache_size, recently read habits are served from memory
+        without running the query or parsing completions; callers always
+        get their own copy.
         """
-        with self._connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT name, periodicity, creation_date, completions
+        if self.cache_size:
+            self._check_data_version()
+            cached = self._habit_cache.get(name)
+            if METRICS.enabled:
+                METRICS.record_cache(cached is not None)
+            if cached is not None:
+                self._habit_cache.move_to_end(name)
+                return cached.copy()
+
+        with self._connection():
+            cursor = self._cursor()
+            self._execute(cursor, f"""
+                SELECT {self._select_columns()}
                 FROM habits
                 WHERE name = ?
             """, (name,))
             row = cursor.fetchone()
 
         if row:
-            habit = Habit(row[0], row[1])
-            habit.creation_date = datetime.fromisoformat(row[2])
-            habit._dates = set(datetime.fromisoformat(d).date() for d in json.loads(row[3]))
+            if METRICS.enabled:
+                METRICS.record_rows(1)
+            habit = self._row_to_habit(*row)
+            if self.cache_size:
+                self._cache_habit(habit)
             return habit
         return None
 
+    def last_change_seq(self) -> int:
+        """
+        Return the sequence number of the most recent change (0 if none).
+
+        A consumer that loads everything stores this value and afterwards
+        asks iter_changes for what happened since.
+        """
+        cursor = self._cursor()
+        self._execute(cursor, "SELECT COALESCE(MAX(seq), 0) FROM habit_changes")
+        return cursor.fetchone()[0]
+
+    def iter_changes(self, since_seq: int = 0, batch_size: int = 1000) -> Iterator[HabitChange]:
+        """
+        Stream the habits that changed after sequence number `since_seq`.
+
+        Each habit appears at most once, with its latest state, in sequence
+        order; deleted (and renamed-away) and archived habits come with None
+        and are told apart by the kind (see HabitChange). Remember the
+        last seq seen and pass it next time to receive only newer changes, so
+        a refresh costs O(changes) rather than O(database).
+
+        Args:
+            since_seq: Only return changes with a greater sequence number.
+            batch_size: Rows fetched per round trip.
+        """
+        cursor = self._connect().cursor()
+        # The feed is created by initialize_schema, which also adds `target`.
+        self._execute(cursor, """
+            SELECT c.seq, c.name, c.deleted, c.archived,
+                   h.name, h.periodicity, h.creation_date, h.completions, h.target, h.completions_format,
+                   h.streak
+            FROM habit_changes c LEFT JOIN habits h ON h.name = c.name
+            WHERE c.seq > ?
+            ORDER BY c.seq
+        """, (since_seq,))
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return
+            if METRICS.enabled:
+                METRICS.record_rows(len(batch))
+            for seq, name, deleted, archived, *row in batch:
+                if deleted:
+                    yield seq, name, None, "archived" if archived else "deleted"
+                else:
+                    yield seq, name, self._row_to_habit(*row), "saved"
+
+    def rename_habit(self, old_name: str, new_name: str) -> None:
+        """
+        Move a habit's row to a new name.
+        """
+        self._habit_cache.pop(old_name, None)
+        self._habit_cache.pop(new_name, None)
+        with self._connection() as conn:
+            cursor = self._cursor()
+            self._execute(cursor, "UPDATE habits SET name = ? WHERE name = ?", (new_name, old_name))
+            self._commit(conn)
+
     def delete_habit(self, name: str) -> None:
         """
         Delete a habit by name.
         """
-        with self._connect() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM habits WHERE name = ?", (name,))
-            conn.commit()
+        self._habit_cache.pop(name, None)
+        with self._connection() as conn:
+            cursor = self._cursor()
+            self._execute(cursor, "DELETE FROM habits WHERE name = ?", (name,))
+            self._commit(conn)
+
+    def archive_habit(self, habit: Habit) -> None:
+        """
+        Move a habit to the archive: its completions are stored compressed in
+        `habit_archive` and its row is removed from `habits`, so it no longer
+        appears in load_all_habits or listings. The change feed records it as
+        archived rather than deleted.
+        """
+        history = zlib.compress(self.encode_completions(habit._sorted_dates()).encode(), 9)
+        with self.transaction():
+            cursor = self._cursor()
+            self._execute(cursor, """
+                INSERT OR REPLACE INTO habit_archive
+                    (name, periodicity, creation_date, target, archived_at, history)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (habit.name, habit.periodicity, habit.creation_date.isoformat(), habit.target,
+                  datetime.now().isoformat(timespec="seconds"), history))
+            self.delete_habit(habit.name)
+            self._execute(cursor, "DELETE FROM habit_changes WHERE name = ?", (habit.name,))
+            self._execute(cursor, "INSERT INTO habit_changes (name, deleted, archived) VALUES (?, 1, 1)",
+                          (habit.name,))
+
+    def list_archived(self) -> List[Tuple[str, str, str]]:
+        """
+        Return (name, periodicity, archived_at) for every archived habit,
+        without decompressing any history.
+        """
+        cursor = self._cursor()
+        self._execute(cursor, "SELECT name, periodicity, archived_at FROM habit_archive ORDER BY name")
+        return cursor.fetchall()
+
+    def get_archived(self, name: str) -> Optional[Habit]:
+        """
+        Load one archived habit, decompressing its history.
+        """
+        cursor = self._cursor()
+        self._execute(cursor, """
+            SELECT name, periodicity, creation_date, history, target
+            FROM habit_archive WHERE name = ?
+        """, (name,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        name, periodicity, creation_date, history, target = row
+        return self._row_to_habit(name, periodicity, creation_date, zlib.decompress(history).decode(), target)
+
+    def restore_habit(self, name: str) -> Optional[Habit]:
+        """
+        Move an archived habit back into `habits`.
+
+        Returns:
+            The restored habit, or None if no habit of that name is archived.
+
+        Raises:
+            ValueError: if an active habit with the same name exists.
+        """
+        habit = self.get_archived(name)
+        if habit is None:
+            return None
+        cursor = self._cursor()
+        self._execute(cursor, "SELECT 1 FROM habits WHERE name = ?", (name,))
+        if cursor.fetchone() is not None:
+            raise ValueError(f"A habit named '{name}' already exists.")
+        with self.transaction():
+            self.save_habit(habit)
+            self._execute(self._cursor(), "DELETE FROM habit_archive WHERE name = ?", (name,))
+        return habit
 
     def close(self):
         """
@@ -124,3 +740,6 @@ class DatabaseManager:
         if self._conn is not None:
             self._conn.close()
             self._conn = None
+            self._shared_cursor = None
+        self._habit_cache.clear()
+        self._data_version = None
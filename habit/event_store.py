@@ -0,0 +1,358 @@
+"""
+Event-sourced habit storage.
+
+EventSourcedDatabase offers the DatabaseManager interface but, instead of
+rewriting a habit's full row on every save, appends small events to an
+append-only log:
+
+- add                 full state of a new (or replaced) habit
+- complete            newly logged completion dates
+- change_periodicity  new periodicity
+- change_target       new completions-per-period target
+- rename              new name
+- delete              habit removed
+
+Every `snapshot_every` events the folded state of all habits is written as a
+snapshot, so startup only replays the events after the latest snapshot.
+`compact()` folds old events into a snapshot and drops them, and `state_at()`
+reconstructs all habits as they were at any time since the last compaction.
+"""
+import json
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from habit.database import DatabaseManager, HabitRow
+from habit.habit import Habit
+
+HabitState = Dict[str, Dict]
+"""name -> {"periodicity": str, "creation_date": str, "completions": set of ISO dates}"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _timestamp(when: datetime) -> str:
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return when.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def apply_event(state: HabitState, kind: str, name: str, data: Dict) -> None:
+    """Fold one event into `state` (in place)."""
+    if kind == "add":
+        state[name] = {
+            "periodicity": data["periodicity"],
+            "creation_date": data["creation_date"],
+            "completions": set(data["completions"]),
+            "target": data.get("target", 1),
+        }
+    elif kind == "complete":
+        state[name]["completions"].update(data["completions"])
+    elif kind == "change_periodicity":
+        state[name]["periodicity"] = data["periodicity"]
+    elif kind == "change_target":
+        state[name]["target"] = data["target"]
+    elif kind == "rename":
+        state[data["new_name"]] = state.pop(name)
+    elif kind == "delete":
+        state.pop(name, None)
+    else:
+        raise ValueError(f"Unknown event kind: {kind}")
+
+
+def _to_habit(name: str, entry: Dict) -> Habit:
+    habit = Habit(name, entry["periodicity"], entry.get("target", 1))
+    habit.creation_date = datetime.fromisoformat(entry["creation_date"])
+    habit._dates = {date.fromisoformat(d) for d in entry["completions"]}
+    return habit
+
+
+class EventSourcedDatabase:
+    """
+    DatabaseManager look-alike backed by an event log plus periodic snapshots.
+    """
+
+    def __init__(self, db_name: str = "habits.db", snapshot_every: int = 1000,
+                 check_same_thread: bool = True):
+        """
+        Parameters:
+        -----------
+        db_name : str
+            SQLite file holding the `habit_events` and `habit_snapshots` tables.
+        snapshot_every : int
+            Write a snapshot after this many events (0 disables automatic snapshots).
+        check_same_thread : bool
+            Passed to the underlying DatabaseManager.
+        """
+        self.db_name = db_name
+        self.snapshot_every = snapshot_every
+        self.db = DatabaseManager(db_name, check_same_thread=check_same_thread)
+        self._state: Optional[HabitState] = None
+        self._since_snapshot = 0
+
+    def initialize_schema(self) -> None:
+        """
+        Create the event and snapshot tables if they don't exist.
+
+        A database written by DatabaseManager is migrated on first use: while
+        the log is empty, every row of its `habits` table is recorded as an
+        "add" event. The `habits` table itself is left untouched.
+        """
+        conn = self.db._connect()
+        cursor = self.db._cursor()
+        self.db._execute(cursor, """
+            CREATE TABLE IF NOT EXISTS habit_events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+        """)
+        self.db._execute(cursor, """
+            CREATE TABLE IF NOT EXISTS habit_snapshots (
+                seq INTEGER PRIMARY KEY,
+                taken_at TEXT NOT NULL,
+                state TEXT NOT NULL
+            )
+        """)
+        self.db._execute(cursor, "PRAGMA table_info(habits)")
+        legacy = bool(cursor.fetchall())
+        self.db._commit(conn)
+        if legacy:
+            self.db._execute(cursor, """
+                SELECT EXISTS (SELECT 1 FROM habit_events) OR EXISTS (SELECT 1 FROM habit_snapshots)
+            """)
+            if not cursor.fetchone()[0]:
+                with self.transaction():
+                    self.bulk_insert(self.db.iter_rows())
+
+    # Replay
+
+    def _latest_snapshot(self, until: Optional[str] = None) -> Tuple[int, HabitState]:
+        cursor = self.db._cursor()
+        if until is None:
+            self.db._execute(cursor, "SELECT seq, state FROM habit_snapshots ORDER BY seq DESC LIMIT 1")
+        else:
+            self.db._execute(cursor, """
+                SELECT seq, state FROM habit_snapshots
+                WHERE taken_at <= ? ORDER BY seq DESC LIMIT 1
+            """, (until,))
+        row = cursor.fetchone()
+        if row is None:
+            return 0, {}
+        state = json.loads(row[1])
+        for entry in state.values():
+            entry["completions"] = set(entry["completions"])
+        return row[0], state
+
+    def _replay(self, until: Optional[str] = None) -> Tuple[HabitState, int]:
+        """Return the folded state (and the number of events replayed)."""
+        seq, state = self._latest_snapshot(until)
+        cursor = self.db._connect().cursor()
+        sql = "SELECT kind, name, data FROM habit_events WHERE seq > ?"
+        params: tuple = (seq,)
+        if until is not None:
+            sql += " AND ts <= ?"
+            params += (until,)
+        self.db._execute(cursor, sql + " ORDER BY seq", params)
+        replayed = 0
+        for kind, name, data in cursor:
+            apply_event(state, kind, name, json.loads(data))
+            replayed += 1
+        return state, replayed
+
+    def _current(self) -> HabitState:
+        if self._state is None:
+            self._state, self._since_snapshot = self._replay()
+        return self._state
+
+    def state_at(self, when: datetime) -> List[Habit]:
+        """
+        Reconstruct all habits as they were at `when`.
+
+        Raises:
+            ValueError: if the log was compacted after `when`.
+        """
+        ts = _timestamp(when)
+        cursor = self.db._cursor()
+        self.db._execute(cursor, "SELECT seq, taken_at FROM habit_snapshots ORDER BY seq LIMIT 1")
+        oldest = cursor.fetchone()
+        if oldest is not None and oldest[0] > 0 and ts < oldest[1]:
+            # Events folded into the oldest snapshot are gone once compacted.
+            self.db._execute(cursor, "SELECT 1 FROM habit_events WHERE seq <= ? LIMIT 1", (oldest[0],))
+            if cursor.fetchone() is None:
+                raise ValueError(f"History before {oldest[1]} was compacted")
+        state, _ = self._replay(ts)
+        return [_to_habit(name, entry) for name, entry in state.items()]
+
+    # Writes
+
+    def _append(self, kind: str, name: str, data: Dict) -> None:
+        state = self._current()
+        conn = self.db._connect()
+        self.db._execute(self.db._cursor(),
+                         "INSERT INTO habit_events (ts, kind, name, data) VALUES (?, ?, ?, ?)",
+                         (_now(), kind, name, json.dumps(data)))
+        self.db._commit(conn)
+        apply_event(state, kind, name, data)
+        self._since_snapshot += 1
+        if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Append every event recorded inside the block in a single commit.
+
+        If the block raises, the events are rolled back and the folded state
+        is rebuilt from the log on next access.
+        """
+        try:
+            with self.db.transaction():
+                yield self
+        except BaseException:
+            self._state = None
+            raise
+
+    @contextmanager
+    def savepoint(self):
+        """
+        Drop the events recorded inside the block if it raises, keeping the
+        surrounding transaction() (see DatabaseManager.savepoint).
+        """
+        try:
+            with self.db.savepoint():
+                yield self
+        except BaseException:
+            self._state = None
+            raise
+
+    def save_habit(self, habit: Habit) -> None:
+        """
+        Record the difference between `habit` and its last known state as events.
+        """
+        state = self._current()
+        dates = {d.isoformat() for d in habit._dates}
+        known = state.get(habit.name)
+        if known is None or not known["completions"] <= dates:
+            self._append("add", habit.name, {
+                "periodicity": habit.periodicity,
+                "creation_date": habit.creation_date.isoformat(),
+                "completions": sorted(dates),
+                "target": habit.target,
+            })
+            return
+        if known["periodicity"] != habit.periodicity:
+            self._append("change_periodicity", habit.name, {"periodicity": habit.periodicity})
+        if known.get("target", 1) != habit.target:
+            self._append("change_target", habit.name, {"target": habit.target})
+        new_dates = dates - known["completions"]
+        if new_dates:
+            self._append("complete", habit.name, {"completions": sorted(new_dates)})
+
+    def bulk_insert(self, rows: Iterable[HabitRow]) -> int:
+        """
+        Record raw `habits` rows as "add" events, replacing habits of the same
+        name. Rows without a target keep the replaced habit's target, as in
+        DatabaseManager.bulk_insert.
+
+        Returns:
+            The number of rows written.
+        """
+        count = 0
+        for name, periodicity, creation_date, completions_json, *target in rows:
+            self._append("add", name, {
+                "periodicity": periodicity,
+                "creation_date": creation_date,
+                "completions": json.loads(completions_json),
+                "target": target[0] if target else self._current().get(name, {}).get("target", 1),
+            })
+            count += 1
+        return count
+
+    def rename_habit(self, old_name: str, new_name: str) -> None:
+        """Record that a habit was renamed."""
+        if old_name in self._current() and old_name != new_name:
+            self._append("rename", old_name, {"new_name": new_name})
+
+    def delete_habit(self, name: str) -> None:
+        """Record that a habit was deleted."""
+        if name in self._current():
+            self._append("delete", name, {})
+
+    # Reads
+
+    def load_all_habits(self) -> List[Habit]:
+        """Return every habit of the current state."""
+        return [_to_habit(name, entry) for name, entry in self._current().items()]
+
+    def iter_rows(self, batch_size: int = 1000) -> Iterator[HabitRow]:
+        """Yield the current state as raw `habits` rows (batch_size is unused)."""
+        for name, entry in list(self._current().items()):
+            yield (name, entry["periodicity"], entry["creation_date"],
+                   json.dumps(sorted(entry["completions"])), entry.get("target", 1))
+
+    def get_habit_by_name(self, name: str) -> Optional[Habit]:
+        """Return one habit of the current state, or None."""
+        entry = self._current().get(name)
+        return _to_habit(name, entry) if entry is not None else None
+
+    # Maintenance
+
+    def _write_snapshot(self, seq: int, taken_at: str, state: HabitState) -> None:
+        payload = json.dumps({
+            name: dict(entry, completions=sorted(entry["completions"]))
+            for name, entry in state.items()
+        })
+        conn = self.db._connect()
+        self.db._execute(self.db._cursor(),
+                         "INSERT OR REPLACE INTO habit_snapshots (seq, taken_at, state) VALUES (?, ?, ?)",
+                         (seq, taken_at, payload))
+        self.db._commit(conn)
+
+    def snapshot(self) -> int:
+        """
+        Write the current state as a snapshot.
+
+        Returns:
+            The sequence number of the last event included.
+        """
+        state = self._current()
+        cursor = self.db._cursor()
+        self.db._execute(cursor, "SELECT COALESCE(MAX(seq), 0) FROM habit_events")
+        seq = cursor.fetchone()[0]
+        self._write_snapshot(seq, _now(), state)
+        self._since_snapshot = 0
+        return seq
+
+    def compact(self, before: Optional[datetime] = None) -> int:
+        """
+        Fold events older than `before` (default: now) into a snapshot and
+        delete them, together with the snapshots they supersede.
+
+        Point-in-time queries remain possible from `before` onwards.
+
+        Returns:
+            The number of events removed.
+        """
+        until = _timestamp(before) if before else _now()
+        cursor = self.db._cursor()
+        self.db._execute(cursor, "SELECT COALESCE(MAX(seq), 0) FROM habit_events WHERE ts <= ?", (until,))
+        seq = cursor.fetchone()[0]
+        state, _ = self._replay(until)
+        self._write_snapshot(seq, until, state)
+
+        conn = self.db._connect()
+        cursor = self.db._cursor()
+        self.db._execute(cursor, "DELETE FROM habit_events WHERE seq <= ?", (seq,))
+        removed = cursor.rowcount
+        self.db._execute(cursor, "DELETE FROM habit_snapshots WHERE seq < ?", (seq,))
+        self.db._commit(conn)
+        return removed
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        self.db.close()
@@ -0,0 +1,125 @@
+"""
+Fleet-wide analytics across many habit databases.
+
+Each database (one per tenant, or one per shard) is opened read-only and
+reduced to a small partial result in a worker process. Partials are merged
+with associative reducers — a top-k merge for streaks and plain sums for
+counts — so shards can be processed in any order and grouping.
+
+Usage:
+    python -m habit.fleet tenants/*.db --top 10 --workers 8
+"""
+import argparse
+import heapq
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, reduce
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from habit import analytics
+from habit.database import DatabaseManager
+
+StreakEntry = Tuple[int, str, str]
+"""(longest_streak, database_path, habit_name)"""
+
+
+def empty_partial() -> Dict:
+    """Return the identity element for merge_partials."""
+    return {"top": [], "periodicity": Counter(), "habits": 0, "shards": 0, "errors": []}
+
+
+def analyze_shard(path: str, top_k: int = 10) -> Dict:
+    """
+    Compute the partial result for one database.
+
+    Args:
+        path: Path to a habits database; it is opened read-only.
+        top_k: How many of the shard's longest streaks to keep.
+    Returns:
+        Partial result dict (see empty_partial). Databases that cannot be read
+        are reported in `errors` instead of failing the whole run.
+    """
+    result = empty_partial()
+    result["shards"] = 1
+    db = DatabaseManager(path, read_only=True)
+    try:
+        habits = db.load_all_habits()
+    except Exception as e:
+        result["errors"].append((path, str(e)))
+        return result
+    finally:
+        db.close()
+
+    result["habits"] = len(habits)
+    result["periodicity"] = Counter(h.periodicity for h in habits)
+    result["top"] = heapq.nlargest(
+        top_k, ((analytics.longest_streak_for(h), path, h.name) for h in habits))
+    return result
+
+
+def merge_partials(a: Dict, b: Dict, top_k: int = 10) -> Dict:
+    """
+    Combine two partial results. The operation is associative, and
+    empty_partial() is its identity.
+    """
+    return {
+        "top": heapq.nlargest(top_k, a["top"] + b["top"]),
+        "periodicity": a["periodicity"] + b["periodicity"],
+        "habits": a["habits"] + b["habits"],
+        "shards": a["shards"] + b["shards"],
+        "errors": a["errors"] + b["errors"],
+    }
+
+
+def run_fleet_analytics(paths: Sequence[str], top_k: int = 10, workers: Optional[int] = None) -> Dict:
+    """
+    Analyze every database in `paths` and merge the results.
+
+    Args:
+        paths: Database files to analyze.
+        top_k: Number of longest streaks to report fleet-wide.
+        workers: Worker processes (default: CPU count). 1 runs in-process.
+    Returns:
+        The merged partial result.
+    """
+    workers = workers or os.cpu_count() or 1
+    analyze = partial(analyze_shard, top_k=top_k)
+    merge = partial(merge_partials, top_k=top_k)
+
+    if workers == 1 or len(paths) <= 1:
+        partials: Iterable[Dict] = map(analyze, paths)
+        return reduce(merge, partials, empty_partial())
+
+    # Several shards per task keep inter-process overhead small next to the work.
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return reduce(merge, pool.map(analyze, paths, chunksize=chunksize), empty_partial())
+
+
+def format_report(result: Dict) -> str:
+    """Format a merged result as text."""
+    lines = [f"📊 Fleet report: {result['habits']} habits in {result['shards']} databases"]
+    lines.append("\n🏆 Longest streaks:")
+    for streak, path, name in result["top"]:
+        lines.append(f" - {name} ({path}): {streak}")
+    lines.append("\n📅 Habits by periodicity:")
+    for periodicity, count in sorted(result["periodicity"].items()):
+        lines.append(f" {periodicity.capitalize()}: {count}")
+    for path, error in result["errors"]:
+        lines.append(f"⚠️ {path}: {error}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Analytics across many habit databases.")
+    parser.add_argument("paths", nargs="+", help="Database files")
+    parser.add_argument("--top", type=int, default=10, help="Number of top streaks to show")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    print(format_report(run_fleet_analytics(args.paths, args.top, args.workers)))
+
+
+if __name__ == "__main__":
+    main()
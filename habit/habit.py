@@ -1,104 +1,318 @@
-from datetime import datetime, timezone,timedelta, date
-from dateutil.relativedelta import relativedelta
-from typing import List, Set, Tuple
+from bisect import insort
+from datetime import datetime, timezone, date
+from heapq import merge
+from typing import Callable, Dict, Iterable, List, Optional, Set, Union
+
+from habit import clock
+from habit.clock import TimezoneLike
+from habit.periods import PeriodPolicy, current_run, get_policy
+
+# Bound at import time so isinstance checks keep working when tests patch `datetime`.
+_DATETIME = datetime
+
+
+def _as_date(d: Union[date, datetime]) -> date:
+    return d.date() if isinstance(d, _DATETIME) else d
 
 
 class Habit:
     """
-    Tracks a habit's completions (no duplicates per period) and calculates streaks.
+    Tracks a habit's completions (up to `target` per period, at most one per
+    day) and calculates streaks of periods that met the target.
     """
 
-    def __init__(self, name: str, periodicity: str):
+    def __init__(self, name: str, periodicity: str, target: int = 1):
         """
         Parameters:
         -----------
         name : str
             The habit’s description.
         periodicity : str
-            One of "daily", "weekly", or "monthly".
+            "daily", "weekly", "monthly", "weekdays", "every N days" or
+            "every N weeks" (see habit.periods).
+        target : int
+            Completions (on different days) needed for a period to count,
+            e.g. 3 for "3x per week". Defaults to 1.
         """
-        valid = {"daily", "weekly", "monthly"}
-        periodicity = periodicity.lower()
-      
-        if periodicity not in valid:
-            raise ValueError(f"Periodicity must be one of {valid}")
-
         self.name: str = name
-        self.periodicity: str = periodicity
+        self._target = 1
+        self.set_schedule(periodicity, target)
         self.creation_date: datetime = datetime.now(timezone.utc)
         # store unique dates only (no time component)
-        self._dates: Set[date] = set()
+        self._dates = set()
+
+    @property
+    def periodicity(self) -> str:
+        """The normalized periodicity name, e.g. "daily" or "every 2 days"."""
+        return self._policy.name
+
+    @periodicity.setter
+    def periodicity(self, value: str) -> None:
+        self.set_schedule(value)
+
+    @property
+    def target(self) -> int:
+        """Completions needed per period for it to count towards a streak."""
+        return self._target
+
+    @target.setter
+    def target(self, value: int) -> None:
+        self.set_schedule(self.periodicity, value)
+
+    def set_schedule(self, periodicity: str, target: Optional[int] = None) -> None:
+        """
+        Change the periodicity and, optionally, the target together.
+
+        Raises:
+            ValueError: if the periodicity is unknown or the target cannot be
+                        met within one of its periods.
+        """
+        policy = get_policy(periodicity)
+        target = self._target if target is None else target
+        self._check_target(target, policy)
+        self._policy, self._target = policy, target
+        self._invalidate()
+
+    @staticmethod
+    def _check_target(target: int, policy: PeriodPolicy) -> None:
+        if not isinstance(target, int) or target < 1:
+            raise ValueError("Target must be a positive integer")
+        if target > policy.max_days:
+            raise ValueError(f"A {policy.name} habit can be completed at most "
+                             f"{policy.max_days} time(s) per period")
 
-    def complete_task(self) -> date:
+    @property
+    def _dates(self) -> Set[date]:
+        """The set of logged dates (at most `target` per period)."""
+        self._sync()
+        return self._date_set
+
+    @_dates.setter
+    def _dates(self, value: Iterable[date]) -> None:
+        self._loader: Optional[Callable[[], Iterable[date]]] = None
+        self._date_set: Set[date] = value if isinstance(value, set) else set(value)
+        self._invalidate()
+
+    def _defer_dates(self, loader: Callable[[], Iterable[date]], streak: Optional[int] = None) -> None:
+        """
+        Set the completions to whatever `loader` returns, calling it only when
+        the history is first needed, so stored habits that are never used
+        are never decoded.
+
+        `streak`, if known (e.g. stored alongside the history), is returned
+        by get_streak without loading anything.
+        """
+        self._date_set = set()
+        self._loader = loader
+        self._invalidate()
+        self._streak_cache = streak
+
+    def _invalidate(self) -> None:
+        """Drop the derived state (period counters, met periods, sorted dates, streak)."""
+        self._counts: Optional[Dict[int, int]] = None
+        self._sorted_keys: Optional[List[int]] = None
+        self._sorted: Optional[List[date]] = None
+        self._streak_cache: Optional[int] = None
+        self._cached_len = -1
+
+    def _sync(self) -> None:
         """
-        Record today’s date for this habit—unless already recorded
-        in the same period (day/week/month).
+        Rebuild the derived state if `_dates` was changed behind our back
+        (e.g. `habit._dates.add(...)`); adding or removing dates changes its size.
+        Deferred completions (see _defer_dates) are loaded here.
+        """
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            self._date_set = set(loader())
+        if self._cached_len != len(self._date_set):
+            self._invalidate()
+            self._cached_len = len(self._date_set)
+
+    def _period_key(self, d: date) -> int:
+        """
+        Map `d` to the ordinal of its period according to the habit's period
+        policy; consecutive periods have consecutive ordinals.
+        """
+        return self._policy.key(d)
+
+    def _period_counts(self) -> Dict[int, int]:
+        """Completions logged per period ordinal."""
+        self._sync()
+        if self._counts is None:
+            key = self._policy.key
+            counts: Dict[int, int] = {}
+            for d in self._date_set:
+                k = key(d)
+                counts[k] = counts.get(k, 0) + 1
+            self._counts = counts
+        return self._counts
+
+    def _sorted_period_keys(self) -> List[int]:
+        """The ordinals of the periods that met the target, oldest first."""
+        counts = self._period_counts()
+        if self._sorted_keys is None:
+            target = self._target
+            self._sorted_keys = sorted(k for k, n in counts.items() if n >= target)
+        return self._sorted_keys
+
+    def _sorted_dates(self) -> List[date]:
+        self._sync()
+        if self._sorted is None:
+            self._sorted = sorted(self._date_set)
+        return self._sorted
+
+    def complete_task(self, tz: TimezoneLike = None) -> date:
+        """
+        Record today’s date for this habit—unless already recorded, or the
+        current period (day/week/month) already met its target.
+
+        Parameters:
+        -----------
+        tz : str | tzinfo | None
+            Timezone whose calendar decides what "today" is (e.g. "Asia/Tokyo");
+            None uses the system's local time.
 
         Returns:
         --------
         date
             The date logged (today).
         """
-        today = datetime.now().date()
-        if not self._is_duplicate(today):
-            self._dates.add(today)
+        today = datetime.now().date() if tz is None else clock.today_in(tz)
+        self.complete_on(today)
         return today
 
-    def _is_duplicate(self, d: date) -> bool:
+    def complete_at(self, timestamp: Union[datetime, float], tz: TimezoneLike = None) -> bool:
         """
-        Check whether 'd' falls in a period already logged.
+        Record a completion that happened at `timestamp`, in the period that
+        contains the timestamp's calendar date in timezone `tz`.
+
+        Parameters:
+        -----------
+        timestamp : datetime | float
+            An aware datetime, a naive datetime (taken as UTC) or a POSIX timestamp.
+        tz : str | tzinfo | None
+            The user's timezone; None uses the system's local time.
 
-        - Daily: same calendar date
-        - Weekly: same ISO year & week
-        - Monthly: same year & month
+        Returns:
+        --------
+        bool
+            True if the date was recorded, False if it was a duplicate.
         """
-        if self.periodicity == "daily":
-            return d in self._dates
+        return self.complete_on(clock.local_date(timestamp, tz))
 
-        if self.periodicity == "weekly":
-            y, w, _ = d.isocalendar()
-            return any((y, w) == dd.isocalendar()[:2] for dd in self._dates)
+    def complete_on(self, d: date) -> bool:
+        """
+        Record a completion on a specific (e.g. backdated) date, unless the
+        date is already logged or its period already met the target.
 
-        # monthly
-        return any((d.year, d.month) == (dd.year, dd.month) for dd in self._dates)
+        The per-period counter and, when the period reaches its target, the
+        cached streak are updated in O(1) for the newest period; backdated
+        completions fall back to recomputing the streak on next access.
 
-    def get_streak(self) -> int:
+        Returns:
+        --------
+        bool
+            True if the date was recorded, False if it was a duplicate.
         """
-        Compute the current streak of consecutive periods.
+        d = _as_date(d)
+        counts = self._period_counts()
+        key = self._policy.key(d)
+        count = counts.get(key, 0)
+        if count >= self._target or d in self._date_set:
+            return False
+        counts[key] = count + 1
+        if self._sorted is not None:
+            insort(self._sorted, d)
+        self._date_set.add(d)
+        self._cached_len = len(self._date_set)
+        if count + 1 == self._target:
+            self._period_met(key)
+        return True
+
+    def _period_met(self, key: int) -> None:
+        """Record that period `key` just reached the target."""
+        met = self._sorted_keys
+        if met is None:
+            self._streak_cache = None
+        elif not met or key > met[-1]:
+            if self._streak_cache is not None:
+                self._streak_cache = self._streak_cache + 1 if met and key == met[-1] + 1 else 1
+            met.append(key)
+        else:
+            insort(met, key)
+            self._streak_cache = None
+
+    def complete_range(self, dates: Iterable[date]) -> int:
+        """
+        Record a batch of completion dates.
+
+        The batch is sorted once and merged with the existing (sorted) history
+        in O(n + m); within the batch the earliest dates of each period win,
+        and dates that are logged already or whose period already met the
+        target are skipped. Cached streak state is refreshed once for the
+        whole batch.
 
         Returns:
+        --------
         int
-            Number of back-to-back days/weeks/months completed.
+            How many dates were recorded.
         """
-        if not self._dates:
-            return 0
+        counts = self._period_counts()
+        period_key = self._policy.key
+        target = self._target
+        accepted: List[date] = []
+        met: List[int] = []
+        for d in sorted(set(_as_date(d) for d in dates)):
+            key = period_key(d)
+            count = counts.get(key, 0)
+            if count < target and d not in self._date_set:
+                counts[key] = count + 1
+                accepted.append(d)
+                if count + 1 == target:
+                    met.append(key)
 
-        # Sort dates newest → oldest
-        sorted_dates = sorted(self._dates, reverse=True)
-        streak = 1
-        prev = sorted_dates[0]
+        if accepted:
+            if self._sorted_keys is not None:
+                # Period ordinals grow with the date, so `met` is sorted too.
+                self._sorted_keys = list(merge(self._sorted_keys, met))
+            if self._sorted is not None:
+                self._sorted = list(merge(self._sorted, accepted))
+            self._date_set.update(accepted)
+            self._cached_len = len(self._date_set)
+            self._streak_cache = None
+        return len(accepted)
 
-        for current in sorted_dates[1:]:
-            if self.periodicity == "daily":
-                expected = prev - timedelta(days=1)
+    def _is_duplicate(self, d: date) -> bool:
+        """
+        Check whether 'd' cannot be logged: it is logged already, or its period
+        (same day, week, month, ...) already reached the target.
+        """
+        d = _as_date(d)
+        counts = self._period_counts()
+        return d in self._date_set or counts.get(self._policy.key(d), 0) >= self._target
 
-            elif self.periodicity == "weekly":
-                expected = prev - timedelta(weeks=1)
-                ey, ew, _ = expected.isocalendar()
-                cy, cw, _ = current.isocalendar()
-                if (cy, cw) != (ey, ew):
-                    break
+    def get_streak(self) -> int:
+        """
+        Compute the current streak of consecutive periods that met the target.
 
-            else:  # monthly
-                expected = prev - relativedelta(months=1)
+        The result is cached until the completions change. Habits loaded from
+        the database know their stored streak without decoding their history.
 
-            if current == expected:
-                streak += 1
-                prev = current
-            else:
-                break
+        Returns:
+        int
+            Number of back-to-back periods completed, counting back from
+            the most recent one.
+        """
+        if self._loader is not None and self._streak_cache is not None:
+            return self._streak_cache  # known before the history was loaded
+        self._sync()
+        if self._streak_cache is None:
+            self._streak_cache = self._compute_streak()
+        return self._streak_cache
 
-        return streak
+    def _compute_streak(self) -> int:
+        # Runs of consecutive met-period ordinals, newest first (see habit.periods).
+        return current_run(self._sorted_period_keys())
 
     @property
     def completions(self) -> List[date]:
@@ -107,7 +321,20 @@ class Habit:
         This makes completion data available for external inspection and testing,
         without allowing external modification.
         """
-        return sorted(self._dates)
+        return list(self._sorted_dates())
+
+    def copy(self) -> "Habit":
+        """
+        Return an independent copy of this habit (name, schedule, creation
+        date and completions); derived state is rebuilt lazily.
+        """
+        clone = Habit(self.name, self.periodicity, self.target)
+        clone.creation_date = self.creation_date
+        if self._loader is not None:
+            clone._defer_dates(self._loader, self._streak_cache)  # stays undecoded until used
+        else:
+            clone._dates = set(self._date_set)
+        return clone
 
     def __str__(self) -> str:
         return (
@@ -116,4 +343,3 @@ class Habit:
             f"streak={self.get_streak()}, "
             f"logged_periods={len(self._dates)})"
         )
-
@@ -1,8 +1,15 @@
 # tracker.py
 
+from datetime import date
 from typing import List, Optional
+from habit import clock
+from habit.analytics import periods_inactive
 from habit.habit import Habit
-from habit.database import DatabaseManager
+from habit.periods import get_policy
+from habit.database import DatabaseManager, HabitSummary
+from habit.sharding import ShardedDatabaseManager
+from habit.event_store import EventSourcedDatabase
+from habit.write_behind import WriteBehindQueue
 
 
 class HabitTracker:
@@ -14,7 +21,9 @@ class HabitTracker:
     - Persist habits using a database
     """
 
-    def __init__(self, db_path: str = "habits.db"):
+    def __init__(self, db_path: str = "habits.db", shards: int = 0, event_log: bool = False,
+                 tz: Optional[str] = None, write_behind: bool = False, flush_interval: float = 1.0,
+                 flush_threshold: int = 100):
         """
         Initialize the tracker and load habits from the database.
 
@@ -22,10 +31,105 @@ class HabitTracker:
         
         db_path : str
             Path to the SQLite database file.
+        shards : int
+            When greater than zero, spread habits over this many shard files
+            derived from db_path (see habit.sharding).
+        event_log : bool
+            Store changes as an append-only event log with snapshots
+            (see habit.event_store).
+        tz : Optional[str]
+            The user's IANA timezone (e.g. "America/New_York"); decides which
+            calendar day a completion falls on. None uses the system's local time.
+        write_behind : bool
+            Apply mutations in memory at once and write them to the database in
+            batches from a background thread (see habit.write_behind for the
+            durability guarantees).
+        flush_interval : float
+            Write-behind only: seconds between background flushes.
+        flush_threshold : int
+            Write-behind only: flush early once this many habits have pending changes.
         """
-        self.db = DatabaseManager(db_path)
+        clock.resolve_tz(tz)  # reject unknown timezones up front
+        self.tz = tz
+        if shards and event_log:
+            raise ValueError("Sharded storage and the event log cannot be combined")
+        if write_behind and event_log:
+            # The event log folds its state in memory, so a second writer
+            # instance would leave this one stale.
+            raise ValueError("Write-behind mode and the event log cannot be combined")
+        if event_log:
+            self.db = EventSourcedDatabase(db_path)
+        elif shards:
+            self.db = ShardedDatabaseManager(db_path, shards)
+        else:
+            self.db = DatabaseManager(db_path)
         self.db.initialize_schema()
         self.habits: List[Habit] = self.db.load_all_habits()
+        self.writer: Optional[WriteBehindQueue] = None
+        if write_behind:
+            # The writer thread gets its own connection, so its transactions and
+            # cursor never interleave with this thread's. Sharded storage already
+            # serializes each shard behind a lock and can be shared.
+            writer_db = self.db if shards else DatabaseManager(db_path, check_same_thread=False)
+            self.writer = WriteBehindQueue(writer_db, flush_interval, flush_threshold)
+
+    def save_habit(self, habit: Habit) -> None:
+        """
+        Persist the current state of `habit` (queued in write-behind mode).
+
+        Parameters:
+
+        habit : Habit
+            A tracked habit that was changed, e.g. completed.
+        """
+        if self.writer is not None:
+            self.writer.save(habit)
+        else:
+            self.db.save_habit(habit)
+
+    def flush(self) -> int:
+        """
+        Write all pending write-behind changes now.
+
+        Returns:
+
+        int
+            The number of habits written (0 when write-behind is off).
+        """
+        return self.writer.flush() if self.writer is not None else 0
+
+    def close(self) -> None:
+        """
+        Flush pending changes, stop the write-behind thread and close the database.
+        """
+        if self.writer is not None:
+            self.writer.close()
+            if self.writer.db is not self.db:
+                self.writer.db.close()
+        self.db.close()
+
+    def transaction(self):
+        """
+        Return a context manager that groups the writes made inside it into
+        one database transaction (see DatabaseManager.transaction).
+
+        Raises:
+
+        ValueError
+            In write-behind mode, where the queue batches writes itself and
+            commits them on its own connection.
+        """
+        if self.writer is not None:
+            raise ValueError("transaction() cannot be used in write-behind mode")
+        return self.db.transaction()
+
+    def savepoint(self):
+        """
+        Return a context manager that undoes the database writes made inside
+        it if it raises, within an open transaction() (see
+        DatabaseManager.savepoint). The habits in memory are not restored.
+        """
+        return self.db.savepoint()
 
     def add_habit(self, habit: Habit) -> None:
         """
@@ -37,7 +141,7 @@ class HabitTracker:
             The habit to be added.
         """
         self.habits.append(habit)
-        self.db.save_habit(habit)
+        self.save_habit(habit)
 
     def delete_habit(self, name: str) -> bool:
         """
@@ -56,13 +160,17 @@ class HabitTracker:
         habit = self.find_habit_by_name(name)
         if habit:
             self.habits.remove(habit)
-            self.db.delete_habit(name)
+            if self.writer is not None:
+                self.writer.delete(habit.name)
+            else:
+                self.db.delete_habit(name)
             return True
         return False
 
-    def update_habit(self, old_name: str, new_name: str, new_periodicity: str) -> bool:
+    def update_habit(self, old_name: str, new_name: str, new_periodicity: str,
+                     new_target: Optional[int] = None) -> bool:
         """
-        Update an existing habit's name and/or periodicity.
+        Update an existing habit's name, periodicity and/or target.
 
         Parameters:
         
@@ -71,7 +179,9 @@ class HabitTracker:
         new_name : str
             The new name to assign.
         new_periodicity : str
-            The updated periodicity ("daily", "weekly", "monthly").
+            The updated periodicity (see habit.periods).
+        new_target : Optional[int]
+            The updated completions-per-period target; None keeps the current one.
 
         Returns:
         
@@ -82,14 +192,128 @@ class HabitTracker:
         if habit is None:
             return False  # Habit not found
 
+        # Raise ValueError before anything is written.
+        Habit._check_target(habit.target if new_target is None else new_target, get_policy(new_periodicity))
+
         if new_name.lower() != old_name.lower() and self.find_habit_by_name(new_name):
             raise ValueError(f"A habit named '{new_name}' already exists.")
 
+        if habit.name != new_name:
+            if self.writer is not None:
+                self.writer.delete(habit.name)
+            else:
+                self.db.rename_habit(habit.name, new_name)
         habit.name = new_name
-        habit.periodicity = new_periodicity.lower()
-        self.db.save_habit(habit)
+        habit.set_schedule(new_periodicity, new_target)
+        self.save_habit(habit)
         return True
 
+    def archive_habit(self, name: str) -> bool:
+        """
+        Move a habit to the archive (compressed cold storage). It is no longer
+        loaded or listed until restored.
+
+        Parameters:
+
+        name : str
+            Name of the habit to archive.
+
+        Returns:
+
+        bool
+            True if the habit was archived, False if it was not found.
+        """
+        habit = self.find_habit_by_name(name)
+        if habit is None:
+            return False
+        self.flush()  # a queued save must not re-create the habit afterwards
+        self.db.archive_habit(habit)
+        self.habits.remove(habit)
+        return True
+
+    def archive_inactive(self, periods: int, today: Optional[date] = None) -> List[str]:
+        """
+        Archive every habit with no completion in the last `periods` periods
+        of its own periodicity (e.g. 8 weeks for a weekly habit).
+
+        Parameters:
+
+        periods : int
+            Number of periods without activity before a habit is archived.
+        today : Optional[date]
+            Reference date; defaults to today in the tracker's timezone.
+
+        Returns:
+
+        List[str]
+            Names of the archived habits.
+        """
+        if periods < 1:
+            raise ValueError("The number of inactive periods must be at least 1.")
+        today = today or clock.today_in(self.tz)
+        inactive = [h for h in self.habits if periods_inactive(h, today) >= periods]
+        if inactive:
+            self.flush()
+            with self.db.transaction():
+                for habit in inactive:
+                    self.db.archive_habit(habit)
+            archived = set(map(id, inactive))
+            self.habits = [h for h in self.habits if id(h) not in archived]
+        return [h.name for h in inactive]
+
+    def restore_habit(self, name: str) -> Optional[Habit]:
+        """
+        Bring an archived habit back into the tracked habits.
+
+        Parameters:
+
+        name : str
+            Name of the archived habit.
+
+        Returns:
+
+        Optional[Habit]
+            The restored habit, or None if no habit of that name is archived.
+
+        Raises:
+
+        ValueError
+            If an active habit with the same name exists.
+        """
+        if self.find_habit_by_name(name):
+            raise ValueError(f"A habit named '{name}' already exists.")
+        self.flush()
+        habit = self.db.restore_habit(name)
+        if habit is not None:
+            self.habits.append(habit)
+        return habit
+
+    def list_summaries(self, periodicity: Optional[str] = None) -> List[HabitSummary]:
+        """
+        Return lightweight (name, periodicity, target, streak) records for
+        listing, optionally filtered by periodicity.
+
+        Single-file storage answers with a projection query
+        (DatabaseManager.list_summaries); other storage backends, and
+        write-behind mode, whose database may lag behind, use the habits
+        in memory.
+
+        Parameters:
+
+        periodicity : Optional[str]
+            Only list habits with this periodicity.
+
+        Returns:
+
+        List[HabitSummary]
+            One summary per habit.
+        """
+        lister = getattr(self.db, "list_summaries", None)
+        if lister is not None and self.writer is None:
+            return lister(periodicity)
+        return [HabitSummary(h.name, h.periodicity, h.target, h.get_streak())
+                for h in self.habits if periodicity is None or h.periodicity == periodicity]
+
     def find_habit_by_name(self, name: str) -> Optional[Habit]:
         """
         Look up a habit by name.
@@ -0,0 +1,141 @@
+"""
+Opt-in timing and counting instrumentation.
+
+Records per-command latency, database round trips, rows deserialized and
+cache hit rates. Instrumentation is off by default; every hook is guarded by
+a single `METRICS.enabled` attribute check, so the disabled cost is negligible.
+
+Usage:
+    from habit import metrics
+    metrics.enable()
+    ...
+    print(metrics.snapshot())
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+class Metrics:
+    """
+    Collects counters and timings for one process.
+    """
+
+    def __init__(self):
+        self.enabled: bool = False
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all recorded values (the enabled flag is kept)."""
+        # name -> [count, total seconds, max seconds]
+        self.commands: Dict[str, List[float]] = {}
+        self.db_calls: Dict[str, List[float]] = {}
+        self.rows_deserialized: int = 0
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+
+    @staticmethod
+    def _add(table: Dict[str, List[float]], name: str, seconds: float) -> None:
+        entry = table.get(name)
+        if entry is None:
+            table[name] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+    @contextmanager
+    def time_command(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one execution of command `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(self.commands, name, time.perf_counter() - start)
+
+    def record_db(self, operation: str, seconds: float) -> None:
+        """Record one database round trip of the given kind."""
+        self._add(self.db_calls, operation, seconds)
+
+    def record_rows(self, count: int) -> None:
+        """Record `count` rows turned into Habit objects."""
+        self.rows_deserialized += count
+
+    def record_cache(self, hit: bool) -> None:
+        """Record a cache lookup outcome."""
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+
+    def snapshot(self) -> Dict:
+        """
+        Return a plain-dict copy of everything recorded so far.
+
+        Timings are reported in seconds; `cache.hit_rate` is None until the
+        first cache lookup.
+        """
+        def summarize(table):
+            return {
+                name: {"count": int(count), "total": total, "mean": total / count, "max": worst}
+                for name, (count, total, worst) in table.items()
+            }
+
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "commands": summarize(self.commands),
+            "database": summarize(self.db_calls),
+            "round_trips": int(sum(entry[0] for entry in self.db_calls.values())),
+            "rows_deserialized": self.rows_deserialized,
+            "cache": {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "hit_rate": self.cache_hits / lookups if lookups else None,
+            },
+        }
+
+    def report(self) -> str:
+        """Format the snapshot as a short human-readable report."""
+        snap = self.snapshot()
+        lines = ["⏱️ Profile"]
+        for title, key in (("Commands", "commands"), ("Database", "database")):
+            if snap[key]:
+                lines.append(f" {title}:")
+                for name, s in sorted(snap[key].items()):
+                    lines.append(f"  - {name}: {s['count']}x, total {s['total'] * 1000:.2f} ms, "
+                                 f"max {s['max'] * 1000:.2f} ms")
+        lines.append(f" Round trips: {snap['round_trips']}")
+        lines.append(f" Rows deserialized: {snap['rows_deserialized']}")
+        rate = snap["cache"]["hit_rate"]
+        lines.append(f" Cache hit rate: {'n/a' if rate is None else f'{rate:.1%}'}")
+        return "\n".join(lines)
+
+
+METRICS = Metrics()
+"""Process-wide metrics collector used by the instrumented modules."""
+
+
+def enable() -> None:
+    """Turn instrumentation on."""
+    METRICS.enabled = True
+
+
+def disable() -> None:
+    """Turn instrumentation off (recorded values are kept)."""
+    METRICS.enabled = False
+
+
+def reset() -> None:
+    """Discard all recorded values."""
+    METRICS.reset()
+
+
+def snapshot() -> Dict:
+    """Return the current metrics as a dict (see Metrics.snapshot)."""
+    return METRICS.snapshot()
+
+
+def report() -> str:
+    """Return the current metrics as a human-readable report."""
+    return METRICS.report()
@@ -0,0 +1,98 @@
+"""
+Machine-readable output for the list and analytics commands.
+
+Records are produced by generators, so each habit's streaks are computed
+only when its record is written, and a consumer reading the output can start
+before the whole report is built. Two formats are supported:
+
+- ndjson: one JSON object per line
+- json:   a single JSON array, written incrementally
+"""
+import json
+import sys
+from collections import Counter
+from typing import Dict, IO, Iterable, Iterator, Optional
+
+from habit import analytics
+from habit.habit import Habit
+
+FORMATS = ("text", "json", "ndjson")
+"""Values accepted by --format; "text" is the emoji-decorated default."""
+
+
+def summary_records(summaries: Iterable[tuple]) -> Iterator[Dict]:
+    """Yield one {"name", "periodicity", "target", "streak"} record per HabitSummary (for `list`)."""
+    for s in summaries:
+        yield s._asdict()
+
+
+def analytics_records(habits: Iterable[Habit]) -> Iterator[Dict]:
+    """
+    Yield one "habit" record per habit with its current and longest streak,
+    followed by one "summary" record (longest streak overall, habits per periodicity).
+    """
+    best = None
+    by_periodicity: Counter = Counter()
+    for h in habits:
+        longest = analytics.longest_streak_for(h)
+        if longest > 0 and (best is None or longest > best[1]):
+            best = (h.name, longest)
+        by_periodicity[h.periodicity] += 1
+        yield {"type": "habit", "name": h.name, "periodicity": h.periodicity, "target": h.target,
+               "streak": h.get_streak(), "longest_streak": longest}
+    yield {
+        "type": "summary",
+        "longest": {"name": best[0], "streak": best[1]} if best else None,
+        "periodicity": dict(by_periodicity),
+    }
+
+
+def write_records(records: Iterable[Dict], fmt: str, out: Optional[IO[str]] = None,
+                  chunk: int = 256) -> int:
+    """
+    Stream records to `out` as JSON or NDJSON.
+
+    Encoded records are written `chunk` at a time, which keeps the number of
+    write calls low without holding the whole report in memory.
+
+    Parameters:
+    records : Iterable[Dict]
+        The records to write; consumed lazily.
+    fmt : str
+        "json" or "ndjson".
+    out : Optional[IO[str]]
+        Destination stream (default: the current sys.stdout).
+    chunk : int
+        Number of records per write call.
+
+    Returns:
+        The number of records written.
+    """
+    if fmt not in ("json", "ndjson"):
+        raise ValueError(f"Unsupported output format: {fmt}")
+    out = out or sys.stdout
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    pending = []
+    count = 0
+
+    def flush_pending():
+        if fmt == "ndjson":
+            out.write("\n".join(pending) + "\n")
+        else:
+            # Separate from the previous chunk, if any.
+            out.write(("," if count > len(pending) else "") + ",".join(pending))
+        pending.clear()
+
+    if fmt == "json":
+        out.write("[")
+    for record in records:
+        pending.append(encode(record))
+        count += 1
+        if len(pending) >= chunk:
+            flush_pending()
+    if pending:
+        flush_pending()
+    if fmt == "json":
+        out.write("]\n")
+    out.flush()
+    return count
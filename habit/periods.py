@@ -0,0 +1,185 @@
+"""
+Period policies: how a habit's periodicity divides the calendar.
+
+A policy maps every date to the integer ordinal of the period containing it.
+Ordinals are chosen so that adjacency is arithmetic: two periods are
+consecutive exactly when their ordinals differ by one. Duplicate checks and
+streaks therefore only compare integers, whatever the periodicity.
+
+Supported periodicities:
+
+- "daily", "weekly" (Monday-based weeks), "monthly"
+- "weekdays": Monday to Friday; a weekend completion counts for that Friday
+- "every N days" / "every N weeks": fixed windows of N days / N weeks
+
+The "every N" windows are fixed calendar blocks counted from 0001-01-01 (a
+Monday), the same for every habit, rather than starting on the day a habit
+was created. A habit's creation date changes on import and sync, so windows
+anchored to it would reshuffle existing completions. The consequence is that
+whether two nearby dates share a window depends on where the calendar blocks
+fall: with "every 2 days", 2024-06-02 and 2024-06-03 are one window (the
+second completion counts toward the same period), while 2024-06-01 and
+2024-06-02 are consecutive windows.
+
+New policies subclass PeriodPolicy and are registered in POLICIES (fixed
+names) or recognized by get_policy (parameterized names).
+"""
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence
+
+
+class PeriodPolicy:
+    """
+    Maps dates to period ordinals (consecutive periods have consecutive ordinals).
+    """
+
+    name = ""
+    max_days = 1
+    """The most distinct days a period can contain (the largest valid target)."""
+
+    def key(self, d: date) -> int:
+        """Return the ordinal of the period containing `d`."""
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class DailyPolicy(PeriodPolicy):
+    """One period per calendar day."""
+
+    name = "daily"
+
+    def key(self, d: date) -> int:
+        return d.toordinal()
+
+
+class WeeklyPolicy(PeriodPolicy):
+    """One period per Monday-based week."""
+
+    name = "weekly"
+    max_days = 7
+
+    def key(self, d: date) -> int:
+        # date(1, 1, 1) is a Monday, so weeks start on ordinal 1, 8, 15, ...
+        return (d.toordinal() - 1) // 7
+
+
+class MonthlyPolicy(PeriodPolicy):
+    """One period per calendar month."""
+
+    name = "monthly"
+    max_days = 31
+
+    def key(self, d: date) -> int:
+        return d.year * 12 + d.month - 1
+
+
+class WeekdaysPolicy(PeriodPolicy):
+    """
+    One period per working day (Monday to Friday). Weekends are not periods:
+    Friday and the following Monday are adjacent, and a completion on Saturday
+    or Sunday counts for the preceding Friday.
+    """
+
+    name = "weekdays"
+
+    def key(self, d: date) -> int:
+        ordinal = d.toordinal() - 1
+        return ordinal // 7 * 5 + min(ordinal % 7, 4)
+
+
+class EveryNDaysPolicy(PeriodPolicy):
+    """One period per fixed window of `days` days, counted from 0001-01-01."""
+
+    def __init__(self, days: int):
+        self.days = days
+        self.max_days = days
+        self.name = f"every {days} days"
+
+    def key(self, d: date) -> int:
+        return (d.toordinal() - 1) // self.days
+
+
+class EveryNWeeksPolicy(PeriodPolicy):
+    """One period per fixed window of `weeks` Monday-based weeks, counted from 0001-01-01."""
+
+    def __init__(self, weeks: int):
+        self.weeks = weeks
+        self.max_days = 7 * weeks
+        self.name = f"every {weeks} weeks"
+
+    def key(self, d: date) -> int:
+        return (d.toordinal() - 1) // (7 * self.weeks)
+
+
+POLICIES: Dict[str, PeriodPolicy] = {
+    policy.name: policy for policy in (DailyPolicy(), WeeklyPolicy(), MonthlyPolicy(), WeekdaysPolicy())
+}
+"""Policies with fixed names."""
+
+_EVERY = re.compile(r"every (\d+) (day|week)s?")
+
+DESCRIPTION = "daily/weekly/monthly/weekdays/every N days/every N weeks"
+"""Human-readable list of accepted periodicities, for prompts and help."""
+
+
+@lru_cache(maxsize=None)
+def get_policy(periodicity: str) -> PeriodPolicy:
+    """
+    Return the policy for a periodicity string (case and spacing are ignored).
+
+    "every 1 days" and "every 1 weeks" resolve to the daily and weekly policies.
+
+    Raises:
+        ValueError: if the periodicity is not recognized.
+    """
+    text = " ".join(periodicity.lower().split())
+    if text in POLICIES:
+        return POLICIES[text]
+    match = _EVERY.fullmatch(text)
+    if match and int(match.group(1)) > 0:
+        count, unit = int(match.group(1)), match.group(2)
+        if count == 1:
+            return POLICIES["daily" if unit == "day" else "weekly"]
+        return EveryNDaysPolicy(count) if unit == "day" else EveryNWeeksPolicy(count)
+    raise ValueError(f"Periodicity must be one of {DESCRIPTION}, not {periodicity!r}")
+
+
+def ordered(periodicities: Iterable[str]) -> List[str]:
+    """
+    Return the distinct periodicities in display order: the fixed policies
+    first (daily, weekly, monthly, weekdays), then the others alphabetically.
+    """
+    fixed = list(POLICIES)
+    return sorted(set(periodicities),
+                  key=lambda p: (fixed.index(p), "") if p in fixed else (len(fixed), p))
+
+
+def current_run(ordinals: Sequence[int]) -> int:
+    """Length of the run of consecutive ordinals ending at the last (sorted) one."""
+    n = len(ordinals)
+    if n == 0:
+        return 0
+    streak = 1
+    for i in range(n - 1, 0, -1):
+        if ordinals[i] - ordinals[i - 1] != 1:
+            break
+        streak += 1
+    return streak
+
+
+def longest_run(ordinals: Sequence[int]) -> int:
+    """Length of the longest run of consecutive ordinals (sorted, unique)."""
+    if len(ordinals) == 0:
+        return 0
+    best = streak = 1
+    previous = ordinals[0]
+    for current in ordinals[1:]:
+        streak = streak + 1 if current - previous == 1 else 1
+        if streak > best:
+            best = streak
+        previous = current
+    return best
@@ -0,0 +1,191 @@
+"""
+Hash-partitioned storage across several SQLite files.
+
+ShardedDatabaseManager offers the same interface as DatabaseManager but
+routes every habit to one of N shard files by a stable hash of its
+normalized name. Each shard has its own connection, WAL journal and lock,
+so writes to habits on different shards do not wait for each other —
+across threads of one process as well as across processes.
+"""
+import os
+import threading
+import zlib
+from contextlib import ExitStack, contextmanager
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+from habit.database import DatabaseManager, HabitRow
+from habit.habit import Habit
+
+
+def shard_index(name: str, shard_count: int) -> int:
+    """
+    Return the shard owning habit `name`.
+
+    Names are normalized the way HabitTracker compares them (stripped,
+    case-insensitive), and CRC32 keeps the result stable across processes.
+    """
+    return zlib.crc32(name.strip().lower().encode("utf-8")) % shard_count
+
+
+def shard_paths(db_path: str, shard_count: int) -> List[str]:
+    """
+    Return the shard file names for `db_path`, e.g. habits.shard0.db, habits.shard1.db, ...
+    """
+    root, ext = os.path.splitext(db_path)
+    return [f"{root}.shard{i}{ext or '.db'}" for i in range(shard_count)]
+
+
+class ShardedDatabaseManager:
+    """
+    DatabaseManager look-alike that spreads habits over `shard_count` files.
+    """
+
+    encode_completions = staticmethod(DatabaseManager.encode_completions)
+
+    def __init__(self, db_path: str = "habits.db", shard_count: int = 4):
+        """
+        Parameters:
+        -----------
+        db_path : str
+            Base path; shard files are derived from it (see shard_paths).
+        shard_count : int
+            Number of shards. It must stay the same for the lifetime of the
+            data, since it decides where every habit lives.
+        """
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1")
+        self.db_name = db_path
+        self.shard_count = shard_count
+        self.paths = shard_paths(db_path, shard_count)
+        self.shards = [DatabaseManager(path, journal_mode="wal", check_same_thread=False)
+                       for path in self.paths]
+        self._locks = [threading.Lock() for _ in self.shards]
+
+    def _shard_for(self, name: str) -> int:
+        return shard_index(name, self.shard_count)
+
+    def initialize_schema(self) -> None:
+        """
+        Create the schema in every shard and check that each shard was
+        created with the same shard count.
+        """
+        for i, (shard, lock) in enumerate(zip(self.shards, self._locks)):
+            with lock:
+                shard.initialize_schema()
+                conn = shard._connect()
+                conn.execute("CREATE TABLE IF NOT EXISTS shard_meta (shard_count INTEGER, shard_index INTEGER)")
+                row = conn.execute("SELECT shard_count, shard_index FROM shard_meta").fetchone()
+                if row is None:
+                    conn.execute("INSERT INTO shard_meta VALUES (?, ?)", (self.shard_count, i))
+                    conn.commit()
+                elif row != (self.shard_count, i):
+                    raise ValueError(
+                        f"{self.paths[i]} belongs to shard {row[1]} of {row[0]}, "
+                        f"not shard {i} of {self.shard_count}")
+
+    @contextmanager
+    def transaction(self):
+        """
+        Defer commits on every shard until the block ends.
+
+        Each shard commits on its own, so atomicity holds per shard only.
+        """
+        with ExitStack() as stack:
+            for shard in self.shards:
+                stack.enter_context(shard.transaction())
+            yield self
+
+    @contextmanager
+    def savepoint(self):
+        """
+        Undo the writes made inside the block on every shard if it raises
+        (see DatabaseManager.savepoint).
+        """
+        with ExitStack() as stack:
+            for shard in self.shards:
+                stack.enter_context(shard.savepoint())
+            yield self
+
+    def save_habit(self, habit: Habit) -> None:
+        """Insert or update a habit in its shard."""
+        i = self._shard_for(habit.name)
+        with self._locks[i]:
+            self.shards[i].save_habit(habit)
+
+    def bulk_insert(self, rows: Iterable[HabitRow]) -> int:
+        """
+        Insert many raw rows, one transaction per shard.
+
+        Rows are grouped by shard in memory before writing.
+        """
+        grouped: List[List[HabitRow]] = [[] for _ in self.shards]
+        for row in rows:
+            grouped[self._shard_for(row[0])].append(row)
+        written = 0
+        for shard, lock, shard_rows in zip(self.shards, self._locks, grouped):
+            if shard_rows:
+                with lock:
+                    written += shard.bulk_insert(shard_rows)
+        return written
+
+    def load_all_habits(self) -> List[Habit]:
+        """Load and concatenate the habits of every shard."""
+        habits: List[Habit] = []
+        for shard, lock in zip(self.shards, self._locks):
+            with lock:
+                habits.extend(shard.load_all_habits())
+        return habits
+
+    def iter_rows(self, batch_size: int = 1000) -> Iterator[HabitRow]:
+        """
+        Stream the raw rows of every shard, one shard after another.
+
+        A shard's lock is held only while a batch is fetched, not while the
+        caller consumes it.
+        """
+        for shard, lock in zip(self.shards, self._locks):
+            rows = shard.iter_rows(batch_size)
+            while True:
+                with lock:
+                    batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                yield from batch
+
+    def get_habit_by_name(self, name: str) -> Optional[Habit]:
+        """Retrieve a single habit from its shard."""
+        i = self._shard_for(name)
+        with self._locks[i]:
+            return self.shards[i].get_habit_by_name(name)
+
+    def rename_habit(self, old_name: str, new_name: str) -> None:
+        """Move a habit to its new name, and to another shard if the hash changes."""
+        src, dst = self._shard_for(old_name), self._shard_for(new_name)
+        if src == dst:
+            with self._locks[src]:
+                self.shards[src].rename_habit(old_name, new_name)
+            return
+        with self._locks[src]:
+            habit = self.shards[src].get_habit_by_name(old_name)
+        if habit is None:
+            return
+        # Two connections, so no shared transaction: write the copy first. If
+        # the delete then fails, a duplicate is left behind, but never nothing.
+        habit.name = new_name
+        with self._locks[dst]:
+            self.shards[dst].save_habit(habit)
+        with self._locks[src]:
+            self.shards[src].delete_habit(old_name)
+
+    def delete_habit(self, name: str) -> None:
+        """Delete a habit from its shard."""
+        i = self._shard_for(name)
+        with self._locks[i]:
+            self.shards[i].delete_habit(name)
+
+    def close(self) -> None:
+        """Close every shard connection."""
+        for shard, lock in zip(self.shards, self._locks):
+            with lock:
+                shard.close()
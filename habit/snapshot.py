@@ -0,0 +1,214 @@
+"""
+Read-only columnar snapshot files for fast analytics startup.
+
+A snapshot stores every habit as a name, a periodicity code and the run of
+ordinals of the periods that met its target (see habit.periods), laid out as flat little-endian
+arrays. MappedSnapshot memory-maps the file and exposes the arrays as
+memoryviews, so opening a snapshot reads only the header and streaks are
+computed directly on the mapped pages without deserializing anything.
+
+Layout (all offsets are absolute byte positions):
+
+    header        magic "HSNP", version, habit count H, ordinal count N,
+                  periodicity count P and the offsets of the sections below
+    periodicities P entries of (u16 length, UTF-8 bytes)
+    name offsets  u32[H + 1] into the name blob
+    names         UTF-8 blob
+    codes         u8[H] index into the periodicity table
+    offsets       u32[H + 1] into the ordinal array
+    ordinals      i32[N], sorted and unique per habit
+
+Usage:
+    python -m habit.snapshot export habits.db habits.hsnap
+    python -m habit.snapshot report habits.hsnap
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, List, Optional
+
+from habit.habit import Habit
+
+MAGIC = b"HSNP"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHIIIIIIIII")
+
+
+def _pad(buf: bytearray, alignment: int = 4) -> None:
+    buf.extend(b"\0" * (-len(buf) % alignment))
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def export_snapshot(habits: Iterable[Habit], path: str) -> int:
+    """
+    Write `habits` to a snapshot file (atomically replacing `path`).
+
+    Returns:
+        The number of habits written.
+    """
+    periodicities: List[str] = []
+    codes = array("B")
+    name_offsets = array("I", [0])
+    names = bytearray()
+    offsets = array("I", [0])
+    ordinals = array("i")
+
+    for habit in habits:
+        if habit.periodicity not in periodicities:
+            periodicities.append(habit.periodicity)
+        codes.append(periodicities.index(habit.periodicity))
+        names.extend(habit.name.encode("utf-8"))
+        name_offsets.append(len(names))
+        # Only periods that met the habit's target take part in streaks.
+        ordinals.extend(habit._sorted_period_keys())
+        offsets.append(len(ordinals))
+
+    body = bytearray(_HEADER.size)
+    off_ptable = len(body)
+    for p in periodicities:
+        encoded = p.encode("utf-8")
+        body.extend(struct.pack("<H", len(encoded)) + encoded)
+    _pad(body)
+    off_name_offsets = len(body)
+    body.extend(_little_endian(name_offsets))
+    off_names = len(body)
+    body.extend(names)
+    off_codes = len(body)
+    body.extend(codes.tobytes())
+    _pad(body)
+    off_offsets = len(body)
+    body.extend(_little_endian(offsets))
+    off_ordinals = len(body)
+    body.extend(_little_endian(ordinals))
+
+    count = len(codes)
+    body[:_HEADER.size] = _HEADER.pack(
+        MAGIC, VERSION, 0, count, len(ordinals), len(periodicities),
+        off_ptable, off_name_offsets, off_names, off_codes, off_offsets, off_ordinals)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(body)
+    os.replace(tmp, path)
+    return count
+
+
+class MappedSnapshot:
+    """
+    A memory-mapped snapshot file. Use as a context manager or call close().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.habit_count, self.ordinal_count, ptable_count,
+         off_ptable, off_name_offsets, off_names, off_codes, off_offsets,
+         off_ordinals) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} habit snapshot")
+
+        self.periodicities: List[str] = []
+        pos = off_ptable
+        for _ in range(ptable_count):
+            (length,) = struct.unpack_from("<H", self._mm, pos)
+            self.periodicities.append(self._mm[pos + 2:pos + 2 + length].decode("utf-8"))
+            pos += 2 + length
+
+        view = memoryview(self._mm)
+        self._views = [view]
+        h, n = self.habit_count, self.ordinal_count
+        self._name_offsets = self._ints(view, off_name_offsets, h + 1, "I")
+        self._names = self._track(view[off_names:off_codes])
+        self.codes = self._track(view[off_codes:off_codes + h])
+        self.offsets = self._ints(view, off_offsets, h + 1, "I")
+        self.ordinals = self._ints(view, off_ordinals, n, "i")
+
+    def _track(self, view: memoryview) -> memoryview:
+        # Every view must be released before the mapping can be closed.
+        self._views.append(view)
+        return view
+
+    def _ints(self, view: memoryview, start: int, count: int, typecode: str):
+        raw = self._track(view[start:start + 4 * count])
+        if sys.byteorder != "little":
+            values = array(typecode, raw.tobytes())
+            values.byteswap()
+            return values
+        return self._track(raw.cast(typecode))
+
+    def __len__(self) -> int:
+        return self.habit_count
+
+    def name(self, i: int) -> str:
+        """Name of the i-th habit."""
+        return bytes(self._names[self._name_offsets[i]:self._name_offsets[i + 1]]).decode("utf-8")
+
+    def periodicity(self, i: int) -> str:
+        """Periodicity of the i-th habit."""
+        return self.periodicities[self.codes[i]]
+
+    def ordinals_for(self, i: int):
+        """
+        Sorted period ordinals of the i-th habit (a zero-copy view).
+
+        Release or drop the view before closing the snapshot.
+        """
+        return self.ordinals[self.offsets[i]:self.offsets[i + 1]]
+
+    def close(self) -> None:
+        """Release the views and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mm.close()
+
+    def __enter__(self) -> "MappedSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point: export a database or report on a snapshot."""
+    from habit import analytics
+    from habit.database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Columnar habit snapshots.")
+    sub = parser.add_subparsers(dest="action", required=True)
+    export = sub.add_parser("export", help="Write a snapshot of a database")
+    export.add_argument("db")
+    export.add_argument("snapshot")
+    report = sub.add_parser("report", help="Print streak analytics from a snapshot")
+    report.add_argument("snapshot")
+    args = parser.parse_args(argv)
+
+    if args.action == "export":
+        db = DatabaseManager(args.db, read_only=True)
+        try:
+            count = export_snapshot(db.load_all_habits(), args.snapshot)
+        finally:
+            db.close()
+        print(f"✅ Wrote {count} habits to {args.snapshot}")
+        return
+
+    with analytics.open_snapshot(args.snapshot) as snap:
+        best = analytics.snapshot_habit_with_longest_streak(snap)
+        print(f"📊 {len(snap)} habits")
+        if best:
+            print(f"🏆 Longest streak overall: {best[0]} ({best[1]} period)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+SQL statement tracing for DatabaseManager.
+
+A SQLTracer hooks into sqlite3's `set_trace_callback` to log every statement
+that reaches SQLite (including implicit BEGIN/COMMIT), times the statements
+issued by DatabaseManager, aggregates counts and durations per statement
+shape, and can capture `EXPLAIN QUERY PLAN` output once per shape.
+
+Tracing is enabled with the CLI flag `--trace-sql` (or `--trace-sql explain`),
+with the environment variable HABIT_SQL_TRACE=1 (or =explain), or by passing
+a tracer to DatabaseManager directly:
+
+    tracer = SQLTracer(explain=True)
+    tracker = HabitTracker("habits.db")
+    tracker.db.enable_trace(tracer)
+    ...
+    print(tracer.summary())
+"""
+import atexit
+import os
+import re
+import sys
+from typing import Dict, List, Optional, TextIO
+
+_PLACEHOLDER = re.compile(r"\?\d+")
+_STRING_LITERAL = re.compile(r"(?:\b[xX])?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b")
+# NULL as a value (a bound None in the expanded SQL), not in IS NULL / NOT NULL.
+_NULL_LITERAL = re.compile(r"(?<!\bIS )(?<!\bNOT )\bNULL\b", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+
+def statement_shape(sql: str) -> str:
+    """
+    Normalize a statement so that executions differing only in literal values
+    (or in whitespace) share one shape.
+
+    The statement as written (with `?` or `?NNN` placeholders) and as SQLite
+    expands it (with the bound values, NULL included) map to the same shape.
+    """
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _NULL_LITERAL.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class SQLTracer:
+    """
+    Collects per-shape statement statistics and optional query plans.
+    """
+
+    def __init__(self, explain: bool = False, log: Optional[TextIO] = sys.stderr):
+        """
+        Parameters:
+        -----------
+        explain : bool
+            Capture EXPLAIN QUERY PLAN output the first time each shape runs.
+        log : Optional[TextIO]
+            Stream receiving one line per statement; None disables logging.
+        """
+        self.explain = explain
+        self.log = log
+        # shape -> [count, total seconds, max seconds]
+        self.stats: Dict[str, List[float]] = {}
+        self.plans: Dict[str, List[str]] = {}
+        self._pending: Optional[str] = None
+        self._pending_shape: Optional[str] = None
+        self._explaining = False
+
+    def attach(self, conn) -> None:
+        """Start receiving statements from a sqlite3 connection."""
+        conn.set_trace_callback(self._on_statement)
+
+    @staticmethod
+    def detach(conn) -> None:
+        """Stop tracing a sqlite3 connection."""
+        conn.set_trace_callback(None)
+
+    def _entry(self, shape: str) -> List[float]:
+        entry = self.stats.get(shape)
+        if entry is None:
+            entry = self.stats[shape] = [0, 0.0, 0.0]
+        return entry
+
+    def _flush_pending(self, seconds: Optional[float] = None, shape: Optional[str] = None) -> None:
+        """
+        Log the statement awaiting its timing. Unless record() is timing it
+        (same `shape`), it ran outside DatabaseManager (e.g. an implicit
+        BEGIN) and is counted here.
+        """
+        if self._pending is None:
+            return
+        if self._pending_shape != shape:
+            self._entry(self._pending_shape)[0] += 1
+            seconds = None
+        if self.log is not None:
+            timing = "    untimed" if seconds is None else f"{seconds * 1000:8.3f} ms"
+            self.log.write(f"[sql {timing}] {self._pending}\n")
+        self._pending = self._pending_shape = None
+
+    def _on_statement(self, sql: str) -> None:
+        """
+        Trace callback: called by SQLite for every statement it runs.
+
+        SQLite calls it again, with the same statement, for every trigger
+        program the statement fires, and executemany calls it once per row;
+        both are part of the execution awaiting record() and are skipped.
+        """
+        if self._explaining:
+            return
+        shape = statement_shape(sql)
+        if self._pending is not None and shape == self._pending_shape:
+            return
+        self._flush_pending()
+        self._pending = _WHITESPACE.sub(" ", sql).strip()
+        self._pending_shape = shape
+
+    def record(self, sql: str, seconds: float, conn=None, params=None, executions: int = 1) -> None:
+        """
+        Count a finished statement and attribute its duration to its shape.
+
+        `executions` is the number of times it ran (the rows of an
+        executemany). When `explain` is on and `conn` and `params` are given,
+        the plan for this shape is captured the first time it is seen.
+        """
+        shape = statement_shape(sql)
+        entry = self._entry(shape)
+        entry[0] += executions
+        entry[1] += seconds
+        if seconds > entry[2]:
+            entry[2] = seconds
+        self._flush_pending(seconds, shape)
+
+        if (self.explain and conn is not None and params is not None
+                and shape not in self.plans and shape.upper().startswith(_EXPLAINABLE)):
+            self._explaining = True
+            try:
+                rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+                self.plans[shape] = [row[-1] for row in rows]
+            except Exception as e:
+                self.plans[shape] = [f"unavailable: {e}"]
+            finally:
+                self._explaining = False
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return per-shape statistics as plain dicts, sorted by total time."""
+        ordered = sorted(self.stats.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            shape: {"count": int(count), "total": total, "max": worst, "plan": self.plans.get(shape)}
+            for shape, (count, total, worst) in ordered
+        }
+
+    def summary(self) -> str:
+        """Format the per-shape statistics (and plans) as a text report."""
+        lines = ["🔎 SQL trace summary"]
+        for shape, s in self.snapshot().items():
+            lines.append(f" {s['count']:6}x {s['total'] * 1000:9.3f} ms total  {shape}")
+            for detail in s["plan"] or []:
+                marker = "⚠️ " if detail.startswith("SCAN") else ""
+                lines.append(f"          plan: {marker}{detail}")
+        return "\n".join(lines)
+
+
+_ACTIVE: Optional[SQLTracer] = None
+
+
+def enable(explain: bool = False, log: Optional[TextIO] = sys.stderr) -> SQLTracer:
+    """
+    Turn on process-wide tracing for DatabaseManager instances created from now on.
+
+    The summary is printed to stderr when the interpreter exits.
+    """
+    global _ACTIVE
+    if _ACTIVE is None:
+        _ACTIVE = SQLTracer(explain=explain, log=log)
+        atexit.register(lambda: sys.stderr.write(_ACTIVE.summary() + "\n") if _ACTIVE else None)
+    else:
+        _ACTIVE.explain = _ACTIVE.explain or explain
+    return _ACTIVE
+
+
+def disable() -> None:
+    """Stop attaching the process-wide tracer to new DatabaseManager instances."""
+    global _ACTIVE
+    _ACTIVE = None
+
+
+def active_tracer() -> Optional[SQLTracer]:
+    """
+    Return the process-wide tracer, enabling it first when HABIT_SQL_TRACE
+    is set ("explain" also captures query plans).
+    """
+    if _ACTIVE is None:
+        mode = os.environ.get("HABIT_SQL_TRACE", "").strip().lower()
+        if mode and mode not in ("0", "false", "no", "off"):
+            return enable(explain=(mode == "explain"))
+    return _ACTIVE
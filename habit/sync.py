@@ -0,0 +1,247 @@
+"""
+Incremental two-way sync between two habits databases.
+
+Each database records a change sequence for every habit it writes (see
+DatabaseManager.iter_changes) and remembers, per peer, the peer's sequence
+number up to which it has already merged. A sync therefore only reads the
+habits that changed on either side since the last sync between the two:
+
+- A habit changed on one side only is copied to the other.
+- A habit changed on both sides is merged: completions are a grow-only set,
+  so the union is taken (conflict free); for the schedule (periodicity and
+  target) the local side wins, and the earlier creation date is kept.
+- A deletion (or rename away) propagates when the other side did not change
+  that habit; if it did, the surviving habit is restored on the deleting side.
+- An archived habit is archived on the other side too, never deleted. If the
+  other side changed it meanwhile, the archive still wins and the archived
+  copy holds the union of both sides' completions. Restoring it on one side
+  restores it on the other.
+
+Each side's merged changes are written in one transaction. The new sync
+positions are written in a second step, once both sides have committed, so
+a position never points past changes that were rolled back. Merging is
+idempotent: if a sync is interrupted, the next one simply exchanges the
+same changes again.
+
+Usage:
+    python -m habit.sync laptop.db server.db
+"""
+import argparse
+import sys
+import uuid
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from habit.database import DatabaseManager
+from habit.habit import Habit
+
+SyncCounts = Tuple[int, int]
+"""(habits written to the local database, habits written to the remote one)."""
+
+
+class _Archived(NamedTuple):
+    """The state of a habit that sits in the archive."""
+
+    habit: Habit
+
+
+HabitState = Union[Habit, _Archived, None]
+"""A habit's state on one side: active, archived, or None if it does not exist."""
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sync_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    """
+    CREATE TABLE IF NOT EXISTS sync_peers (
+        peer_id TEXT PRIMARY KEY,
+        pulled_seq INTEGER NOT NULL
+    )
+    """,
+)
+
+
+def database_id(db: DatabaseManager) -> str:
+    """
+    Return the random id that identifies `db` to its sync peers, creating
+    it (and the sync tables) on first use.
+    """
+    with db._connection() as conn:
+        cursor = db._cursor()
+        for sql in _SCHEMA:
+            db._execute(cursor, sql)
+        db._execute(cursor, "INSERT OR IGNORE INTO sync_meta (key, value) VALUES ('id', ?)", (uuid.uuid4().hex,))
+        db._execute(cursor, "SELECT value FROM sync_meta WHERE key = 'id'")
+        db_id = cursor.fetchone()[0]
+        db._commit(conn)
+    return db_id
+
+
+def _pulled_seq(db: DatabaseManager, peer_id: str) -> int:
+    cursor = db._cursor()
+    db._execute(cursor, "SELECT pulled_seq FROM sync_peers WHERE peer_id = ?", (peer_id,))
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def _set_pulled_seq(db: DatabaseManager, peer_id: str, seq: int) -> None:
+    db._execute(db._cursor(), """
+        INSERT INTO sync_peers (peer_id, pulled_seq) VALUES (?, ?)
+        ON CONFLICT(peer_id) DO UPDATE SET pulled_seq = excluded.pulled_seq
+    """, (peer_id, seq))
+
+
+def _changed(db: DatabaseManager, since_seq: int) -> Dict[str, HabitState]:
+    """Name -> latest state of every habit changed after `since_seq`."""
+    changes: Dict[str, HabitState] = {}
+    for _, name, habit, kind in db.iter_changes(since_seq):
+        if kind == "archived":
+            archived = db.get_archived(name)
+            habit = _Archived(archived) if archived is not None else None
+        changes[name] = habit
+    return changes
+
+
+def _current(db: DatabaseManager, name: str) -> HabitState:
+    habit = db.get_habit_by_name(name)
+    if habit is None:
+        archived = db.get_archived(name)
+        return _Archived(archived) if archived is not None else None
+    return habit
+
+
+def _unwrap(state: HabitState) -> Optional[Habit]:
+    return state.habit if isinstance(state, _Archived) else state
+
+
+def _same(a: HabitState, b: HabitState) -> bool:
+    if isinstance(a, _Archived) != isinstance(b, _Archived):
+        return False
+    a, b = _unwrap(a), _unwrap(b)
+    if a is None or b is None:
+        return a is b
+    return (a.periodicity == b.periodicity and a.target == b.target
+            and a.creation_date == b.creation_date and a._dates == b._dates)
+
+
+def merge_habits(preferred: Habit, other: Habit) -> Habit:
+    """
+    Merge two versions of the same habit: the union of their completions,
+    the schedule of `preferred` and the earlier creation date.
+    """
+    merged = preferred.copy()
+    merged.creation_date = min(preferred.creation_date, other.creation_date)
+    merged._dates = preferred._dates | other._dates
+    return merged
+
+
+def _resolve(name: str, local_changes: Dict[str, HabitState],
+             remote_changes: Dict[str, HabitState],
+             local: DatabaseManager, remote: DatabaseManager) -> Tuple[HabitState, HabitState, HabitState]:
+    """
+    Return (current local state, current remote state, merged state) for a
+    habit changed on at least one side. A merged state of None means deleted.
+    """
+    in_local, in_remote = name in local_changes, name in remote_changes
+    local_state = local_changes[name] if in_local else _current(local, name)
+    remote_state = remote_changes[name] if in_remote else _current(remote, name)
+    # A side that archived the habit (since the last sync) wins over live changes.
+    archive = ((in_local and isinstance(local_state, _Archived))
+               or (in_remote and isinstance(remote_state, _Archived)))
+    mine, theirs = _unwrap(local_state), _unwrap(remote_state)
+
+    if in_local and not in_remote:
+        merged = mine if mine is None or theirs is None else merge_habits(mine, theirs)
+    elif in_remote and not in_local:
+        # Only the remote side changed, so its schedule is the newer one.
+        merged = theirs if theirs is None or mine is None else merge_habits(theirs, mine)
+    elif mine is None or theirs is None:
+        merged = mine or theirs  # changed on both sides: a surviving habit wins over a deletion
+    else:
+        merged = merge_habits(mine, theirs)
+    if archive and merged is not None:
+        merged = _Archived(merged)
+    return local_state, remote_state, merged
+
+
+def _apply(db: DatabaseManager, names: Iterable[str], before: Dict[str, HabitState],
+           states: Dict[str, HabitState]) -> None:
+    for name in names:
+        state = states[name]
+        if state is None:
+            db.delete_habit(name)
+        elif isinstance(state, _Archived):
+            db.archive_habit(state.habit)
+        else:
+            if isinstance(before[name], _Archived):
+                db.restore_habit(name)
+            db.save_habit(state)
+
+
+def sync_databases(local: DatabaseManager, remote: DatabaseManager) -> SyncCounts:
+    """
+    Exchange the habits that changed since the last sync between `local` and
+    `remote`, so that both end up with the same merged state.
+
+    Both managers must have an initialized schema (which installs the change
+    feed). Only changed habits are read, and each side's writes are applied
+    in a single transaction; the sync positions are recorded only after both
+    transactions have committed.
+
+    Returns:
+        (habits written locally, habits written remotely).
+    """
+    local_id, remote_id = database_id(local), database_id(remote)
+    with local.transaction(), remote.transaction():
+        # Claim both write locks before reading, so no concurrent writer can
+        # slip a change in between reading the feeds and recording positions.
+        _set_pulled_seq(local, remote_id, _pulled_seq(local, remote_id))
+        _set_pulled_seq(remote, local_id, _pulled_seq(remote, local_id))
+
+        local_changes = _changed(local, _pulled_seq(remote, local_id))
+        remote_changes = _changed(remote, _pulled_seq(local, remote_id))
+
+        to_local: List[str] = []
+        to_remote: List[str] = []
+        mine: Dict[str, HabitState] = {}
+        theirs: Dict[str, HabitState] = {}
+        merged: Dict[str, HabitState] = {}
+        for name in {**local_changes, **remote_changes}:
+            mine[name], theirs[name], merged[name] = _resolve(name, local_changes, remote_changes,
+                                                              local, remote)
+            if not _same(mine[name], merged[name]):
+                to_local.append(name)
+            if not _same(theirs[name], merged[name]):
+                to_remote.append(name)
+
+        _apply(local, to_local, mine, merged)
+        _apply(remote, to_remote, theirs, merged)
+        # Our own writes are already on the other side: skip past them.
+        remote_seq, local_seq = remote.last_change_seq(), local.last_change_seq()
+    # The remote side commits first. Had its position been part of that
+    # commit and the local commit then failed, it would point past local seqs
+    # that were rolled back (and will be reused by later local changes).
+    with local.transaction():
+        _set_pulled_seq(local, remote_id, remote_seq)
+    with remote.transaction():
+        _set_pulled_seq(remote, local_id, local_seq)
+    return len(to_local), len(to_remote)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Sync the changes between two habits databases.")
+    parser.add_argument("local", help="Local habits database")
+    parser.add_argument("remote", help="Other habits database (e.g. the server copy)")
+    args = parser.parse_args(argv)
+
+    local, remote = DatabaseManager(args.local), DatabaseManager(args.remote)
+    try:
+        local.initialize_schema()
+        remote.initialize_schema()
+        pulled, pushed = sync_databases(local, remote)
+        print(f"🔄 Synced: {pulled} habits updated in {args.local}, {pushed} in {args.remote}", file=sys.stderr)
+    finally:
+        local.close()
+        remote.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Streaming CSV export and import, one row per completion.
+
+The file format is a header followed by `name,periodicity,date,target` rows:
+
+    name,periodicity,date,target
+    Exercise,daily,2024-06-01,1
+    Exercise,daily,2024-06-02,1
+    Read,weekly,2024-06-03,3
+    Read,weekly,2024-06-04,3
+
+A habit without completions is written as one row with an empty date, so
+it survives a round trip. Files in the older `name,periodicity,date` format
+(written before habits had targets) are still read; their habits get a
+target of 1.
+
+Both directions are generator pipelines: export streams raw rows out of the
+database in batches, and import groups consecutive rows of the same habit
+into one `habits` row and hands them to DatabaseManager.bulk_insert. Only one
+habit's completions are held in memory at a time, so files with millions of
+rows are processed in bounded memory. Paths ending in ".gz" are compressed,
+and "-" means stdout/stdin.
+
+Usage:
+    python -m habit.transfer export habits.db completions.csv.gz
+    python -m habit.transfer import habits.db completions.csv.gz
+"""
+import argparse
+import csv
+import gzip
+import json
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from itertools import groupby
+from operator import itemgetter
+from typing import IO, Iterable, Iterator, List, Optional, Set, Tuple
+
+from habit.database import DatabaseManager, HabitRow
+from habit.habit import Habit
+
+CompletionRow = Tuple[str, str, str, int]
+"""One exported completion: (name, periodicity, ISO date, target)."""
+
+HEADER = ("name", "periodicity", "date", "target")
+LEGACY_HEADER = HEADER[:3]
+
+
+@contextmanager
+def open_stream(path: str, mode: str) -> Iterator[IO[str]]:
+    """
+    Open `path` as a text stream for the csv module.
+
+    Parameters:
+    path : str
+        File path; "-" uses stdin/stdout and a ".gz" suffix enables gzip.
+    mode : str
+        "r" or "w".
+    """
+    if path == "-":
+        stream = sys.stdin if mode == "r" else sys.stdout
+        yield stream
+        if mode == "w":
+            stream.flush()
+        return
+    if path.endswith(".gz"):
+        fh = gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    else:
+        fh = open(path, mode, encoding="utf-8", newline="")
+    with fh:
+        yield fh
+
+
+def iter_completions(rows: Iterable[HabitRow]) -> Iterator[CompletionRow]:
+    """
+    Flatten raw `habits` rows into one (name, periodicity, date, target) row
+    per completion, or one row with an empty date for a habit without any.
+    """
+    for name, periodicity, _, completions_json, target in rows:
+        days = json.loads(completions_json)
+        if not days:
+            yield name, periodicity, "", target
+        for day in days:
+            yield name, periodicity, day[:10], target
+
+
+def write_csv(records: Iterable[CompletionRow], fh: IO[str]) -> int:
+    """
+    Write completion rows as CSV (with a header).
+
+    Returns:
+        The number of completions written (rows with an empty date excluded).
+    """
+    count = 0
+
+    def counted():
+        nonlocal count
+        for record in records:
+            count += bool(record[2])
+            yield record
+
+    writer = csv.writer(fh)
+    writer.writerow(HEADER)
+    writer.writerows(counted())
+    return count
+
+
+def read_csv(fh: IO[str]) -> Iterator[CompletionRow]:
+    """
+    Parse completion rows from CSV, skipping the header and blank lines.
+
+    Rows of the older three-column format get a target of 1.
+
+    Raises:
+        ValueError: if a row has neither three nor four columns, or its
+            target is not an integer.
+    """
+    reader = csv.reader(fh)
+    for record in reader:
+        if not record or tuple(record) in (HEADER, LEGACY_HEADER):
+            continue
+        if len(record) == 3:
+            yield record[0], record[1], record[2], 1
+            continue
+        if len(record) != 4:
+            raise ValueError(f"Line {reader.line_num}: expected name,periodicity,date,target")
+        try:
+            target = int(record[3])
+        except ValueError:
+            raise ValueError(f"Line {reader.line_num}: target must be an integer") from None
+        yield record[0], record[1], record[2], target
+
+
+def group_completions(records: Iterable[CompletionRow],
+                      created: Optional[str] = None) -> Iterator[HabitRow]:
+    """
+    Fold consecutive completion rows of the same habit into raw `habits` rows.
+
+    Dates go through Habit.complete_range, so invalid periodicities, targets
+    and dates are rejected and dates beyond a period's target are dropped.
+
+    Parameters:
+    records : Iterable[CompletionRow]
+        Completion rows; all rows of a habit must be adjacent (as written by export).
+    created : Optional[str]
+        Creation date (ISO) for the imported habits; defaults to now.
+
+    Raises:
+        ValueError: if a habit's rows are not adjacent or disagree on periodicity or target.
+    """
+    created = created or datetime.now(timezone.utc).isoformat()
+    seen: Set[str] = set()
+    for name, group in groupby(records, key=itemgetter(0)):
+        if name in seen:
+            raise ValueError(f"Rows for habit '{name}' are not contiguous")
+        seen.add(name)
+        first = next(group)
+        habit = Habit(name, first[1], first[3])
+        habit.complete_range(date.fromisoformat(d) for d in _dates_of(habit, first, group) if d)
+        yield (name, habit.periodicity, created,
+               DatabaseManager.encode_completions(habit.completions), habit.target)
+
+
+def _dates_of(habit: Habit, first: CompletionRow, group: Iterable[CompletionRow]) -> Iterator[str]:
+    yield first[2]
+    for _, periodicity, day, target in group:
+        if periodicity.lower() != habit.periodicity:
+            raise ValueError(f"Habit '{habit.name}' has rows with different periodicities")
+        if target != habit.target:
+            raise ValueError(f"Habit '{habit.name}' has rows with different targets")
+        yield day
+
+
+def export_csv(db, path: str) -> int:
+    """
+    Stream every completion in `db` to a CSV file.
+
+    Parameters:
+    db
+        A DatabaseManager (or look-alike with iter_rows).
+    path : str
+        Output file ("-" for stdout, ".gz" for gzip).
+
+    Returns:
+        The number of completion rows written.
+    """
+    with open_stream(path, "w") as fh:
+        return write_csv(iter_completions(db.iter_rows()), fh)
+
+
+def import_csv(db, path: str) -> int:
+    """
+    Stream a CSV file of completions into `db` with one bulk insert.
+
+    Imported habits replace existing habits of the same name, including
+    their targets.
+
+    Returns:
+        The number of habits written.
+    """
+    with open_stream(path, "r") as fh:
+        return db.bulk_insert(group_completions(read_csv(fh)))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Stream habit completions to and from CSV.")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("db", help="Habits database")
+    parser.add_argument("file", help="CSV file ('-' for stdin/stdout, '.gz' for gzip)")
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(args.db, read_only=args.action == "export")
+    try:
+        if args.action == "export":
+            count = export_csv(db, args.file)
+            print(f"✅ Exported {count} completions to {args.file}", file=sys.stderr)
+        else:
+            db.initialize_schema()
+            count = import_csv(db, args.file)
+            print(f"✅ Imported {count} habits from {args.file}", file=sys.stderr)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Write-behind persistence for HabitTracker.
+
+Mutations are applied to the in-memory habits immediately and queued here;
+a background thread writes them to the database in batches. Pending changes
+are coalesced per habit name, so a habit completed many times between two
+flushes is written once.
+
+A flush happens:
+- every `interval` seconds,
+- as soon as `threshold` habits have pending changes,
+- on an explicit flush(), and on close() (also registered to run at exit).
+
+Durability: a mutation is durable once the flush that contains it has
+committed. Each flush writes its whole batch in one transaction, so after a
+crash the database holds the state as of the last successful flush and never
+a partial batch; changes queued since then (at most `interval` seconds or
+`threshold` habits' worth) are lost. There is nothing to replay on restart.
+If a flush fails, its changes stay queued (unless superseded by newer ones),
+are retried on the next flush, and explicit flush() calls raise the error.
+
+The queue writes through a database manager of its own (HabitTracker opens a
+second connection for it), so a flush never joins, or commits, a transaction
+the caller has open on its connection.
+"""
+import atexit
+import threading
+from typing import Dict, Optional, Tuple
+
+from habit.habit import Habit
+
+PendingOp = Tuple[str, Optional[Habit]]
+"""("save", frozen copy of the habit) or ("delete", None)."""
+
+
+class WriteBehindQueue:
+    """
+    Coalescing queue of habit writes, flushed by a background thread.
+    """
+
+    def __init__(self, db, interval: float = 1.0, threshold: int = 100):
+        """
+        Parameters:
+        -----------
+        db
+            DatabaseManager (or look-alike) to write to, used only by this
+            queue and opened with check_same_thread=False. A manager that
+            locks its own connections (ShardedDatabaseManager) may be shared.
+        interval : float
+            Seconds between periodic flushes.
+        threshold : int
+            Flush early once this many habits have pending changes.
+        """
+        self.db = db
+        self.interval = interval
+        self.threshold = threshold
+        self.last_error: Optional[BaseException] = None
+        self._pending: Dict[str, PendingOp] = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="habit-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def pending(self) -> int:
+        """Number of habits with changes not yet written."""
+        return len(self._pending)
+
+    def save(self, habit: Habit) -> None:
+        """Queue the current state of `habit` for writing."""
+        # A copy, so the writer thread never reads an object being mutated.
+        self._enqueue(habit.name, ("save", habit.copy()))
+
+    def delete(self, name: str) -> None:
+        """Queue the deletion of habit `name`."""
+        self._enqueue(name, ("delete", None))
+
+    def _enqueue(self, name: str, op: PendingOp) -> None:
+        with self._lock:
+            # Re-insert so the newest change of a habit is written last.
+            self._pending.pop(name, None)
+            self._pending[name] = op
+            full = len(self._pending) >= self.threshold
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        Write every pending change now, in one transaction.
+
+        Returns:
+            The number of habits written.
+
+        Raises:
+            Whatever the database raised; the changes stay queued.
+        """
+        with self._db_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                with self.db.transaction():
+                    for name, (kind, habit) in batch.items():
+                        if kind == "save":
+                            self.db.save_habit(habit)
+                        else:
+                            self.db.delete_habit(name)
+            except BaseException as e:
+                self.last_error = e
+                with self._lock:
+                    # Keep newer changes that arrived during the failed flush.
+                    batch.update(self._pending)
+                    self._pending = batch
+                raise
+            self.last_error = None
+            return len(batch)
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stopped:
+                break
+            try:
+                self.flush()
+            except Exception:
+                pass  # recorded in last_error; retried on the next flush
+
+    def close(self) -> None:
+        """Stop the background thread and write everything still pending."""
+        if not self._stopped:
+            self._stopped = True
+            self._wake.set()
+            self._thread.join()
+            atexit.unregister(self.close)
+        self.flush()
@@ -3,11 +3,17 @@
 Database initialization script for habit tracker.
 Creates 5 predefined habits with 4 weeks of sample data.
 This script should be run once to initialize the database with sample data.
+
+With --synthetic it instead streams a large, seeded synthetic dataset into the
+database for load testing (see generate_dataset).
 """
 
+import argparse
+import random
 import sys
 import os
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, timezone
+from typing import Dict, Iterator, List, Optional
 from dateutil.relativedelta import relativedelta
 
 # Add the habit package to the path
@@ -17,7 +23,7 @@ from habit.database import DatabaseManager
 from habit.habit import Habit
 
 
-def create_sample_data():
+def create_sample_data(db_path: str = "habits.db"):
     """
     Create sample habits with 4 weeks of completion data.
     
@@ -28,18 +34,21 @@ def create_sample_data():
     4. Saves all habits to the database
     5. Provides feedback on the created data
     
+    Args:
+        db_path: Database file to (re)create (default: habits.db)
+
     Returns:
         None
     """
     print("Initializing database with sample data...")
     
     # Remove existing database to start fresh
-    if os.path.exists("habits.db"):
-        os.remove("habits.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
         print("Removed existing database file.")
     
     # Initialize database
-    db = DatabaseManager("habits.db")
+    db = DatabaseManager(db_path)
     db.initialize_schema()
     
     # Create the 5 predefined habits with different periodicities
@@ -55,13 +64,13 @@ def create_sample_data():
     today = date.today()
     
     for habit in habits:
+        completion_dates = []
         if habit.periodicity == "daily":
             # Add completions for the last 28 days (with realistic gaps)
             for i in range(28):
                 # Skip one day per week to make it realistic
                 if i % 7 != 0:
-                    completion_date = today - timedelta(days=i)
-                    habit._dates.add(completion_date)
+                    completion_dates.append(today - timedelta(days=i))
         
         elif habit.periodicity == "weekly":
             # Add completions for the last 4 weeks
@@ -70,13 +79,15 @@ def create_sample_data():
                 # Add slight variation to weekly dates
                 if i > 0:
                     completion_date = completion_date - timedelta(days=1 if i % 2 == 0 else 0)
-                habit._dates.add(completion_date)
+                completion_dates.append(completion_date)
                 
         elif habit.periodicity == "monthly":
             # Add completions for the last 4 months
             for i in range(4):
-                completion_date = today - relativedelta(months=i)
-                habit._dates.add(completion_date)
+                completion_dates.append(today - relativedelta(months=i))
+
+        # Backdated completions go through the duplicate-period checks
+        habit.complete_range(completion_dates)
         
         # Save to database
         db.save_habit(habit)
@@ -90,6 +101,173 @@ def create_sample_data():
     print("\nYou can now run the application with: python -m habit.cli")
 
 
+DEFAULT_MIX: Dict[str, float] = {"daily": 0.6, "weekly": 0.3, "monthly": 0.1}
+"""Default periodicity weights of generated datasets (also used by the benchmarks)."""
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse a periodicity mix such as 'daily=0.6,weekly=0.3,monthly=0.1'.
+
+    Args:
+        spec: Comma separated periodicity=weight pairs.
+    Returns:
+        Mapping of periodicity to normalized weight.
+    Raises:
+        ValueError: if a pair is malformed, names an unsupported periodicity
+            or has a negative weight, or if the weights do not sum to a
+            positive number.
+    """
+    mix = {}
+    for part in spec.split(","):
+        name, sep, weight = part.partition("=")
+        name = name.strip().lower()
+        if not sep or not name:
+            raise ValueError(f"Expected periodicity=weight in the mix, not {part.strip()!r}")
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Mix periodicities must be one of {', '.join(DEFAULT_MIX)}, not {name!r}")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise ValueError(f"Weight of {name!r} must be a number, not {weight.strip()!r}") from None
+        if mix[name] < 0:
+            raise ValueError(f"Weight of {name!r} must not be negative")
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Periodicity mix weights must sum to a positive number")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+def _period_date(periodicity: str, today: date, k: int, jitter: int) -> date:
+    """
+    Return a completion date inside the k-th period before today's period.
+
+    `jitter` picks the day within a weekly (0-6) or monthly (0-27) period;
+    dates that would land in the future are clamped to today.
+    """
+    if periodicity == "daily":
+        return today - timedelta(days=k)
+    if periodicity == "weekly":
+        start = today - timedelta(days=today.weekday()) - timedelta(weeks=k)
+        return min(start + timedelta(days=jitter % 7), today)
+    start = today.replace(day=1) - relativedelta(months=k)
+    return min(start + timedelta(days=jitter % 28), today)
+
+
+_DAYS_PER_PERIOD = {"daily": 1, "weekly": 7, "monthly": 30}
+
+
+def iter_synthetic_rows(count: int,
+                        days: int,
+                        seed: int = 0,
+                        mix: Optional[Dict[str, float]] = None,
+                        zipf_s: float = 1.0,
+                        min_activity: float = 0.05,
+                        today: Optional[date] = None) -> Iterator[tuple]:
+    """
+    Lazily generate raw `habits` rows for a synthetic dataset.
+
+    Only one habit's completions are held in memory at a time.
+
+    - Activity is Zipfian: the habit of rank k completes roughly a 1/k^zipf_s
+      share of its periods (never less than `min_activity`).
+    - Completions come in streaks and gaps from a two-state (active/lapsed)
+      Markov chain whose transition odds depend on the habit's activity.
+    - Periodicities are drawn from `mix`, and each habit starts at a random
+      point within the last `days` days.
+
+    Args:
+        count: Number of habits.
+        days: Maximum history length in days.
+        seed: Random seed; the same seed (and `today`) yields the same rows.
+        mix: Relative weights per periodicity (default: DEFAULT_MIX).
+        zipf_s: Zipf exponent for the activity distribution.
+        min_activity: Floor for the per-habit activity level.
+        today: Newest possible completion date (default: date.today()).
+
+    Yields:
+        (name, periodicity, creation_date, completions_json) tuples.
+    """
+    rng = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    today = today or date.today()
+
+    for i in range(count):
+        periodicity = rng.choices(names, weights)[0]
+        activity = max(min_activity, min(1.0, (i + 1) ** -zipf_s))
+        history = rng.randint(1, days)
+        periods = max(1, history // _DAYS_PER_PERIOD[periodicity])
+
+        stay_active = 0.5 + 0.49 * activity
+        resume = activity
+        active = rng.random() < activity
+        completions: List[date] = []
+        for k in range(periods - 1, -1, -1):
+            if active:
+                completions.append(_period_date(periodicity, today, k, rng.randrange(28)))
+            active = rng.random() < (stay_active if active else resume)
+
+        created = datetime.combine(today - timedelta(days=history), datetime.min.time(), timezone.utc)
+        yield (f"habit-{i:07d}", periodicity, created.isoformat(),
+               DatabaseManager.encode_completions(completions))
+
+
+def generate_dataset(db_path: str,
+                     count: int,
+                     days: int,
+                     seed: int = 0,
+                     fresh: bool = False,
+                     **options) -> int:
+    """
+    Stream a synthetic dataset into `db_path` through the bulk insert path.
+
+    All rows are written in a single transaction. Existing habits are kept
+    (and overwritten on name clashes) unless `fresh` is set.
+
+    Args:
+        db_path: Target database file.
+        count: Number of habits.
+        days: Maximum history length in days.
+        seed: Random seed for reproducible datasets.
+        fresh: Delete the database file first.
+        **options: Passed on to iter_synthetic_rows (mix, zipf_s, min_activity, today).
+
+    Returns:
+        The number of habits written.
+    """
+    if fresh and os.path.exists(db_path):
+        os.remove(db_path)
+    db = DatabaseManager(db_path)
+    try:
+        db.initialize_schema()
+        return db.bulk_insert(iter_synthetic_rows(count, days, seed, **options))
+    finally:
+        db.close()
+
+
+def parse_args(argv=None):
+    """Parse command line options for the initialization script."""
+    parser = argparse.ArgumentParser(description="Initialize the habit tracker database.")
+    parser.add_argument("--db", default="habits.db", help="Database file (default: habits.db)")
+    parser.add_argument("--synthetic", action="store_true", help="Generate a synthetic load-testing dataset")
+    parser.add_argument("--habits", type=int, default=10000, help="Number of synthetic habits")
+    parser.add_argument("--days", type=int, default=365, help="Maximum days of history per habit")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--mix", help="Periodicity mix, e.g. daily=0.6,weekly=0.3,monthly=0.1")
+    parser.add_argument("--zipf", type=float, default=1.0, help="Zipf exponent for activity")
+    parser.add_argument("--today", type=date.fromisoformat, help="Anchor date (YYYY-MM-DD)")
+    parser.add_argument("--fresh", action="store_true", help="Delete the database before generating")
+    args = parser.parse_args(argv)
+    if args.mix:
+        try:
+            args.mix = parse_mix(args.mix)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
 if __name__ == "__main__":
     """
     Main execution point for the initialization script.
@@ -99,5 +277,13 @@ if __name__ == "__main__":
     2. Populate it with 5 predefined habits
     3. Add 4 weeks of sample completion data
     4. Print a summary of the created data
+
+    With --synthetic it streams a generated dataset of --habits habits instead.
     """
-    create_sample_data()
\ No newline at end of file
+    args = parse_args()
+    if args.synthetic:
+        written = generate_dataset(args.db, args.habits, args.days, args.seed, fresh=args.fresh,
+                                   mix=args.mix, zipf_s=args.zipf, today=args.today)
+        print(f"✅ Wrote {written} synthetic habits to {args.db}")
+    else:
+        create_sample_data(args.db)
\ No newline at end of file
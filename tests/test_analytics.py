@@ -5,7 +5,10 @@ from habit.analytics import (
     filter_habits_by_periodicity,
     longest_streak_for,
     get_all_streaks,
-    get_habit_with_longest_streak
+    get_habit_with_longest_streak,
+    streak_as_of,
+    streak_series,
+    periods_inactive
 )
 from habit.habit import Habit
 
@@ -154,3 +157,67 @@ def test_get_habit_with_longest_streak_zero_streaks():
     h1 = Habit("Empty", "daily")
     h2 = Habit("Also Empty", "weekly")
     assert get_habit_with_longest_streak([h1, h2]) is None
+
+# Tests for streak_as_of and streak_series
+def test_streak_as_of_past_dates():
+    """This tests streak_as_of with a daily habit that had a gap.
+
+    Verifies that:
+        - Days before the first completion have a streak of 0
+        - The streak on a past day ignores later completions
+        - A day inside a gap keeps the streak ending at the newest earlier completion
+    """
+    habit = Habit("Exercise", "daily")
+    habit._dates = {date(2024, 1, d) for d in (1, 2, 3, 6, 7)}
+    assert streak_as_of(habit, date(2023, 12, 31)) == 0
+    assert streak_as_of(habit, date(2024, 1, 2)) == 2
+    assert streak_as_of(habit, date(2024, 1, 5)) == 3
+    assert streak_as_of(habit, date(2024, 1, 7)) == 2
+
+def test_streak_series_matches_point_queries(weekly_habit_with_gap):
+    """This tests that the linear sweep agrees with per-day queries.
+
+    Verifies that:
+        - The series has one entry per day of the range
+        - Every entry equals streak_as_of for that day
+        - The last entry equals the habit's current streak
+    """
+    end = date.today()
+    start = end - timedelta(weeks=5)
+    series = streak_series(weekly_habit_with_gap, start, end)
+    assert len(series) == (end - start).days + 1
+    assert all(streak == streak_as_of(weekly_habit_with_gap, day) for day, streak in series)
+    assert series[-1][1] == weekly_habit_with_gap.get_streak()
+
+def test_streak_series_counts_met_periods_only():
+    """This tests point-in-time streaks for a habit with a per-period target.
+
+    Verifies that:
+        - A period counts from the day it reaches the target
+        - The last value matches the current streak
+    """
+    habit = Habit("Gym", "weekly", target=2)
+    monday = date(2024, 6, 3)
+    habit.complete_range([monday, monday + timedelta(days=3), monday + timedelta(days=7)])
+    series = dict(streak_series(habit, monday, monday + timedelta(days=13)))
+    assert series[monday] == 0
+    assert series[monday + timedelta(days=3)] == 1
+    assert series[monday + timedelta(days=13)] == habit.get_streak() == 1
+
+def test_periods_inactive_counts_own_periods():
+    """This tests measuring inactivity in a habit's own periods.
+
+    Verifies that:
+        - A habit completed in the current period is 0 periods inactive
+        - Weekly habits count weeks, daily habits count days
+        - Habits never completed count from their creation date
+    """
+    from datetime import datetime
+    weekly = Habit("Gym", "weekly")
+    weekly.complete_on(date(2024, 5, 6))
+    assert periods_inactive(weekly, date(2024, 5, 12)) == 0
+    assert periods_inactive(weekly, date(2024, 6, 3)) == 4
+
+    daily = Habit("Read", "daily")
+    daily.creation_date = datetime(2024, 6, 1)
+    assert periods_inactive(daily, date(2024, 6, 11)) == 10
@@ -69,7 +69,7 @@ def test_handle_complete_success(controller, capsys):
 
        1. The handle_complete method processes a valid habit name
        2. The habit's complete_task method is called and returns a completion date
-       3. The habit is saved to the database via the tracker's db.save_habit method
+       3. The habit is saved to the database via the tracker's save_habit method
        4. A success message with the completion date is printed to the console
     
        This test ensures the complete command functions correctly for existing habits,
@@ -82,7 +82,7 @@ def test_handle_complete_success(controller, capsys):
     controller.tracker.find_habit_by_name.return_value = mock_habit
 
     controller.handle_complete("Read")
-    controller.tracker.db.save_habit.assert_called_once_with(mock_habit)
+    controller.tracker.save_habit.assert_called_once_with(mock_habit)
     captured = capsys.readouterr()
     assert "✔ 'Read' completed for 2025-08-07" in captured.out
 
@@ -177,16 +177,13 @@ def test_handle_list_with_habits(controller, capsys):
        This test ensures the list command provides users with a clear overview
        of their tracked habits and progress.
     """
-    mock_habit = MagicMock()
-    mock_habit.name = "Read"
-    mock_habit.periodicity = "daily"
-    mock_habit.get_streak.return_value = 2
-    controller.tracker.habits = [mock_habit]
+    from habit.database import HabitSummary
+    controller.tracker.list_summaries.return_value = [HabitSummary("Read", "daily", 1, 2)]
 
     controller.handle_list()
     captured = capsys.readouterr()
     assert "📌 Current Habits:" in captured.out
-    assert "Read" in captured.out
+    assert "– Read (daily) ➝ Streak: 2" in captured.out
 
 def test_handle_list_empty(controller, capsys):
     """Test listing when no habits are present.
@@ -198,7 +195,7 @@ def test_handle_list_empty(controller, capsys):
         This test ensures the list command provides clear feedback when users
         have not yet added any habits to their tracker.
     """
-    controller.tracker.habits = []
+    controller.tracker.list_summaries.return_value = []
     controller.handle_list()
     captured = capsys.readouterr()
     assert "📭 No habits found." in captured.out
@@ -229,3 +226,96 @@ def test_handle_command_unknown(controller, capsys):
     controller.handle_command("explode")
     captured = capsys.readouterr()
     assert "❓ Unknown command" in captured.out
+
+def test_handle_snapshot_writes_file(controller, tmp_path, capsys):
+    """Test exporting habits to a snapshot through the command dispatcher.
+       Verifies that:
+       1. handle_command routes 'snapshot' with its path option
+       2. The snapshot file is written and a confirmation is printed
+    """
+    from habit.habit import Habit
+    controller.tracker.habits = [Habit("Read", "daily")]
+    path = tmp_path / "habits.hsnap"
+    controller.handle_command("snapshot", path=str(path))
+    captured = capsys.readouterr()
+    assert path.exists()
+    assert "Snapshot of 1 habits" in captured.out
+
+def test_handle_import_reloads_habits(controller, tmp_path, capsys):
+    """Test importing a CSV file through the command dispatcher.
+       Verifies that:
+       1. The imported rows are bulk inserted into the tracker's database
+       2. The tracker's habits are reloaded and a confirmation is printed
+    """
+    path = tmp_path / "completions.csv"
+    path.write_text("name,periodicity,date\nRead,daily,2024-06-01\n", encoding="utf-8")
+    controller.tracker.db.bulk_insert.return_value = 1
+    controller.tracker.db.load_all_habits.return_value = ["Read"]
+    controller.handle_command("import", path=str(path))
+    captured = capsys.readouterr()
+    controller.tracker.db.bulk_insert.assert_called_once()
+    assert controller.tracker.habits == ["Read"]
+    assert "Imported 1 habits" in captured.out
+
+def test_handle_list_json_format(controller, capsys):
+    """Test listing habits as NDJSON.
+       Verifies that:
+       1. The periodicity filter is passed to the summary query
+       2. One JSON record per habit is printed instead of the text listing
+    """
+    import json
+    from habit.database import HabitSummary
+    controller.tracker.list_summaries.return_value = [HabitSummary("Swim", "weekly", 1, 0)]
+    controller.handle_command("list", periodicity="weekly", format="ndjson")
+    controller.tracker.list_summaries.assert_called_once_with("weekly")
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == [{"name": "Swim", "periodicity": "weekly", "target": 1, "streak": 0}]
+
+def test_handle_complete_at_timestamp(controller, capsys):
+    """Test completing a habit at an explicit timestamp.
+       Verifies that:
+       1. The timestamp is passed to complete_at with the tracker's timezone
+       2. The local date of the timestamp is reported
+       3. An invalid timestamp is rejected without saving
+    """
+    from datetime import datetime, timezone
+    mock_habit = MagicMock()
+    mock_habit.name = "Read"
+    controller.tracker.tz = "Asia/Tokyo"
+    controller.tracker.find_habit_by_name.return_value = mock_habit
+
+    controller.handle_command("complete", habit_name="Read", at="2024-06-01T20:00:00+00:00")
+    mock_habit.complete_at.assert_called_once_with(datetime(2024, 6, 1, 20, tzinfo=timezone.utc), "Asia/Tokyo")
+    assert "completed for 2024-06-02" in capsys.readouterr().out
+
+    controller.handle_command("complete", habit_name="Read", at="yesterday")
+    assert "Invalid timestamp" in capsys.readouterr().out
+    controller.tracker.save_habit.assert_called_once()
+
+def test_archive_commands(controller, capsys):
+    """Test the archive, restore and archived commands.
+       Verifies that:
+       1. --inactive N archives inactive habits through the tracker (batch strings are converted)
+       2. A named habit is archived, and a missing one is reported
+       3. Archived habits are listed from the archive table
+       4. Restoring reports the restored habit
+    """
+    controller.tracker.archive_inactive.return_value = ["old"]
+    controller.handle_command("archive", inactive="6")
+    controller.tracker.archive_inactive.assert_called_once_with(6)
+    assert "Archived 1 inactive habits: old" in capsys.readouterr().out
+
+    controller.tracker.archive_habit.return_value = False
+    controller.handle_command("archive", habit_name="missing")
+    assert "🚫" in capsys.readouterr().out
+
+    controller.tracker.db.list_archived.return_value = [("old", "daily", "2024-06-01T10:00:00")]
+    controller.handle_command("archived")
+    assert "- old (daily), archived 2024-06-01" in capsys.readouterr().out
+
+    restored = MagicMock()
+    restored.name = "old"
+    restored.completions = [1, 2]
+    controller.tracker.restore_habit.return_value = restored
+    controller.handle_command("restore", habit_name="old")
+    assert "restored with 2 completions" in capsys.readouterr().out
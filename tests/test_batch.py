@@ -0,0 +1,104 @@
+import io
+import json
+import pytest
+from habit.app_controller import AppController
+from habit.batch import parse_line, run_batch
+
+
+@pytest.fixture
+def controller(tmp_path):
+    """This fixture creates a controller backed by a temporary database.
+
+     it Returns:
+        AppController: A controller with an empty tracker."""
+    controller = AppController(str(tmp_path / "habits.db"))
+    yield controller
+    controller.tracker.db.close()
+
+
+def test_parse_line_formats():
+    """This tests parsing shell-style and JSON batch lines.
+
+    Verifies that:
+        - Positional habit and periodicity are read and normalized like --command mode
+        - Aliases are resolved and --file becomes the path option
+        - JSON objects are accepted; comments and blank lines are skipped
+        - Unknown commands raise ValueError
+    """
+    assert parse_line('add "Morning Run" Daily') == {
+        "command": "add", "habit_name": "morning run", "periodicity": "daily", "options": {}}
+    assert parse_line("ls --periodicity weekly")["periodicity"] == "weekly"
+    assert parse_line("export --file out.csv")["options"] == {"path": "out.csv"}
+    assert parse_line('{"command": "done", "habit": "Read"}')["command"] == "complete"
+    assert parse_line("# note") is None and parse_line("  ") is None
+    with pytest.raises(ValueError):
+        parse_line("frobnicate")
+
+
+def test_run_batch_reports_results(controller):
+    """This tests executing a batch against one controller.
+
+    Verifies that:
+        - One JSON result line is written per command, plus a summary
+        - Failures (missing habit, missing argument) are reported without stopping the batch
+        - Consecutive writes share one transaction
+        - Changes are persisted
+    """
+    lines = ["add read daily", "complete read", "list", "complete ghost", "add", "delete read"]
+    out = io.StringIO()
+    summary = run_batch(controller, lines, out)
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    assert [r.get("ok") for r in results[:-1]] == [True, True, True, False, False, True]
+    assert "error" in results[4]
+    assert results[-1] == summary
+    assert summary["commands"] == 6 and summary["failed"] == 2 and summary["transactions"] == 2
+    assert controller.interactive is True
+    assert controller.tracker.db.load_all_habits() == []
+
+
+def test_run_batch_defers_commits(controller):
+    """This tests transaction grouping of consecutive writes.
+
+    Verifies that:
+        - Writes are invisible to another connection until the group ends
+    """
+    from habit.database import DatabaseManager
+
+    other = DatabaseManager(controller.tracker.db.db_name)
+    seen = []
+
+    def lines():
+        yield "add read daily"
+        yield "add write daily"
+        seen.append(len(other.load_all_habits()))
+        yield "list"
+        seen.append(len(other.load_all_habits()))
+
+    run_batch(controller, lines(), io.StringIO())
+    other.close()
+    assert seen == [0, 2]
+
+
+def test_failed_write_is_undone_within_group(tmp_path, controller):
+    """This tests a failing write command inside a grouped transaction.
+
+    Verifies that:
+        - Rows written by an import that fails part way are rolled back
+        - Writes of the other commands in the group are still committed
+        - The tracker's habits match the database afterwards
+        - A JSON line with a non-string field is reported, not raised
+    """
+    bad = tmp_path / "bad.csv"
+    bad.write_text("name,periodicity,date,target\n"
+                   "Read,daily,2024-06-01,1\nRun,daily,2024-06-01,1\nRun,daily,2024-06-02,1\nbroken\n")
+    lines = ["add gym daily", f"import --file {bad}", '{"command": "add", "habit": 5}', "add swim weekly"]
+    out = io.StringIO()
+    summary = run_batch(controller, lines, out)
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    assert [r["ok"] for r in results[:-1]] == [True, False, False, True]
+    assert "must be a string" in results[2]["error"]
+    assert summary["transactions"] == 1
+    assert sorted(h.name for h in controller.tracker.db.load_all_habits()) == ["gym", "swim"]
+    assert sorted(h.name for h in controller.tracker.habits) == ["gym", "swim"]
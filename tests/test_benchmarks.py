@@ -0,0 +1,44 @@
+from datetime import date
+from benchmarks.datagen import generate_habits
+from initialize_db import parse_mix
+from benchmarks.run_benchmarks import compare
+
+
+def test_generate_habits_is_deterministic():
+    """This tests that the synthetic generator is reproducible from a seed.
+
+    Verifies that:
+        - Two runs with the same parameters produce identical histories
+        - The requested number of habits is created
+    """
+    today = date(2024, 6, 30)
+    first = generate_habits(20, 90, seed=7, today=today)
+    second = generate_habits(20, 90, seed=7, today=today)
+    assert len(first) == 20
+    assert [h.completions for h in first] == [h.completions for h in second]
+
+
+def test_generate_habits_respects_mix_and_gaps():
+    """This tests the periodicity mix and gap density parameters.
+
+    Verifies that:
+        - A mix with a single periodicity only yields that periodicity
+        - A gap density of 0 fills every period, giving a full streak
+    """
+    habits = generate_habits(5, 30, parse_mix("daily=1"), gap_density=0.0, today=date(2024, 6, 30))
+    assert all(h.periodicity == "daily" for h in habits)
+    assert all(h.get_streak() == 30 for h in habits)
+
+
+def test_compare_reports_regressions_only():
+    """This tests the baseline comparison.
+
+    Verifies that:
+        - A median slowdown beyond the threshold is reported
+        - Improvements and benchmarks missing from the baseline are ignored
+    """
+    baseline = {"results": {"a": {"median": 1.0}, "b": {"median": 1.0}}}
+    current = {"results": {"a": {"median": 1.5}, "b": {"median": 0.5}, "c": {"median": 9.0}}}
+    regressions = compare(current, baseline, threshold=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("a:")
@@ -193,3 +193,74 @@ def test_main_handles_exception_gracefully(mock_app_controller, capsys):
         main()
         captured = capsys.readouterr()
         assert "Error: boom!" in captured.out
+
+def test_profile_flag_prints_report(mock_app_controller, capsys):
+    """
+    Test that --profile enables instrumentation and prints a report on exit.
+
+    Verifies that:
+    1. The profile report is printed after the command runs
+    2. Instrumentation is switched on for the run
+    """
+    from habit import metrics
+    with patch.object(sys, 'argv', ["cli.py", "--command", "list", "--profile"]):
+        try:
+            main()
+            assert metrics.METRICS.enabled
+        finally:
+            metrics.disable()
+            metrics.reset()
+    captured = capsys.readouterr()
+    assert "Profile" in captured.out
+
+def test_format_option_is_passed_and_goodbye_suppressed(mock_app_controller, capsys):
+    """
+    Test the machine-readable output option.
+    Verifies that:
+    1. --format is forwarded to handle_command as the format option
+    2. The goodbye message is not mixed into JSON output
+    """
+    instance = MagicMock()
+    mock_app_controller.return_value = instance
+    with patch.object(sys, 'argv', ["cli.py", "--command", "list", "--format", "ndjson"]):
+        main()
+    instance.handle_command.assert_called_once_with("list", habit_name=None, periodicity=None, format="ndjson")
+    assert "Goodbye" not in capsys.readouterr().out
+
+
+def test_export_to_stdout_round_trips(mock_app_controller, tmp_path, capsys):
+    """
+    Test exporting CSV to stdout and importing it back from stdin.
+
+    Verifies that:
+    1. Nothing but CSV is written to stdout (the goodbye goes to stderr)
+    2. The dump imports into another database, including a habit without completions
+    """
+    import io
+    from datetime import date
+    from habit.app_controller import AppController
+    from habit.habit import Habit
+
+    source = AppController(str(tmp_path / "source.db"))
+    habit = Habit("Read", "daily")
+    habit.complete_on(date(2024, 6, 1))
+    source.tracker.add_habit(habit)
+    source.tracker.add_habit(Habit("Swim", "weekly", target=2))
+    source.tracker.close()
+
+    mock_app_controller.side_effect = lambda **options: AppController(str(tmp_path / "source.db"), **options)
+    with patch.object(sys, 'argv', ["cli.py", "--command", "export", "--file", "-"]):
+        main()
+    captured = capsys.readouterr()
+    assert captured.out.splitlines()[0] == "name,periodicity,date,target"
+    assert "Goodbye" not in captured.out and "Goodbye" in captured.err
+
+    mock_app_controller.side_effect = lambda **options: AppController(str(tmp_path / "copy.db"), **options)
+    with patch.object(sys, 'argv', ["cli.py", "--command", "import", "--file", "-"]), \
+            patch.object(sys, 'stdin', io.StringIO(captured.out)):
+        main()
+    assert "Imported 2 habits" in capsys.readouterr().out
+    copy = AppController(str(tmp_path / "copy.db"))
+    assert {(h.name, h.periodicity, h.target, tuple(h.completions)) for h in copy.tracker.habits} == {
+        ("Read", "daily", 1, (date(2024, 6, 1),)), ("Swim", "weekly", 2, ())}
+    copy.tracker.close()
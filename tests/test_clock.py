@@ -0,0 +1,65 @@
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+from habit import clock
+
+
+def test_local_date_across_timezones():
+    """This tests resolving the calendar date of one instant in several timezones.
+
+    Verifies that:
+        - The same instant falls on different dates east and west of UTC
+        - Naive datetimes and POSIX timestamps are taken as UTC
+    """
+    instant = datetime(2024, 6, 1, 23, 30, tzinfo=timezone.utc)
+    assert clock.local_date(instant, "Asia/Tokyo") == date(2024, 6, 2)
+    assert clock.local_date(instant, "America/Los_Angeles") == date(2024, 6, 1)
+    assert clock.local_date(instant.replace(tzinfo=None), "Asia/Tokyo") == date(2024, 6, 2)
+    assert clock.local_date(instant.timestamp(), "UTC") == date(2024, 6, 1)
+
+
+@pytest.mark.parametrize("tz", ["Asia/Kolkata", "Asia/Kathmandu", "America/New_York", "Australia/Lord_Howe"])
+def test_cached_slots_match_exact_conversion(tz):
+    """This tests the per-slot cache against exact conversions around local midnight.
+
+    Verifies that:
+        - For half- and quarter-hour offsets and across DST changes, every minute
+          around each local midnight resolves to the same date as astimezone()
+    """
+    zone = clock.resolve_tz(tz)
+    for day in (date(2024, 3, 10), date(2024, 4, 7), date(2024, 10, 6), date(2024, 11, 3)):
+        midnight = datetime(day.year, day.month, day.day, tzinfo=zone).astimezone(timezone.utc)
+        for minutes in range(-90, 91):
+            instant = midnight + timedelta(minutes=minutes)
+            assert clock.local_date(instant, tz) == instant.astimezone(zone).date(), instant
+
+
+def test_historical_offsets_off_the_quarter_hour():
+    """This tests offsets that are not a multiple of 15 minutes.
+
+    Verifies that:
+        - Monrovia's 1970 offset (-00:44:30) resolves dates exactly around midnight
+    """
+    zone = clock.resolve_tz("Africa/Monrovia")
+    assert clock.local_date(datetime(1970, 6, 1, 0, 44, 40, tzinfo=timezone.utc), zone) == date(1970, 6, 1)
+    midnight = datetime(1970, 6, 1, tzinfo=zone).astimezone(timezone.utc)
+    for seconds in range(-1800, 1801, 10):
+        instant = midnight + timedelta(seconds=seconds)
+        assert clock.local_date(instant, zone) == instant.astimezone(zone).date(), instant
+
+
+def test_today_in_is_cached_until_local_midnight():
+    """This tests the cached "today".
+
+    Verifies that:
+        - The date is recomputed only once the local midnight has passed
+        - Unknown timezones raise ValueError
+    """
+    clock._today_cache.clear()
+    before = datetime(2024, 6, 1, 14, 59, tzinfo=timezone.utc).timestamp()  # 23:59 in Tokyo
+    with patch("habit.clock.time.time", return_value=before):
+        assert clock.today_in("Asia/Tokyo") == date(2024, 6, 1)
+    with patch("habit.clock.time.time", return_value=before + 120):
+        assert clock.today_in("Asia/Tokyo") == date(2024, 6, 2)
+    with pytest.raises(ValueError):
+        clock.today_in("Mars/Olympus_Mons")
@@ -2,6 +2,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import tempfile
+from datetime import date, timedelta
 import pytest
 from habit.habit import Habit
 from habit.database import DatabaseManager
@@ -111,3 +112,319 @@ def test_delete_habit(db):
     assert db.get_habit_by_name("Run") is not None
     db.delete_habit("Run")
     assert db.get_habit_by_name("Run") is None
+
+def test_bulk_insert_streams_rows(db):
+    """
+    This tests writing raw rows through the bulk insert path.
+
+    Verifies that:
+    1. Rows supplied by a generator are all written and counted
+    2. The written rows load back as regular Habit objects
+    """
+    rows = (
+        (f"Habit {i}", "daily", "2024-01-01T00:00:00+00:00",
+         DatabaseManager.encode_completions([date(2024, 1, 1), date(2024, 1, 2)]))
+        for i in range(3)
+    )
+    assert db.bulk_insert(rows) == 3
+
+    habits = db.load_all_habits()
+    assert len(habits) == 3
+    assert all(h.get_streak() == 2 for h in habits)
+
+def test_rename_habit(db):
+    """
+    This tests moving a habit's row to a new name.
+
+    Verifies that:
+    1. The habit is reachable under the new name with its completions
+    2. No row is left behind under the old name
+    """
+    habit = Habit("Jog", "daily")
+    habit.complete_task()
+    db.save_habit(habit)
+
+    db.rename_habit("Jog", "Run")
+    assert db.get_habit_by_name("Jog") is None
+    assert db.get_habit_by_name("Run").get_streak() == 1
+
+def test_iter_rows_streams_in_batches(db):
+    """
+    This tests streaming raw rows out of the habits table.
+
+    Verifies that:
+        - Every row is yielded exactly once even when spanning several batches
+        - Rows are raw tuples with the completions JSON
+    """
+    db.bulk_insert((f"habit {i}", "daily", "2024-01-01T00:00:00", '["2024-01-02"]') for i in range(5))
+    rows = list(db.iter_rows(batch_size=2))
+    assert sorted(r[0] for r in rows) == [f"habit {i}" for i in range(5)]
+    assert rows[0][3] == '["2024-01-02"]'
+
+def test_transaction_groups_and_rolls_back(db):
+    """
+    This tests grouping writes with DatabaseManager.transaction.
+
+    Verifies that:
+        - Writes inside the block are committed once at the end
+        - A failing block rolls back all of its writes
+    """
+    with db.transaction():
+        db.save_habit(Habit("Read", "daily"))
+        db.save_habit(Habit("Write", "daily"))
+    assert len(db.load_all_habits()) == 2
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.delete_habit("Read")
+            raise RuntimeError("boom")
+    assert db.get_habit_by_name("Read") is not None
+
+def test_target_column_and_migration(temp_db_path):
+    """
+    This tests storing targets and upgrading databases created without them.
+
+    Verifies that:
+        - An old habits table gains a target column defaulting to 1
+        - Saved targets are loaded back
+    """
+    import sqlite3
+    conn = sqlite3.connect(temp_db_path)
+    conn.execute("CREATE TABLE habits (name TEXT PRIMARY KEY, periodicity TEXT NOT NULL, "
+                 "creation_date TEXT NOT NULL, completions TEXT NOT NULL)")
+    conn.execute("INSERT INTO habits VALUES ('Old', 'daily', '2024-01-01T00:00:00', '[]')")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(temp_db_path)
+    db.initialize_schema()
+    try:
+        assert db.get_habit_by_name("Old").target == 1
+        db.save_habit(Habit("Gym", "weekly", target=3))
+        assert db.get_habit_by_name("Gym").target == 3
+    finally:
+        db.close()
+
+def test_habit_cache_hits_and_invalidation(temp_db_path):
+    """
+    This tests the read-through LRU cache of get_habit_by_name.
+
+    Verifies that:
+        - A repeated lookup is a cache hit and returns an independent copy
+        - save_habit and delete_habit invalidate the cached entry
+        - The least recently used habit is evicted when the cache is full
+        - A commit from another connection is detected through PRAGMA data_version
+    """
+    import sqlite3
+    from habit.metrics import METRICS
+    db = DatabaseManager(temp_db_path, cache_size=2)
+    db.initialize_schema()
+    METRICS.enabled = True
+    METRICS.reset()
+    try:
+        for name in ("Read", "Write", "Run"):
+            db.save_habit(Habit(name, "daily"))
+
+        first = db.get_habit_by_name("Read")
+        first.complete_on(date(2024, 1, 1))
+        assert db.get_habit_by_name("Read").completions == []
+        assert (METRICS.cache_hits, METRICS.cache_misses) == (1, 1)
+
+        db.save_habit(first)
+        assert db.get_habit_by_name("Read").completions == [date(2024, 1, 1)]
+        assert METRICS.cache_misses == 2
+
+        db.get_habit_by_name("Write")
+        db.get_habit_by_name("Run")
+        assert list(db._habit_cache) == ["Write", "Run"]
+
+        db.delete_habit("Run")
+        assert db.get_habit_by_name("Run") is None
+
+        other = sqlite3.connect(temp_db_path)
+        other.execute("UPDATE habits SET periodicity = 'weekly' WHERE name = 'Write'")
+        other.commit()
+        other.close()
+        assert db.get_habit_by_name("Write").periodicity == "weekly"
+    finally:
+        METRICS.enabled = False
+        METRICS.reset()
+        db.close()
+
+def test_cursor_is_reused_across_calls(temp_db_path):
+    """
+    This tests cursor reuse and the configurable statement cache.
+
+    Verifies that:
+        - Consecutive calls run on the same shared cursor
+        - cached_statements is stored and the manager works with the cache disabled
+        - Closing the manager drops the shared cursor
+    """
+    db = DatabaseManager(temp_db_path, cached_statements=0)
+    db.initialize_schema()
+    try:
+        assert db.cached_statements == 0
+        cursor = db._cursor()
+        db.save_habit(Habit("Read", "daily"))
+        assert db.get_habit_by_name("Read").name == "Read"
+        assert db._cursor() is cursor
+        db.close()
+        assert db._shared_cursor is None
+        assert db.get_habit_by_name("Read") is not None
+    finally:
+        db.close()
+
+def test_change_feed_reports_changes_since_seq(db):
+    """
+    This tests the change-data-capture feed (iter_changes).
+
+    Verifies that:
+        - Saves, bulk inserts, renames and deletes are all recorded
+        - Each habit appears once, with its latest state, in sequence order
+        - Passing the last seen seq returns only newer changes
+        - Habits saved before the feed existed are backfilled on upgrade
+    """
+    db.save_habit(Habit("Read", "daily"))
+    db.save_habit(Habit("Run", "daily"))
+    db.bulk_insert([("Gym", "weekly", "2024-01-01T00:00:00", "[]")])
+    seq = db.last_change_seq()
+    assert [name for _, name, _, _ in db.iter_changes()] == ["Read", "Run", "Gym"]
+
+    habit = Habit("Read", "daily")
+    habit.complete_on(date(2024, 1, 2))
+    db.save_habit(habit)
+    db.rename_habit("Run", "Jog")
+    db.delete_habit("Gym")
+
+    changes = list(db.iter_changes(seq, batch_size=2))
+    assert [(name, h is None, kind) for _, name, h, kind in changes] == [
+        ("Read", False, "saved"), ("Run", True, "deleted"), ("Jog", False, "saved"), ("Gym", True, "deleted")]
+    assert changes[0][2].completions == [date(2024, 1, 2)]
+    assert [s for s, _, _, _ in changes] == sorted(s for s, _, _, _ in changes)
+    assert list(db.iter_changes(db.last_change_seq())) == []
+
+    conn = db._connect()
+    conn.execute("DROP TABLE habit_changes")
+    conn.commit()
+    db.initialize_schema()
+    assert sorted(name for _, name, _, _ in db.iter_changes()) == ["Jog", "Read"]
+
+def test_archive_and_restore_habit(db):
+    """
+    This tests moving habits to the compressed archive and back.
+
+    Verifies that:
+        - An archived habit is gone from load_all_habits but listed as archived
+        - Its history is stored compressed and restored intact
+        - Restoring an unknown name returns None
+        - The change feed records the archive as its own kind
+        - Restoring over an active habit of the same name raises ValueError
+    """
+    import zlib
+    habit = Habit("Read", "daily")
+    habit.complete_range([date(2020, 1, 1) + timedelta(days=i) for i in range(400)])
+    db.save_habit(habit)
+    db.save_habit(Habit("Run", "daily"))
+
+    db.archive_habit(habit)
+    assert [h.name for h in db.load_all_habits()] == ["Run"]
+    assert [row[:2] for row in db.list_archived()] == [("Read", "daily")]
+    stored = db._connect().execute("SELECT history FROM habit_archive").fetchone()[0]
+    assert len(stored) < len(DatabaseManager.encode_completions(habit.completions)) / 4
+    assert zlib.decompress(stored)
+    assert list(db.iter_changes())[-1][1:] == ("Read", None, "archived")
+
+    db.save_habit(Habit("Read", "weekly"))
+    with pytest.raises(ValueError):
+        db.restore_habit("Read")
+    db.delete_habit("Read")
+
+    restored = db.restore_habit("Read")
+    assert restored.completions == habit.completions
+    assert sorted(h.name for h in db.load_all_habits()) == ["Read", "Run"]
+    assert db.list_archived() == []
+    assert db.restore_habit("Read") is None
+
+def test_long_histories_are_compressed_and_decoded_lazily(temp_db_path):
+    """
+    This tests transparent compression of completion payloads.
+
+    Verifies that:
+        - Payloads below the threshold stay JSON, longer ones are compressed and tagged
+        - Loaded habits decompress their history only when it is first used
+        - iter_rows and bulk_insert keep working with JSON text
+        - An unknown compression format is rejected
+    """
+    db = DatabaseManager(temp_db_path, compress_threshold=200, compression="lzma")
+    db.initialize_schema()
+    try:
+        long = Habit("Read", "daily")
+        long.complete_range([date(2020, 1, 1) + timedelta(days=i) for i in range(500)])
+        db.save_habit(long)
+        db.save_habit(Habit("Run", "daily"))
+        db.bulk_insert([("Gym", "daily", "2024-01-01T00:00:00",
+                         DatabaseManager.encode_completions(long.completions))])
+
+        stored = dict(db._connect().execute("SELECT name, completions_format FROM habits"))
+        assert stored == {"Read": "lzma", "Run": "json", "Gym": "lzma"}
+        size = db._connect().execute("SELECT length(completions) FROM habits WHERE name = 'Read'").fetchone()[0]
+        assert size < len(DatabaseManager.encode_completions(long.completions)) / 10
+
+        loaded = {h.name: h for h in db.load_all_habits()}
+        assert loaded["Read"]._loader is not None
+        assert loaded["Read"]._is_duplicate(date(2020, 1, 1))
+        assert loaded["Read"]._loader is None
+        assert loaded["Gym"].completions == long.completions
+
+        rows = {row[0]: row[3] for row in db.iter_rows()}
+        assert rows["Read"] == DatabaseManager.encode_completions(long.completions)
+    finally:
+        db.close()
+
+    with pytest.raises(ValueError):
+        DatabaseManager(temp_db_path, compression="brotli")
+
+def test_loaded_habits_defer_parsing_until_used(db):
+    """
+    This tests lazy completion loading with stored streaks.
+
+    Verifies that:
+        - Loaded habits keep their payload undecoded
+        - get_streak answers from the stored streak without decoding
+        - completions, _is_duplicate and new completions decode on first use
+        - Rows written by bulk_insert (no stored streak) compute the streak from history
+    """
+    habit = Habit("Read", "daily")
+    habit.complete_range([date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3)])
+    db.save_habit(habit)
+    db.bulk_insert([("Run", "daily", "2024-01-01T00:00:00", '["2024-01-01", "2024-01-02"]')])
+
+    loaded = {h.name: h for h in db.load_all_habits()}
+    read = loaded["Read"]
+    assert read.get_streak() == 3 and read._loader is not None
+    assert read.completions[-1] == date(2024, 1, 3) and read._loader is None
+
+    assert loaded["Run"].get_streak() == 2
+
+    again = db.get_habit_by_name("Read")
+    assert again.complete_on(date(2024, 1, 4))
+    assert again.get_streak() == 4
+
+def test_list_summaries_reads_only_listing_columns(db):
+    """
+    This tests the projection query used by the list command.
+
+    Verifies that:
+        - Summaries carry name, periodicity, target and the stored streak
+        - The periodicity filter is applied in SQL
+        - Rows without a stored streak (bulk inserts) get it computed
+    """
+    habit = Habit("Gym", "weekly", target=2)
+    habit.complete_range([date(2024, 6, 3), date(2024, 6, 5)])
+    db.save_habit(Habit("Read", "daily"))
+    db.save_habit(habit)
+    db.bulk_insert([("Run", "daily", "2024-01-01T00:00:00", '["2024-01-01", "2024-01-02"]')])
+
+    assert db.list_summaries() == [("Read", "daily", 1, 0), ("Gym", "weekly", 2, 1), ("Run", "daily", 1, 2)]
+    weekly = db.list_summaries("weekly")
+    assert [s.name for s in weekly] == ["Gym"] and weekly[0].target == 2
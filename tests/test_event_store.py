@@ -0,0 +1,153 @@
+from datetime import date, datetime, timezone
+import pytest
+from habit.habit import Habit
+from habit.habit_tracker import HabitTracker
+from habit.event_store import EventSourcedDatabase
+
+
+@pytest.fixture
+def store(tmp_path):
+    """This fixture creates an event store with automatic snapshots every 3 events.
+
+     it Yields:
+        EventSourcedDatabase: An initialized event store."""
+    db = EventSourcedDatabase(str(tmp_path / "events.db"), snapshot_every=3)
+    db.initialize_schema()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _events(store):
+    return store.db._connect().execute("SELECT kind, name FROM habit_events ORDER BY seq").fetchall()
+
+
+def test_saves_are_recorded_as_deltas(store):
+    """This tests that saves append small events instead of full rewrites.
+
+    Verifies that:
+        - A new habit produces an add event
+        - Further saves only record new completions and periodicity changes
+        - Renames and deletes are logged and reflected in the state
+    """
+    habit = Habit("Read", "daily")
+    store.save_habit(habit)
+    habit.complete_on(date(2024, 1, 1))
+    store.save_habit(habit)
+    store.save_habit(habit)  # unchanged: no event
+    habit.periodicity = "weekly"
+    store.save_habit(habit)
+    store.rename_habit("Read", "Study")
+    store.delete_habit("Study")
+
+    assert [kind for kind, _ in _events(store)] == [
+        "add", "complete", "change_periodicity", "rename", "delete"]
+    assert store.load_all_habits() == []
+
+
+def test_startup_replays_after_latest_snapshot(store, tmp_path):
+    """This tests recovery from a snapshot plus the events after it.
+
+    Verifies that:
+        - A snapshot is written automatically after `snapshot_every` events
+        - A fresh store rebuilds the same state, replaying only the newer events
+    """
+    habit = Habit("Run", "daily")
+    store.save_habit(habit)
+    for day in range(1, 5):
+        habit.complete_on(date(2024, 1, day))
+        store.save_habit(habit)
+
+    reopened = EventSourcedDatabase(store.db_name, snapshot_every=3)
+    state, replayed = reopened._replay()
+    assert replayed == 2
+    loaded = reopened.get_habit_by_name("Run")
+    assert loaded.get_streak() == 4
+    reopened.close()
+
+
+def test_point_in_time_and_compaction(store):
+    """This tests state_at and compact.
+
+    Verifies that:
+        - Past states can be reconstructed from the log
+        - Compaction removes folded events but keeps the current state
+        - Queries before the compaction point are rejected
+    """
+    habit = Habit("Yoga", "daily")
+    store.save_habit(habit)
+    before = datetime.now(timezone.utc)
+    habit.complete_on(date(2024, 1, 1))
+    store.save_habit(habit)
+
+    assert store.state_at(before)[0].completions == []
+    assert store.compact() == 2
+    assert _events(store) == []
+    assert store.get_habit_by_name("Yoga").completions == [date(2024, 1, 1)]
+    with pytest.raises(ValueError):
+        store.state_at(before)
+
+
+def test_tracker_with_event_log(tmp_path):
+    """This tests HabitTracker on event log storage.
+
+    Verifies that:
+        - Added, completed and renamed habits survive a restart
+    """
+    path = str(tmp_path / "events.db")
+    tracker = HabitTracker(path, event_log=True)
+    tracker.add_habit(Habit("Read", "daily"))
+    habit = tracker.find_habit_by_name("Read")
+    habit.complete_on(date(2024, 1, 1))
+    tracker.db.save_habit(habit)
+    tracker.update_habit("Read", "Study", "daily")
+    tracker.db.close()
+
+    reloaded = HabitTracker(path, event_log=True)
+    assert [h.name for h in reloaded.habits] == ["Study"]
+    assert reloaded.habits[0].completions == [date(2024, 1, 1)]
+    reloaded.db.close()
+
+
+def test_target_changes_are_logged(store):
+    """This tests persisting per-period targets through the event log.
+
+    Verifies that:
+        - A target change is recorded as its own event
+        - Reloaded habits carry the target
+    """
+    habit = Habit("Gym", "weekly", target=2)
+    store.save_habit(habit)
+    habit.target = 3
+    store.save_habit(habit)
+    assert _events(store)[-1] == ("change_target", "Gym")
+    assert store.get_habit_by_name("Gym").target == 3
+
+
+def test_existing_habits_table_is_migrated(tmp_path):
+    """This tests opening a database written by DatabaseManager with the event log.
+
+    Verifies that:
+        - Every existing habit is seeded as an "add" event with its completions and target
+        - Migration happens once: reopening does not record the habits again
+    """
+    from habit.database import DatabaseManager
+    path = str(tmp_path / "habits.db")
+    legacy = DatabaseManager(path)
+    legacy.initialize_schema()
+    habit = Habit("Read", "weekly", target=2)
+    habit.complete_range([date(2024, 6, 3), date(2024, 6, 4)])
+    legacy.save_habit(habit)
+    legacy.save_habit(Habit("Run", "daily"))
+    legacy.close()
+
+    for _ in range(2):
+        store = EventSourcedDatabase(path)
+        store.initialize_schema()
+        habits = {h.name: h for h in store.load_all_habits()}
+        assert _events(store) == [("add", "Read"), ("add", "Run")]
+        store.close()
+    assert habits["Read"].target == 2
+    assert habits["Read"].completions == [date(2024, 6, 3), date(2024, 6, 4)]
+    assert habits["Run"].completions == []
@@ -0,0 +1,76 @@
+import os
+from collections import Counter
+from datetime import date, timedelta
+import pytest
+from habit.habit import Habit
+from habit.database import DatabaseManager
+from habit.fleet import analyze_shard, empty_partial, merge_partials, run_fleet_analytics
+
+
+@pytest.fixture
+def shard_paths(tmp_path):
+    """This fixture writes three tenant databases.
+
+     it Returns:
+        List[str]: Paths of databases whose habits have streaks 1..6."""
+    paths = []
+    today = date(2024, 6, 30)
+    for shard in range(3):
+        path = str(tmp_path / f"tenant{shard}.db")
+        db = DatabaseManager(path)
+        db.initialize_schema()
+        for i, periodicity in enumerate(["daily", "weekly"]):
+            habit = Habit(f"t{shard}-h{i}", periodicity)
+            length = shard * 2 + i + 1
+            step = timedelta(days=1) if periodicity == "daily" else timedelta(weeks=1)
+            habit._dates = {today - step * k for k in range(length)}
+            db.save_habit(habit)
+        db.close()
+        paths.append(path)
+    return paths
+
+
+def test_analyze_shard_is_read_only(shard_paths):
+    """This tests the per-shard partial result.
+
+    Verifies that:
+        - Habits, periodicities and top streaks of one database are summarized
+        - A missing database is reported as an error and not created
+    """
+    result = analyze_shard(shard_paths[2], top_k=1)
+    assert result["habits"] == 2
+    assert result["top"] == [(6, shard_paths[2], "t2-h1")]
+
+    missing = shard_paths[0] + ".missing"
+    result = analyze_shard(missing)
+    assert result["errors"] and result["habits"] == 0
+    assert not os.path.exists(missing)
+
+
+def test_merge_partials_is_associative(shard_paths):
+    """This tests the reducers.
+
+    Verifies that:
+        - Merging in different groupings gives the same result
+        - empty_partial() is the identity
+    """
+    a, b, c = (analyze_shard(p, top_k=3) for p in shard_paths)
+    left = merge_partials(merge_partials(a, b, 3), c, 3)
+    right = merge_partials(a, merge_partials(b, c, 3), 3)
+    assert left == right
+    assert merge_partials(empty_partial(), a, 3) == a
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_fleet_analytics(shard_paths, workers):
+    """This tests the fleet runner in-process and with a process pool.
+
+    Verifies that:
+        - Counts are summed across databases
+        - The fleet-wide top-k holds the longest streaks overall
+    """
+    result = run_fleet_analytics(shard_paths, top_k=2, workers=workers)
+    assert result["shards"] == 3
+    assert result["habits"] == 6
+    assert result["periodicity"] == Counter({"daily": 3, "weekly": 3})
+    assert [entry[0] for entry in result["top"]] == [6, 5]
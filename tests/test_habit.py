@@ -1,5 +1,5 @@
 import pytest
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, timezone
 from dateutil.relativedelta import relativedelta
 from habit.habit import Habit
 from unittest.mock import patch
@@ -126,3 +126,123 @@ def test_complete_task_with_mock_time():
         assert logged == fixed_date
         assert fixed_date in habit._dates
 
+
+#  Backdated and bulk completions
+def test_complete_on_backdated_date():
+    """This tests recording a completion on a specific past date.
+
+    Verifies that:
+        - A backdated date is recorded and returns True
+        - A second date in the same ISO week is rejected as a duplicate
+    """
+    habit = Habit("Read", "weekly")
+    assert habit.complete_on(date(2024, 3, 4)) is True
+    assert habit.complete_on(date(2024, 3, 8)) is False
+    assert habit.completions == [date(2024, 3, 4)]
+
+def test_complete_range_honours_duplicate_periods():
+    """This tests merging a batch of dates into an existing history.
+
+    Verifies that:
+        - Dates are merged in sorted order with the existing completions
+        - Within the batch, only the earliest date of each month is kept
+        - Months already logged are skipped
+        - The streak reflects the whole batch
+    """
+    habit = Habit("Budget", "monthly")
+    habit.complete_on(date(2024, 2, 10))
+    added = habit.complete_range([
+        date(2024, 4, 10), date(2024, 1, 10), date(2024, 4, 2),
+        date(2024, 3, 10), date(2024, 2, 20),
+    ])
+    assert added == 3
+    assert habit.completions == [date(2024, 1, 10), date(2024, 2, 10), date(2024, 3, 10), date(2024, 4, 2)]
+    assert habit.get_streak() == 4  # consecutive months, whatever the day of the month
+
+def test_streak_cache_tracks_changes():
+    """This tests that cached streak state follows every kind of change.
+
+    Verifies that:
+        - The streak updates after complete_on, direct _dates edits and periodicity changes
+    """
+    habit = Habit("Run", "daily")
+    habit.complete_range([date(2024, 1, 1), date(2024, 1, 2)])
+    assert habit.get_streak() == 2
+    habit.complete_on(date(2024, 1, 3))
+    assert habit.get_streak() == 3
+    habit._dates.add(date(2024, 1, 4))
+    assert habit.get_streak() == 4
+    habit._dates = {date(2024, 1, 1), date(2024, 1, 8)}
+    assert habit.get_streak() == 1
+    habit.periodicity = "weekly"
+    assert habit.get_streak() == 2
+
+def test_custom_periodicities():
+    """Test the periodicities provided by habit.periods.
+       Verifies that:
+       - "every N days"/"every N weeks" names are normalized
+       - Weekday streaks skip weekends, and weekend completions count for Friday
+       - Every-2-days windows allow one completion per window
+       - Unknown periodicities are rejected
+    """
+    habit = Habit("Stretch", "Every  1 Days")
+    assert habit.periodicity == "daily"
+    assert Habit("Plan", "every 3 weeks").periodicity == "every 3 weeks"
+
+    weekdays = Habit("Commute", "weekdays")
+    # Thursday, Friday, Monday, Tuesday
+    weekdays.complete_range([date(2024, 6, 6), date(2024, 6, 7), date(2024, 6, 10), date(2024, 6, 11)])
+    assert weekdays.get_streak() == 4
+    assert weekdays.complete_on(date(2024, 6, 8)) is False  # Saturday belongs to Friday
+
+    every_two = Habit("Water plants", "every 2 days")
+    assert every_two.complete_range([date(2024, 6, 1), date(2024, 6, 2), date(2024, 6, 4), date(2024, 6, 5)]) == 3
+    assert every_two.get_streak() == 3
+
+    with pytest.raises(ValueError):
+        Habit("Never", "every 0 days")
+    with pytest.raises(ValueError):
+        habit.periodicity = "hourly"
+
+def test_frequency_target():
+    """Test habits that need several completions per period ("3x per week").
+       Verifies that:
+       - Up to `target` different days are accepted per period, then the period is full
+       - Only periods that reached the target extend the streak
+       - The incrementally maintained streak matches a full recomputation
+       - Targets that cannot fit in a period are rejected
+    """
+    habit = Habit("Gym", "weekly", target=3)
+    monday = date(2024, 6, 3)
+    assert habit.complete_range([monday, monday + timedelta(days=2)]) == 2
+    assert habit.get_streak() == 0
+    assert habit.complete_on(monday + timedelta(days=4)) is True
+    assert habit.get_streak() == 1
+    assert habit.complete_on(monday + timedelta(days=5)) is False  # week already full
+    assert habit._is_duplicate(monday + timedelta(days=6))
+
+    for day in (7, 8, 9):
+        habit.complete_on(monday + timedelta(days=day))
+        habit.get_streak()
+    cached = habit.get_streak()
+    habit._invalidate()
+    assert cached == habit.get_streak() == 2
+
+    with pytest.raises(ValueError):
+        Habit("Water", "daily", target=2)
+    with pytest.raises(ValueError):
+        habit.periodicity = "daily"
+    assert habit.periodicity == "weekly"
+
+def test_complete_at_uses_the_users_calendar():
+    """Test completing at a timestamp in the user's timezone.
+       Verifies that:
+       - A completion late in the evening in New York lands on that local day,
+         although it is already the next day in UTC
+       - A second completion in the same local day is a duplicate
+    """
+    habit = Habit("Journal", "daily")
+    evening = datetime(2024, 6, 2, 2, 30, tzinfo=timezone.utc)  # 22:30 on June 1st in New York
+    assert habit.complete_at(evening, "America/New_York") is True
+    assert habit.completions == [date(2024, 6, 1)]
+    assert habit.complete_at(evening - timedelta(hours=10), "America/New_York") is False
@@ -161,3 +161,82 @@ def test_list_all_habits(tracker):
     tracker.habits.extend([h1, h2])
     result = tracker.list_all_habits()
     assert result == [h1, h2]
+
+def test_update_habit_rename_moves_stored_row(tracker, mock_db):
+    """
+    Test that renaming a habit renames its stored row instead of leaving a copy behind.
+
+    Verifies that:
+    1. The database's rename_habit method is called with the old and new names
+    2. Updating without a new name does not rename anything
+    """
+    tracker.habits.append(Habit("Sleep", "daily"))
+    tracker.update_habit("Sleep", "Rest", "daily")
+    mock_db.rename_habit.assert_called_once_with("Sleep", "Rest")
+
+    mock_db.rename_habit.reset_mock()
+    tracker.update_habit("Rest", "Rest", "weekly")
+    mock_db.rename_habit.assert_not_called()
+
+def test_update_habit_rejects_unknown_periodicity(tracker, mock_db):
+    """
+    This tests updating a habit to an unsupported periodicity.
+
+    Verifies that:
+        - A ValueError is raised
+        - Nothing is renamed or saved
+    """
+    tracker.add_habit(Habit("Walk", "daily"))
+    mock_db.reset_mock()
+    with pytest.raises(ValueError):
+        tracker.update_habit("Walk", "Stroll", "hourly")
+    mock_db.rename_habit.assert_not_called()
+    mock_db.save_habit.assert_not_called()
+
+def test_archive_inactive_and_restore(tmp_path):
+    """
+    This tests archiving inactive habits through the tracker.
+
+    Verifies that:
+        - Only habits inactive for at least N of their periods are archived
+        - Archived habits are not loaded by a new tracker
+        - A restored habit is tracked again, and restoring over an active habit fails
+    """
+    from datetime import date
+    path = str(tmp_path / "habits.db")
+    tracker = HabitTracker(path)
+    for name, periodicity, day in (("Old", "daily", date(2024, 1, 1)), ("Gym", "weekly", date(2024, 5, 27)),
+                                   ("Read", "daily", date(2024, 6, 9))):
+        habit = Habit(name, periodicity)
+        habit.complete_on(day)
+        tracker.add_habit(habit)
+
+    assert tracker.archive_inactive(3, today=date(2024, 6, 10)) == ["Old"]
+    assert [h.name for h in HabitTracker(path).habits] == ["Gym", "Read"]
+
+    assert tracker.restore_habit("Old").completions == [date(2024, 1, 1)]
+    assert sorted(h.name for h in HabitTracker(path).habits) == ["Gym", "Old", "Read"]
+    assert tracker.archive_habit("Read") is True
+    tracker.add_habit(Habit("Read", "daily"))
+    with pytest.raises(ValueError):
+        tracker.restore_habit("Read")
+    tracker.close()
+
+def test_list_summaries_uses_memory_in_write_behind_mode(tmp_path):
+    """
+    This tests where HabitTracker.list_summaries gets its data.
+
+    Verifies that:
+        - With single-file storage the summaries come from the database
+        - In write-behind mode unflushed habits are listed from memory
+    """
+    path = str(tmp_path / "habits.db")
+    tracker = HabitTracker(path)
+    tracker.add_habit(Habit("Read", "daily"))
+    assert [s.name for s in tracker.list_summaries()] == ["Read"]
+    tracker.close()
+
+    tracker = HabitTracker(path, write_behind=True, flush_interval=60)
+    tracker.add_habit(Habit("Swim", "weekly"))
+    assert [s.name for s in tracker.list_summaries("weekly")] == ["Swim"]
+    tracker.close()
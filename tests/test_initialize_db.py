@@ -0,0 +1,55 @@
+from datetime import date
+import pytest
+from initialize_db import iter_synthetic_rows, generate_dataset, parse_mix
+from habit.database import DatabaseManager
+
+
+def test_synthetic_rows_are_deterministic():
+    """This tests that the synthetic dataset is reproducible from a seed.
+
+    Verifies that:
+        - Two generators with the same seed and anchor date yield identical rows
+        - A different seed yields a different dataset
+    """
+    today = date(2024, 6, 30)
+    first = list(iter_synthetic_rows(50, 120, seed=3, today=today))
+    second = list(iter_synthetic_rows(50, 120, seed=3, today=today))
+    other = list(iter_synthetic_rows(50, 120, seed=4, today=today))
+    assert first == second
+    assert first != other
+
+
+def test_generate_dataset_writes_valid_habits(tmp_path):
+    """This tests streaming a synthetic dataset into a database.
+
+    Verifies that:
+        - Every generated habit is written
+        - Completions never lie in the future and never repeat a period
+    """
+    path = str(tmp_path / "synthetic.db")
+    today = date(2024, 6, 30)
+    assert generate_dataset(path, 40, 200, seed=1, today=today) == 40
+
+    db = DatabaseManager(path)
+    habits = db.load_all_habits()
+    db.close()
+    assert len(habits) == 40
+    for habit in habits:
+        assert all(d <= today for d in habit.completions)
+        keys = [(d.isocalendar()[:2] if habit.periodicity == "weekly" else
+                 (d.year, d.month) if habit.periodicity == "monthly" else d)
+                for d in habit.completions]
+        assert len(keys) == len(set(keys))
+
+
+def test_parse_mix_validates_input():
+    """This tests parsing the --mix option shared with the benchmarks.
+
+    Verifies that:
+        - Weights are normalized to sum to one
+        - Malformed pairs, unknown periodicities, bad numbers and zero totals raise ValueError
+    """
+    assert parse_mix("daily=3, Weekly=1") == {"daily": 0.75, "weekly": 0.25}
+    for bad in ("daily", "yearly=1", "daily=lots", "daily=0,weekly=0", "daily=-1,weekly=2"):
+        with pytest.raises(ValueError):
+            parse_mix(bad)
@@ -0,0 +1,90 @@
+import pytest
+from habit import metrics
+from habit.habit import Habit
+from habit.database import DatabaseManager
+from habit.app_controller import AppController
+
+
+@pytest.fixture
+def enabled_metrics():
+    """This fixture enables instrumentation for one test and restores the default afterwards.
+
+     it Yields:
+        Metrics: The process-wide metrics collector, freshly reset."""
+    metrics.reset()
+    metrics.enable()
+    try:
+        yield metrics.METRICS
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+
+def test_disabled_metrics_record_nothing(tmp_path):
+    """This tests that instrumentation is opt-in.
+
+    Verifies that:
+        - Database work done while metrics are disabled leaves the snapshot empty
+    """
+    metrics.reset()
+    db = DatabaseManager(str(tmp_path / "m.db"))
+    db.initialize_schema()
+    db.save_habit(Habit("Read", "daily"))
+    db.load_all_habits()
+    db.close()
+    snap = metrics.snapshot()
+    assert snap["round_trips"] == 0
+    assert snap["rows_deserialized"] == 0
+
+
+def test_database_round_trips_and_rows(tmp_path, enabled_metrics):
+    """This tests the DatabaseManager hooks.
+
+    Verifies that:
+        - Every statement is counted as a round trip, grouped by statement kind
+        - Rows turned into Habit objects are counted
+    """
+    db = DatabaseManager(str(tmp_path / "m.db"))
+    db.initialize_schema()
+    db.save_habit(Habit("Read", "daily"))
+    db.save_habit(Habit("Run", "weekly"))
+    db.load_all_habits()
+    db.close()
+
+    snap = metrics.snapshot()
+    assert snap["database"]["INSERT"]["count"] == 2
+    assert snap["database"]["SELECT"]["count"] == 1
+    assert snap["rows_deserialized"] == 2
+    assert snap["round_trips"] >= 4
+
+
+def test_command_latency_is_recorded(tmp_path, enabled_metrics):
+    """This tests per-command timing through AppController.handle_command.
+
+    Verifies that:
+        - Startup and each dispatched command appear in the snapshot with a count
+    """
+    controller = AppController(str(tmp_path / "m.db"))
+    controller.handle_command("add", habit_name="Read", periodicity="daily")
+    controller.handle_command("list")
+    controller.handle_command("list")
+    controller.tracker.db.close()
+
+    commands = metrics.snapshot()["commands"]
+    assert commands["startup"]["count"] == 1
+    assert commands["add"]["count"] == 1
+    assert commands["list"]["count"] == 2
+
+
+def test_cache_hit_rate():
+    """This tests the cache hit rate calculation.
+
+    Verifies that:
+        - The hit rate is None before any lookup and hits/lookups afterwards
+    """
+    collector = metrics.Metrics()
+    assert collector.snapshot()["cache"]["hit_rate"] is None
+    collector.record_cache(True)
+    collector.record_cache(True)
+    collector.record_cache(False)
+    assert collector.snapshot()["cache"]["hit_rate"] == pytest.approx(2 / 3)
@@ -0,0 +1,74 @@
+import io
+import json
+from datetime import date, timedelta
+import pytest
+from habit.habit import Habit
+from habit.database import HabitSummary
+from habit.output import analytics_records, summary_records, write_records
+
+
+@pytest.fixture
+def habits():
+    """This fixture creates a daily habit with a 3-day streak and an empty weekly habit.
+
+     it Returns:
+        List[Habit]: The two habits."""
+    today = date.today()
+    daily = Habit("Read", "daily")
+    daily._dates = {today - timedelta(days=i) for i in range(3)}
+    return [daily, Habit("Swim", "weekly")]
+
+
+def test_records_are_computed_lazily(habits):
+    """This tests that records are produced on demand.
+
+    Verifies that:
+        - No streak is computed before the habit's record is requested
+        - List records carry the summary's name, periodicity, target and streak
+    """
+    class Exploding(Habit):
+        def get_streak(self):
+            raise AssertionError("computed too early")
+
+    records = analytics_records(habits + [Exploding("Late", "daily")])
+    assert next(records)["streak"] == 3
+    assert next(records)["streak"] == 0
+
+    (record,) = summary_records([HabitSummary("Read", "daily", 1, 3)])
+    assert record == {"name": "Read", "periodicity": "daily", "target": 1, "streak": 3}
+
+
+def test_analytics_records_end_with_summary(habits):
+    """This tests the analytics record stream.
+
+    Verifies that:
+        - One habit record per habit includes current and longest streaks
+        - The final summary names the longest streak and counts habits per periodicity
+    """
+    records = list(analytics_records(habits))
+    assert records[0] == {"type": "habit", "name": "Read", "periodicity": "daily", "target": 1,
+                          "streak": 3, "longest_streak": 3}
+    assert records[-1] == {"type": "summary", "longest": {"name": "Read", "streak": 3},
+                           "periodicity": {"daily": 1, "weekly": 1}}
+
+
+@pytest.mark.parametrize("count", [0, 1, 4, 5])
+def test_write_records_formats(count):
+    """This tests streaming JSON and NDJSON output across chunk boundaries.
+
+    Verifies that:
+        - json output parses as one array
+        - ndjson output has one parseable object per line
+        - The number of records is returned
+    """
+    expected = [{"i": i, "name": "✓"} for i in range(count)]
+    out = io.StringIO()
+    assert write_records(iter(expected), "json", out, chunk=2) == count
+    assert json.loads(out.getvalue()) == expected
+
+    out = io.StringIO()
+    write_records(iter(expected), "ndjson", out, chunk=2)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == expected
+
+    with pytest.raises(ValueError):
+        write_records(iter(expected), "xml", io.StringIO())
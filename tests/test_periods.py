@@ -0,0 +1,87 @@
+from datetime import date, datetime, timedelta
+import pytest
+from habit.periods import POLICIES, current_run, get_policy, longest_run, ordered
+from habit.habit import Habit
+
+
+def test_consecutive_periods_have_consecutive_ordinals():
+    """This tests the ordinal mapping of every policy over several years.
+
+    Verifies that:
+        - Ordinals never decrease as dates advance
+        - Moving to the next period increases the ordinal by exactly one
+    """
+    policies = list(POLICIES.values()) + [get_policy("every 3 days"), get_policy("every 2 weeks")]
+    for policy in policies:
+        day = date(2023, 1, 1)
+        previous = policy.key(day)
+        for _ in range(800):
+            day += timedelta(days=1)
+            key = policy.key(day)
+            assert key - previous in (0, 1), (policy, day)
+            previous = key
+
+
+def test_get_policy_parsing():
+    """This tests resolving periodicity strings.
+
+    Verifies that:
+        - Case and spacing are ignored, and policies are shared
+        - "every 1 weeks" resolves to the weekly policy
+        - Unknown strings raise ValueError
+    """
+    assert get_policy(" Weekly ") is POLICIES["weekly"]
+    assert get_policy("every 1 week") is POLICIES["weekly"]
+    assert get_policy("every 10 days").name == "every 10 days"
+    for bad in ("yearly", "every days", "every -2 days"):
+        with pytest.raises(ValueError):
+            get_policy(bad)
+
+
+def test_weekday_policy_bridges_weekends():
+    """This tests that Friday and the following Monday are adjacent working days.
+
+    Verifies that:
+        - The ordinals of Friday and Monday differ by one
+        - Saturday and Sunday share Friday's ordinal
+    """
+    policy = get_policy("weekdays")
+    friday = date(2024, 6, 7)
+    assert policy.key(friday + timedelta(days=3)) - policy.key(friday) == 1
+    assert policy.key(friday + timedelta(days=1)) == policy.key(friday + timedelta(days=2)) == policy.key(friday)
+
+
+def test_every_n_windows_are_fixed_calendar_blocks():
+    """This tests the fixed-window semantics of the every-N policies.
+
+    Verifies that:
+        - "every 2 days" windows are aligned to the calendar, not to a habit
+        - Two days in one window are one period; two days across a boundary are a streak
+        - "every 2 weeks" windows start on a Monday of the same fixed grid
+    """
+    policy = get_policy("every 2 days")
+    assert policy.key(date(2024, 6, 2)) == policy.key(date(2024, 6, 3))
+    assert policy.key(date(2024, 6, 2)) - policy.key(date(2024, 6, 1)) == 1
+
+    early, late = Habit("Early", "every 2 days"), Habit("Late", "every 2 days")
+    early.creation_date, late.creation_date = datetime(2024, 5, 1), datetime(2024, 5, 2)
+    for habit in (early, late):
+        assert habit.complete_on(date(2024, 6, 2)) and not habit.complete_on(date(2024, 6, 3))
+        assert habit.complete_on(date(2024, 6, 4)) and habit.get_streak() == 2
+
+    weeks = get_policy("every 2 weeks")
+    assert weeks.key(date(2024, 6, 10)) == weeks.key(date(2024, 6, 23)) != weeks.key(date(2024, 6, 24))
+
+
+def test_run_helpers_and_ordering():
+    """This tests the integer run helpers and display ordering.
+
+    Verifies that:
+        - current_run counts the run ending at the newest ordinal
+        - longest_run finds the longest run anywhere
+        - Fixed periodicities are listed before parameterized ones
+    """
+    assert current_run([1, 2, 4, 5, 6]) == 3
+    assert longest_run([1, 2, 3, 7, 8]) == 3
+    assert current_run([]) == longest_run([]) == 0
+    assert ordered(["every 2 days", "monthly", "daily", "daily"]) == ["daily", "monthly", "every 2 days"]
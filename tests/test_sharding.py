@@ -0,0 +1,135 @@
+import threading
+from unittest.mock import patch
+import pytest
+from habit.habit import Habit
+from habit.habit_tracker import HabitTracker
+from habit.sharding import ShardedDatabaseManager, shard_index, shard_paths
+
+
+@pytest.fixture
+def sharded_db(tmp_path):
+    """This fixture creates a four-shard database manager.
+
+     it Yields:
+        ShardedDatabaseManager: An initialized manager over four shard files."""
+    db = ShardedDatabaseManager(str(tmp_path / "habits.db"), 4)
+    db.initialize_schema()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def test_shard_index_is_stable_and_normalized():
+    """This tests the routing function.
+
+    Verifies that:
+        - Names differing only in case and surrounding spaces map to the same shard
+        - The result is within range
+    """
+    assert shard_index("Read", 8) == shard_index("  read ", 8)
+    assert all(0 <= shard_index(f"habit {i}", 8) < 8 for i in range(100))
+
+
+def test_habits_are_spread_and_merged(sharded_db):
+    """This tests routing and transparent fan-out.
+
+    Verifies that:
+        - Each habit is stored only in the shard chosen by its name
+        - load_all_habits and get_habit_by_name see every habit
+    """
+    names = [f"habit {i}" for i in range(20)]
+    for name in names:
+        sharded_db.save_habit(Habit(name, "daily"))
+
+    assert sorted(h.name for h in sharded_db.load_all_habits()) == sorted(names)
+    for name in names:
+        owner = sharded_db.shards[shard_index(name, 4)]
+        assert owner.get_habit_by_name(name) is not None
+        assert sharded_db.get_habit_by_name(name).name == name
+    assert sum(1 for s in sharded_db.shards if s.load_all_habits()) > 1
+
+    sharded_db.delete_habit(names[0])
+    assert sharded_db.get_habit_by_name(names[0]) is None
+
+
+def test_concurrent_writes_from_threads(sharded_db):
+    """This tests writing from several threads at once.
+
+    Verifies that:
+        - Concurrent saves of different habits all persist without errors
+    """
+    def worker(offset):
+        for i in range(10):
+            habit = Habit(f"t{offset}-{i}", "weekly")
+            habit.complete_task()
+            sharded_db.save_habit(habit)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(sharded_db.load_all_habits()) == 40
+
+
+def test_shard_count_mismatch_is_rejected(tmp_path, sharded_db):
+    """This tests that reopening shards with another shard count fails loudly.
+
+    Verifies that:
+        - A ValueError is raised instead of silently misrouting habits
+    """
+    path = str(tmp_path / "habits.db")
+    assert shard_paths(path, 2)[0] == sharded_db.paths[0]
+    other = ShardedDatabaseManager(path, 2)
+    with pytest.raises(ValueError):
+        other.initialize_schema()
+    other.close()
+
+
+def test_tracker_with_shards(tmp_path):
+    """This tests HabitTracker on sharded storage.
+
+    Verifies that:
+        - Habits added through the tracker are reloaded by a new tracker
+    """
+    path = str(tmp_path / "habits.db")
+    tracker = HabitTracker(path, shards=3)
+    tracker.add_habit(Habit("Read", "daily"))
+    tracker.add_habit(Habit("Run", "weekly"))
+    tracker.db.close()
+
+    reloaded = HabitTracker(path, shards=3)
+    assert sorted(h.name for h in reloaded.habits) == ["Read", "Run"]
+    reloaded.db.close()
+
+
+def test_iter_rows_covers_every_shard(sharded_db):
+    """This tests streaming raw rows from all shards.
+
+    Verifies that:
+        - Each habit's row is yielded once, whichever shard holds it
+    """
+    for i in range(10):
+        sharded_db.save_habit(Habit(f"habit {i}", "daily"))
+    assert sorted(row[0] for row in sharded_db.iter_rows(batch_size=3)) == sorted(f"habit {i}" for i in range(10))
+
+
+def test_cross_shard_rename_never_loses_the_habit(sharded_db):
+    """This tests renaming a habit onto another shard.
+
+    Verifies that:
+        - The habit moves to the destination shard under its new name
+        - If writing the destination fails, the habit stays in its source shard
+    """
+    new_names = (f"renamed {i}" for i in range(100))
+    target = next(n for n in new_names if shard_index(n, 4) != shard_index("Read", 4))
+    sharded_db.save_habit(Habit("Read", "daily"))
+    sharded_db.rename_habit("Read", target)
+    assert [h.name for h in sharded_db.load_all_habits()] == [target]
+
+    dst = sharded_db.shards[shard_index("Read", 4)]
+    with patch.object(dst, "save_habit", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            sharded_db.rename_habit(target, "Read")
+    assert [h.name for h in sharded_db.load_all_habits()] == [target]
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+import pytest
+from habit.habit import Habit
+from habit.snapshot import export_snapshot, MappedSnapshot
+from habit.analytics import (
+    longest_streak_for,
+    open_snapshot,
+    snapshot_streaks,
+    snapshot_habit_with_longest_streak
+)
+
+
+@pytest.fixture
+def habits():
+    """This fixture creates habits with known current and longest streaks.
+
+     it Returns:
+        List[Habit]: A daily habit (current 2, longest 4), a weekly habit (current 3)
+        and a habit without completions."""
+    today = date(2024, 6, 30)
+    daily = Habit("Exercise", "daily")
+    daily._dates = {today - timedelta(days=i) for i in (0, 1, 3, 4, 5, 6)}
+    weekly = Habit("Jog ✓", "weekly")
+    weekly._dates = {today - timedelta(weeks=i) for i in range(3)}
+    return [daily, weekly, Habit("Empty", "monthly")]
+
+
+def test_snapshot_round_trip(tmp_path, habits):
+    """This tests writing and mapping a snapshot.
+
+    Verifies that:
+        - Names (including non-ASCII), periodicities and period ordinals are preserved
+    """
+    path = str(tmp_path / "habits.hsnap")
+    assert export_snapshot(habits, path) == 3
+    with MappedSnapshot(path) as snap:
+        assert len(snap) == 3
+        assert [snap.name(i) for i in range(3)] == ["Exercise", "Jog ✓", "Empty"]
+        assert [snap.periodicity(i) for i in range(3)] == ["daily", "weekly", "monthly"]
+        assert len(snap.ordinals_for(0)) == 6
+        assert len(snap.ordinals_for(2)) == 0
+
+
+def test_snapshot_streaks_match_habit_objects(tmp_path, habits):
+    """This tests computing streaks directly on the mapped file.
+
+    Verifies that:
+        - Current streaks match Habit.get_streak
+        - The longest streak overall matches longest_streak_for
+    """
+    path = str(tmp_path / "habits.hsnap")
+    export_snapshot(habits, path)
+    with open_snapshot(path) as snap:
+        assert snapshot_streaks(snap) == [(h.name, h.get_streak()) for h in habits]
+        assert snapshot_habit_with_longest_streak(snap) == ("Exercise", longest_streak_for(habits[0]))
+
+
+def test_invalid_snapshot_is_rejected(tmp_path):
+    """This tests opening a file that is not a snapshot.
+
+    Verifies that:
+        - A ValueError is raised
+    """
+    path = tmp_path / "bogus.hsnap"
+    path.write_bytes(b"not a snapshot" * 10)
+    with pytest.raises(ValueError):
+        MappedSnapshot(str(path))
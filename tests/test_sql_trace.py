@@ -0,0 +1,86 @@
+import io
+from habit.habit import Habit
+from habit.database import DatabaseManager
+from habit.habit_tracker import HabitTracker
+from habit.sql_trace import SQLTracer, statement_shape
+
+
+def test_statement_shape_strips_literals():
+    """This tests statement normalization.
+
+    Verifies that:
+        - Statements differing only in literals and whitespace share one shape
+    """
+    a = statement_shape("SELECT *  FROM habits WHERE name = 'Read' AND x = 3")
+    b = statement_shape("SELECT * FROM habits\n WHERE name = 'Run' AND x = 42")
+    assert a == b == "SELECT * FROM habits WHERE name = ? AND x = ?"
+
+
+def test_tracer_aggregates_statements_per_shape(tmp_path):
+    """This tests tracing a DatabaseManager.
+
+    Verifies that:
+        - Every statement is logged
+        - Repeated lookups are aggregated under one shape with their count
+    """
+    log = io.StringIO()
+    tracer = SQLTracer(log=log)
+    db = DatabaseManager(str(tmp_path / "t.db"), tracer=tracer)
+    db.initialize_schema()
+    db.save_habit(Habit("Read", "daily"))
+    for _ in range(3):
+        db.get_habit_by_name("Read")
+    db.close()
+
+    lookups = [s for shape, s in tracer.snapshot().items() if shape.startswith("SELECT") and "WHERE" in shape]
+    assert len(lookups) == 1
+    assert lookups[0]["count"] == 3
+    assert "INSERT INTO habits" in log.getvalue()
+    assert "SQL trace summary" in tracer.summary()
+
+
+def test_tracer_captures_query_plans_for_embedded_tracker(tmp_path):
+    """This tests EXPLAIN QUERY PLAN capture when tracing an embedded HabitTracker.
+
+    Verifies that:
+        - The primary key lookup is reported as an index search
+        - The full load is reported as a table scan
+    """
+    tracer = SQLTracer(explain=True, log=None)
+    tracker = HabitTracker(str(tmp_path / "t.db"))
+    tracker.db.enable_trace(tracer)
+    tracker.add_habit(Habit("Read", "daily"))
+    tracker.db.get_habit_by_name("Read")
+    tracker.db.load_all_habits()
+    tracker.db.close()
+
+    plans = {shape: s["plan"] for shape, s in tracer.snapshot().items() if s["plan"]}
+    lookup = next(plan for shape, plan in plans.items() if "WHERE name" in shape)
+    scan = next(plan for shape, plan in plans.items() if shape.endswith("FROM habits"))
+    assert any(detail.startswith("SEARCH") for detail in lookup)
+    assert any(detail.startswith("SCAN") for detail in scan)
+
+
+def test_writes_are_counted_once_under_one_shape(tmp_path):
+    """This tests counting writes that fire the change-feed triggers.
+
+    Verifies that:
+        - One save_habit is one execution, not one per trigger program
+        - A bulk_insert's rows, count and time land on a single shape,
+          whether the rows bind NULL or a value to a numbered placeholder
+        - Numbered placeholders and NULL normalize like other literals
+    """
+    tracer = SQLTracer(log=None)
+    db = DatabaseManager(str(tmp_path / "t.db"), tracer=tracer)
+    db.initialize_schema()
+    db.save_habit(Habit("Read", "daily"))
+    db.bulk_insert([("Run", "daily", "2024-01-01", "[]"), ("Gym", "weekly", "2024-01-01", "[]", 2),
+                    ("Swim", "weekly", "2024-01-01", "[]")])
+    db.close()
+
+    inserts = {shape: s for shape, s in tracer.snapshot().items() if shape.startswith("INSERT INTO habits")}
+    assert sorted(s["count"] for s in inserts.values()) == [1, 3]
+    assert all(s["total"] > 0 for s in inserts.values())
+    assert statement_shape("VALUES (?1, ?2, COALESCE(?6, 1))") == statement_shape(
+        "VALUES ('a', x'00ff', COALESCE(NULL, 1))") == "VALUES (?, ?, COALESCE(?, ?))"
+    assert statement_shape("WHERE streak IS NULL") == "WHERE streak IS NULL"
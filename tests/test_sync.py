@@ -0,0 +1,180 @@
+import sqlite3
+from datetime import date
+from unittest.mock import patch
+import pytest
+from habit.app_controller import AppController
+from habit.database import DatabaseManager
+from habit.habit import Habit
+from habit.sync import _pulled_seq, database_id, sync_databases
+
+
+@pytest.fixture
+def pair(tmp_path):
+    """Provides two initialized habits databases, a local copy and a server copy."""
+    local = DatabaseManager(str(tmp_path / "local.db"))
+    remote = DatabaseManager(str(tmp_path / "remote.db"))
+    local.initialize_schema()
+    remote.initialize_schema()
+    yield local, remote
+    local.close()
+    remote.close()
+
+
+def _habit(name, periodicity="daily", days=(), target=1):
+    habit = Habit(name, periodicity, target)
+    for d in days:
+        habit.complete_on(d)
+    return habit
+
+
+def _state(db):
+    return {h.name: (h.periodicity, h.target, h.completions) for h in db.load_all_habits()}
+
+
+def test_sync_copies_new_habits_both_ways(pair):
+    """This tests a first sync between two databases with different habits.
+
+    Verifies that:
+        - Each side receives the habits only the other side had
+        - A second sync with no changes writes nothing
+    """
+    local, remote = pair
+    local.save_habit(_habit("read", days=[date(2024, 6, 1)]))
+    remote.save_habit(_habit("run", "weekly"))
+
+    assert sync_databases(local, remote) == (1, 1)
+    assert _state(local) == _state(remote) == {
+        "read": ("daily", 1, [date(2024, 6, 1)]),
+        "run": ("weekly", 1, []),
+    }
+    assert sync_databases(local, remote) == (0, 0)
+
+
+def test_sync_unions_completions_changed_on_both_sides(pair):
+    """This tests the conflict-free merge of concurrent completions.
+
+    Verifies that:
+        - Completions logged on both sides since the last sync are unioned
+        - When both sides changed the schedule, the local one wins
+        - A change on one side only carries its schedule to the other
+    """
+    local, remote = pair
+    local.save_habit(_habit("read", days=[date(2024, 6, 1)]))
+    sync_databases(local, remote)
+
+    local.save_habit(_habit("read", "weekly", days=[date(2024, 6, 1), date(2024, 6, 4)]))
+    remote.save_habit(_habit("read", "daily", days=[date(2024, 6, 1), date(2024, 6, 3)]))
+    sync_databases(local, remote)
+    expected = ("weekly", 1, [date(2024, 6, 1), date(2024, 6, 3), date(2024, 6, 4)])
+    assert _state(local)["read"] == _state(remote)["read"] == expected
+
+    habit = remote.get_habit_by_name("read")
+    habit.target = 2
+    remote.save_habit(habit)
+    assert sync_databases(local, remote) == (1, 0)
+    assert _state(local)["read"][1] == 2
+
+
+def test_sync_propagates_deletes_and_renames(pair):
+    """This tests deletions in sync.
+
+    Verifies that:
+        - A delete and a rename on one side reach the other side
+        - A habit deleted on one side but changed on the other survives
+    """
+    local, remote = pair
+    for name in ("read", "run", "gym"):
+        local.save_habit(_habit(name))
+    sync_databases(local, remote)
+
+    local.delete_habit("read")
+    remote.rename_habit("run", "jog")
+    local.delete_habit("gym")
+    remote.save_habit(_habit("gym", days=[date(2024, 6, 5)]))
+    sync_databases(local, remote)
+
+    assert _state(local) == _state(remote) == {
+        "jog": ("daily", 1, []),
+        "gym": ("daily", 1, [date(2024, 6, 5)]),
+    }
+
+
+def test_sync_command_reloads_tracker(tmp_path, capsys):
+    """This tests the sync command through AppController.
+
+    Verifies that:
+        - Habits from the other database appear in the tracker after sync
+        - The summary reports how many habits were updated on each side
+    """
+    server = DatabaseManager(str(tmp_path / "server.db"))
+    server.initialize_schema()
+    server.save_habit(_habit("run", "weekly"))
+    server.close()
+
+    controller = AppController(str(tmp_path / "laptop.db"))
+    controller.handle_command("add", habit_name="read", periodicity="daily")
+    controller.handle_command("sync", path=str(tmp_path / "server.db"))
+
+    assert sorted(h.name for h in controller.tracker.habits) == ["read", "run"]
+    assert "1 habits updated here, 1 there" in capsys.readouterr().out
+    controller.tracker.close()
+
+
+def test_sync_archives_on_the_peer(pair):
+    """This tests that archiving a habit reaches the other side as an archive.
+
+    Verifies that:
+        - A habit archived on one side is archived, not deleted, on the other
+        - Completions logged on the other side meanwhile are kept in the archive
+        - Restoring on one side restores on the other
+    """
+    local, remote = pair
+    local.save_habit(_habit("old", days=[date(2024, 6, 1)]))
+    local.save_habit(_habit("new"))
+    sync_databases(local, remote)
+
+    local.archive_habit(local.get_habit_by_name("old"))
+    remote.save_habit(_habit("old", days=[date(2024, 6, 1), date(2024, 6, 2)]))
+    sync_databases(local, remote)
+    for db in (local, remote):
+        assert [h.name for h in db.load_all_habits()] == ["new"]
+        assert db.get_archived("old").completions == [date(2024, 6, 1), date(2024, 6, 2)]
+
+    remote.restore_habit("old")
+    assert sync_databases(local, remote) == (1, 0)
+    assert _state(local) == _state(remote)
+    assert local.list_archived() == remote.list_archived() == []
+
+
+def test_failed_local_commit_keeps_the_remote_position(pair):
+    """This tests a sync whose local commit fails after the remote side committed.
+
+    Verifies that:
+        - The remote's recorded position for the local side does not move
+        - Local changes made afterwards (reusing rolled-back seqs) still reach the remote
+    """
+    local, remote = pair
+    local.save_habit(_habit("a"))
+    sync_databases(local, remote)
+    remote.save_habit(_habit("b"))
+    local.save_habit(_habit("c"))
+    position = _pulled_seq(remote, database_id(local))
+    seq = local.last_change_seq()
+    commit = local._commit
+
+    def failing_commit(conn):
+        # Fail only the commit that carries the merged habits.
+        if not local._transaction_depth and local.last_change_seq() > seq:
+            conn.rollback()
+            raise sqlite3.OperationalError("disk I/O error")
+        commit(conn)
+
+    with patch.object(local, "_commit", failing_commit):
+        with pytest.raises(sqlite3.OperationalError):
+            sync_databases(local, remote)
+    assert _pulled_seq(remote, database_id(local)) == position
+
+    local.save_habit(_habit("d"))
+    sync_databases(local, remote)
+    assert _state(local) == _state(remote)
+    assert sorted(_state(remote)) == ["a", "b", "c", "d"]
@@ -0,0 +1,144 @@
+import io
+from datetime import date
+import pytest
+from habit.database import DatabaseManager
+from habit.habit import Habit
+from habit.transfer import export_csv, group_completions, import_csv, iter_completions, read_csv, write_csv
+
+
+@pytest.fixture
+def db(tmp_path):
+    """This fixture creates a database holding two habits with completions.
+
+     it Returns:
+        DatabaseManager: The initialized database manager."""
+    manager = DatabaseManager(str(tmp_path / "source.db"))
+    manager.initialize_schema()
+    daily = Habit("Exercise", "daily")
+    daily._dates = {date(2024, 6, 1), date(2024, 6, 2)}
+    weekly = Habit("Read, slowly", "weekly")
+    weekly._dates = {date(2024, 6, 3)}
+    manager.save_habit(daily)
+    manager.save_habit(weekly)
+    yield manager
+    manager.close()
+
+
+def test_export_import_round_trip(tmp_path, db):
+    """This tests exporting completions to CSV and importing them into another database.
+
+    Verifies that:
+        - One row is written per completion
+        - Names containing commas survive CSV quoting
+        - The imported habits have the same periodicities and completions
+    """
+    path = str(tmp_path / "completions.csv.gz")
+    assert export_csv(db, path) == 3
+
+    target = DatabaseManager(str(tmp_path / "target.db"))
+    target.initialize_schema()
+    try:
+        assert import_csv(target, path) == 2
+        imported = {h.name: h for h in target.load_all_habits()}
+    finally:
+        target.close()
+    assert imported["Exercise"].completions == [date(2024, 6, 1), date(2024, 6, 2)]
+    assert imported["Read, slowly"].periodicity == "weekly"
+    assert imported["Read, slowly"].completions == [date(2024, 6, 3)]
+
+
+def test_group_completions_drops_duplicate_periods():
+    """This tests folding completion rows into habit rows.
+
+    Verifies that:
+        - Dates in an already logged period are dropped (earliest wins)
+        - The periodicity is normalized to lowercase
+    """
+    records = [("Read", "Weekly", "2024-06-05", 1), ("Read", "weekly", "2024-06-03", 1)]
+    (row,) = group_completions(records, created="2024-01-01T00:00:00")
+    assert row == ("Read", "weekly", "2024-01-01T00:00:00", '["2024-06-03"]', 1)
+
+
+def test_group_completions_rejects_bad_input():
+    """This tests validation during import.
+
+    Verifies that:
+        - Non-adjacent rows of one habit raise ValueError
+        - Rows of one habit with different periodicities or targets raise ValueError
+        - Malformed CSV rows and non-integer targets raise ValueError
+    """
+    with pytest.raises(ValueError):
+        list(group_completions([("a", "daily", "2024-06-01", 1), ("b", "daily", "2024-06-01", 1),
+                                ("a", "daily", "2024-06-02", 1)]))
+    with pytest.raises(ValueError):
+        list(group_completions([("a", "daily", "2024-06-01", 1), ("a", "weekly", "2024-06-09", 1)]))
+    with pytest.raises(ValueError):
+        list(group_completions([("a", "weekly", "2024-06-03", 2), ("a", "weekly", "2024-06-04", 3)]))
+    with pytest.raises(ValueError):
+        list(read_csv(io.StringIO("name,periodicity,date\nonly,two\n")))
+    with pytest.raises(ValueError):
+        list(read_csv(io.StringIO("name,periodicity,date,target\na,daily,2024-06-01,many\n")))
+
+
+def test_write_csv_streams_with_header():
+    """This tests the CSV writer.
+
+    Verifies that:
+        - A header is written first
+        - The number of completion rows is returned
+    """
+    fh = io.StringIO()
+    assert write_csv(iter([("a", "daily", "2024-06-01", 1)]), fh) == 1
+    assert fh.getvalue().splitlines() == ["name,periodicity,date,target", "a,daily,2024-06-01,1"]
+
+
+def test_round_trip_keeps_targets(tmp_path, db):
+    """This tests CSV transfer of a habit with a target above one.
+
+    Verifies that:
+        - Every completion of a target-3 weekly habit survives export and import
+        - The target is restored on a fresh database and kept on an existing habit
+        - Files in the older three-column format are still read with a target of 1
+    """
+    habit = Habit("Gym", "weekly", target=3)
+    habit.complete_range([date(2024, 6, 3), date(2024, 6, 4), date(2024, 6, 5)])
+    db.save_habit(habit)
+    path = str(tmp_path / "completions.csv")
+    export_csv(db, path)
+
+    fresh = DatabaseManager(str(tmp_path / "fresh.db"))
+    fresh.initialize_schema()
+    existing = DatabaseManager(str(tmp_path / "existing.db"))
+    existing.initialize_schema()
+    existing.save_habit(Habit("Gym", "weekly", target=3))
+    try:
+        for target_db in (fresh, existing):
+            import_csv(target_db, path)
+            gym = target_db.get_habit_by_name("Gym")
+            assert gym.target == 3
+            assert gym.completions == [date(2024, 6, 3), date(2024, 6, 4), date(2024, 6, 5)]
+            assert gym.get_streak() == 1
+    finally:
+        fresh.close()
+        existing.close()
+
+    legacy = list(read_csv(io.StringIO("name,periodicity,date\nRun,daily,2024-06-01\n")))
+    assert legacy == [("Run", "daily", "2024-06-01", 1)]
+
+
+def test_habits_without_completions_survive_transfer():
+    """This tests habits that have no completions yet.
+
+    Verifies that:
+        - Export writes one row with an empty date for such a habit
+        - That row is not counted as a completion
+        - Import recreates the habit with no completions
+    """
+    rows = [("Nap", "weekly", "2024-01-01T00:00:00", "[]", 2)]
+    records = list(iter_completions(rows))
+    assert records == [("Nap", "weekly", "", 2)]
+    fh = io.StringIO()
+    assert write_csv(records, fh) == 0
+    fh.seek(0)
+    (row,) = group_completions(read_csv(fh), created="2024-01-01T00:00:00")
+    assert row == ("Nap", "weekly", "2024-01-01T00:00:00", "[]", 2)
@@ -0,0 +1,165 @@
+import io
+import sqlite3
+import time
+from datetime import date
+from unittest.mock import MagicMock
+import pytest
+from habit.app_controller import AppController
+from habit.batch import run_batch
+from habit.database import DatabaseManager
+from habit.habit import Habit
+from habit.habit_tracker import HabitTracker
+from habit.write_behind import WriteBehindQueue
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Provides a real DatabaseManager usable from the writer thread."""
+    manager = DatabaseManager(str(tmp_path / "habits.db"), check_same_thread=False)
+    manager.initialize_schema()
+    yield manager
+    manager.close()
+
+
+def _stored_names(path):
+    """Read habit names through a separate connection."""
+    with sqlite3.connect(path) as conn:
+        return sorted(row[0] for row in conn.execute("SELECT name FROM habits"))
+
+
+def test_changes_are_coalesced_per_habit(db):
+    """This tests that repeated changes to one habit are written once.
+
+    Verifies that:
+        - Saving the same habit several times leaves one pending entry
+        - The flush writes the latest state, including later completions
+        - A save followed by a delete writes only the delete
+    """
+    queue = WriteBehindQueue(db, interval=60)
+    habit = Habit("read", "daily")
+    queue.save(habit)
+    habit.complete_on(date(2024, 6, 1))
+    queue.save(habit)
+    queue.save(Habit("run", "daily"))
+    queue.delete("run")
+    assert queue.pending == 2
+
+    assert queue.flush() == 2
+    assert queue.pending == 0
+    assert db.get_habit_by_name("read").completions == [date(2024, 6, 1)]
+    assert db.get_habit_by_name("run") is None
+    queue.close()
+
+
+def test_queued_copy_is_isolated_from_later_mutations(db):
+    """This tests that a queued save captures the habit as it was when queued.
+
+    Verifies that:
+        - Completing a habit after queuing it does not change what is flushed
+    """
+    queue = WriteBehindQueue(db, interval=60)
+    habit = Habit("read", "daily")
+    queue.save(habit)
+    habit.complete_on(date(2024, 6, 1))
+    queue.flush()
+    assert db.get_habit_by_name("read").completions == []
+    queue.close()
+
+
+def test_background_flush_on_threshold_and_interval(db):
+    """This tests the two automatic flush triggers.
+
+    Verifies that:
+        - Reaching the dirty threshold wakes the writer before the interval ends
+        - Below the threshold, pending changes are written after the interval
+    """
+    queue = WriteBehindQueue(db, interval=60, threshold=3)
+    for name in ("a", "b", "c"):
+        queue.save(Habit(name, "daily"))
+    deadline = time.monotonic() + 5
+    while _stored_names(db.db_name) != ["a", "b", "c"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _stored_names(db.db_name) == ["a", "b", "c"]
+    assert queue.pending == 0
+    queue.close()
+
+    queue = WriteBehindQueue(db, interval=0.05, threshold=100)
+    queue.save(Habit("d", "daily"))
+    deadline = time.monotonic() + 5
+    while "d" not in _stored_names(db.db_name) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert "d" in _stored_names(db.db_name)
+    queue.close()
+
+
+def test_failed_flush_keeps_changes_queued():
+    """This tests crash-safe retry semantics when a flush fails.
+
+    Verifies that:
+        - An explicit flush raises the database error and records it
+        - The failed changes stay pending and are written by the next flush
+    """
+    db = MagicMock()
+    db.save_habit.side_effect = [sqlite3.OperationalError("database is locked"), None]
+    queue = WriteBehindQueue(db, interval=60)
+    queue.save(Habit("read", "daily"))
+
+    with pytest.raises(sqlite3.OperationalError):
+        queue.flush()
+    assert queue.pending == 1
+    assert isinstance(queue.last_error, sqlite3.OperationalError)
+
+    assert queue.flush() == 1
+    assert queue.pending == 0 and queue.last_error is None
+    queue.close()
+
+
+def test_tracker_write_behind_persists_on_close(tmp_path):
+    """This tests HabitTracker in write-behind mode end to end.
+
+    Verifies that:
+        - Adds, completions, renames and deletes apply in memory at once
+        - Nothing reaches the database before a flush
+        - close() writes the final state, visible to a new tracker
+    """
+    path = str(tmp_path / "habits.db")
+    tracker = HabitTracker(path, write_behind=True, flush_interval=60)
+    tracker.add_habit(Habit("read", "daily"))
+    tracker.add_habit(Habit("run", "daily"))
+    habit = tracker.find_habit_by_name("read")
+    habit.complete_on(date(2024, 6, 1))
+    tracker.save_habit(habit)
+    tracker.update_habit("read", "reading", "weekly")
+    tracker.delete_habit("run")
+
+    assert [h.name for h in tracker.habits] == ["reading"]
+    assert _stored_names(path) == []
+    tracker.close()
+
+    reopened = HabitTracker(path)
+    assert [(h.name, h.periodicity, h.completions) for h in reopened.habits] == [
+        ("reading", "weekly", [date(2024, 6, 1)])]
+    reopened.close()
+
+
+def test_flush_commits_on_its_own_connection(tmp_path):
+    """This tests write-behind together with batch mode.
+
+    Verifies that:
+        - The writer uses a connection separate from the tracker's
+        - Opening an outer transaction in write-behind mode is refused
+        - A batch of writes is visible to another connection once flushed
+    """
+    path = str(tmp_path / "habits.db")
+    controller = AppController(path, write_behind=True, flush_interval=60)
+    tracker = controller.tracker
+    assert tracker.writer.db is not tracker.db
+    with pytest.raises(ValueError):
+        tracker.transaction()
+
+    lines = ['add read daily', 'add run daily', 'list']
+    summary = run_batch(controller, lines, io.StringIO())
+    assert summary["failed"] == 0 and summary["transactions"] == 0
+    assert tracker.flush() == 2
+    assert _stored_names(path) == ["read", "run"]
+    tracker.close()